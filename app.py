@@ -1,9 +1,11 @@
 import dash
+import flask
 from dash import html, dcc
 import pandas as pd
 import datetime
+import os
 import plotly.graph_objects as go
-from dash.dependencies import Output, Input, State
+from dash.dependencies import Output, Input, State, ClientsideFunction
 import calendar
 from dash import ctx
 
@@ -18,47 +20,123 @@ from components._7_dept_summary import dept_amt_row
 from components._8_dept_amt import dept_compare_row
 from components._9_dept_cum_amt import dept_line_row
 from components._10_heatmap import dept_heatmap_row
+from components.downsample import bucket_bars, bucket_name, lttb, point_budget
+from components.figure_encoding import encode_figure, line_trace
 
 
 # ---- 테이블 콤포넌트 및 콜백 통합 import ----
 from components._11_table_section import register_table_callback
 
+# ---- 데이터 수집 ----
+from dataset.context import QueryContext
+from dataset.history import HISTORY_DIR, HistorySource, HistoryStore
+from dataset.index import sort_rows
+from dataset.ingest import SourceFetcher
+from dataset.refresher import REFRESH_INTERVAL, SHARED_DIR, ManualRefreshGate, Refresher
+from dataset.rollup import interpolate_zeros
+from dataset.sources import DATASET_MANIFEST, load_manifest
+from dataset.schema import concat_frames
+from dataset.snapshot import SnapshotCache
+from dataset.store import DatasetStore
+
 # --- 파일 및 데이터 준비 ---
 #url = 'https://docs.google.com/spreadsheets/d/1WZudSUSf4ineO6sFQuaV7nJVmr8CcYH5GwK-WuVNR4A/export?format=csv&gid=939378808'
 #df = pd.read_csv(url, encoding='utf-8')
 
-def get_latest_df():
-    url_alpha = 'https://docs.google.com/spreadsheets/d/1Rj6DGqEhuCO02rwsi9EQ-nkBs4C7PJcW5s0mqhTFBdE/export?format=csv&gid=0'
-    url_dream1 = 'https://docs.google.com/spreadsheets/d/1KpnVeV2f2aSRTiZAl1LSq74C4oQ975r7qtxlYIr-RFs/export?format=csv&gid=0'
-    url_dream2 = 'https://docs.google.com/spreadsheets/d/1R-g1y8QRBZMmWaav-cfiCURfox2Hx_2mxet_q3XzB3A/export?format=csv&gid=0'
-    url_gold1 = 'https://docs.google.com/spreadsheets/d/1XiILBe6zsQmQs51aIjrvZzH8bHRn43YBt200qTWiCWw/export?format=csv&gid=0'
-    url_gold2 = 'https://docs.google.com/spreadsheets/d/1M7-NcP4OVB-0YqkSfy1uGzFgLDjWziJZKo2U4OiRcTA/export?format=csv&gid=0'
-    url_legend = 'https://docs.google.com/spreadsheets/d/1MXBvPlB9rlwpDrEP86K2Ya9lOYBc-hp5l6iw__jb2bs/export?format=csv&gid=0'
-    df_alpha = pd.read_csv(url_alpha, encoding='utf-8')
-    df_dream1 = pd.read_csv(url_dream1, encoding='utf-8')
-    df_dream2 = pd.read_csv(url_dream2, encoding='utf-8')
-    df_gold1 = pd.read_csv(url_gold1, encoding='utf-8')
-    df_gold2 = pd.read_csv(url_gold2, encoding='utf-8')
-    df_legend = pd.read_csv(url_legend, encoding='utf-8')
-    df = pd.concat([df_alpha, df_dream1, df_dream2, df_gold1, df_gold2, df_legend], axis = 0)
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
-    return df
-
-df = get_latest_df()
+# 데이터 소스는 매니페스트(sources.json, DATASET_MANIFEST로 교체)에서 읽음
+# - 소스별 ETag/Last-Modified(파일은 mtime) 또는 본문 해시로 변경 여부 확인
+manifest_name = os.path.splitext(os.path.basename(DATASET_MANIFEST))[0]
+sources = load_manifest()
+
+# 히스토리 저장소 (DATASET_HISTORY_DIR 지정 시): 닫힌 달은 월 × 부서 Parquet에서 읽고
+# 원본에서는 열린 구간(DATASET_HISTORY_OPEN_MONTHS, 기본 이번 달 + 지난달)만 다시 반영
+if HISTORY_DIR:
+    history_store = HistoryStore(os.path.join(HISTORY_DIR, manifest_name))
+    sources = [HistorySource(source, history_store) for source in sources]
+
+source_fetcher = SourceFetcher(sources)
+
+def combine_frames(frames):
+    # 각 소스에서 이미 컬럼/타입 정리(dataset.schema)가 끝난 프레임
+    # (부서, 날짜) 순으로 정렬해 두면 기간·부서 선택이 이분 탐색 + 슬라이스 (dataset.index.RowIndex)
+    return sort_rows(concat_frames(frames))
+
+def load_dataset(current):
+    # 실패한 소스는 마지막 정상 프레임으로 대체되고 stale로 표시됨
+    frames = source_fetcher.fetch()
+    # 바뀐 소스가 없으면 버전 유지 + 기존 프레임 재사용 (합치기 생략)
+    if current is not None and current.version == source_fetcher.version:
+        return current.df, current.version, source_fetcher.stale
+    return combine_frames(frames.values()), source_fetcher.version, source_fetcher.stale
+
+# 페이지 로드마다 시트를 새로 받지 않도록 TTL 스냅샷 캐시 사용 (SNAPSHOT_TTL, 기본 300초)
+snapshot_cache = SnapshotCache(load_dataset)
+
+# 백그라운드 갱신 (DATASET_REFRESH_INTERVAL, 기본 120초 / 0이면 요청 시 TTL 방식)
+# - gunicorn 워커끼리는 매니페스트별 공유 디렉터리의 락 파일로 조율
+refresher = Refresher(snapshot_cache, shared_dir=os.path.join(SHARED_DIR, manifest_name))
+if REFRESH_INTERVAL > 0:
+    refresher.start()
+    if snapshot_cache.current is None:
+        refresher.refresh_once()
+snapshot_cache.get()
+
+# main-data 스토어: 기본은 버전 키만 내려주고 콜백에서 서버 캐시의 프레임 사용 (DATASET_STORE_MODE)
+dataset_store = DatasetStore(snapshot_cache)
+
+# 일별/주별/월별 탭이 있는 차트: 필터가 바뀔 때 세 탭 그림을 '{id}-figures' 스토어로 한 번에 보내고
+# 탭 전환은 clientside 콜백이 스토어에서 골라 '{id}-graph'에 넣음
+CHART_TABS = ['day', 'week', 'month']
+TAB_CHARTS = ['cnt-bar', 'amt-bar', 'dept-cnt', 'dept-amt']
 
 # --- Dash 앱 시작 ---
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 app.title = "Goodrich Sales Report"
-table_layout = register_table_callback(app)
+table_layout = register_table_callback(app, dataset_store)
+
+# ----- 수동 갱신: POST /refresh-data (X-Refresh-Token 헤더 = DATASET_REFRESH_TOKEN) -----
+# → 백그라운드 갱신 즉시 실행 (없으면 다음 페이지 로드 때 다시 읽음)
+# - 토큰이 설정되지 않았으면 404, 토큰이 다르면 403
+# - 갱신 중이거나 DATASET_REFRESH_MIN_INTERVAL(기본 60초) 안에 다시 요청하면 429 + Retry-After
+manual_refresh = ManualRefreshGate()
+
+@app.server.route('/refresh-data', methods=['POST'])
+def refresh_data():
+    busy = refresher.busy if refresher.running else snapshot_cache.revalidating
+    status, retry_after = manual_refresh.check(flask.request.headers.get('X-Refresh-Token'), busy)
+    if status == 429:
+        return {'status': 'busy'}, 429, {'Retry-After': str(retry_after)}
+    if status != 200:
+        return {'status': 'forbidden' if status == 403 else 'disabled'}, status
+    if refresher.running:
+        refresher.trigger()
+        return {'status': 'triggered'}
+    snapshot_cache.invalidate()
+    return {'status': 'invalidated'}
 
 # ----- 레이아웃 -----
+def stale_notice(stale):
+    # 수집에 실패해 마지막 정상 데이터를 보여주는 부서 표시
+    if not stale:
+        return html.Div(id='stale-notice')
+    items = [
+        f"{dept}({pd.to_datetime(ok_at):%m-%d %H:%M} 기준)" if ok_at else f"{dept}(수집 실패)"
+        for dept, ok_at in stale.items()
+    ]
+    return html.Div(
+        "⚠ 최신 데이터가 아닌 부서: " + ", ".join(items),
+        id='stale-notice',
+        style={'fontSize': '0.9rem', 'color': '#e74c3c', 'marginTop': '4px'}
+    )
+
 def serve_layout():
-    df = get_latest_df()
-    min_date = df['날짜'].min().date()
-    max_date = df['날짜'].max().date()
+    snapshot = snapshot_cache.get()
+    meta = dataset_store.meta(snapshot)
+    min_date = datetime.date.fromisoformat(meta['min_date'])
+    max_date = datetime.date.fromisoformat(meta['max_date'])
     end_date_default = max_date
     start_date_default = max(end_date_default.replace(day=1), min_date)
-    dept_list = df['부서'].unique().tolist()
+    dept_list = meta['depts']
     
     year_options = [{'label': f"{str(y)}년", 'value': y} for y in range(min_date.year, max_date.year + 1)]
     month_options = [{'label': f"{m}월", 'value': m} for m in range(1, 13)]
@@ -67,22 +145,31 @@ def serve_layout():
     return html.Div(
         style={"backgroundColor": "#EEEEEE", "minHeight": "100vh", "padding": "10px"},
         children=[
-            dcc.Store(id='main-data', data=df.to_json(date_format='iso', orient='split')),
+            dcc.Store(id='main-data', data=dataset_store.payload(snapshot)),
+            dcc.Store(id='dataset-meta', data=meta),
             dcc.Store(id='resolved-dates', data={
                 'start_date': start_date_default.isoformat(),
                 'end_date': end_date_default.isoformat()
             }),
             dcc.Store(id='target-mode', data='auto'),
+            dcc.Store(id='chart-view'),
+            *[dcc.Store(id=f'{chart_id}-figures') for chart_id in TAB_CHARTS],
             html.Div([
-                # 좌측: 제목
-                html.H1("굿리치플러스 실적 현황", style={
-                    'textAlign': 'left',
-                    'fontSize': '2.2rem',
-                    'margin': 0,
-                    'paddingLeft': '10px',
-                    'fontWeight': 700,
-                    'flex': '1'
-                }),
+                # 좌측: 제목 + 데이터 기준 시각
+                html.Div([
+                    html.H1("굿리치플러스 실적 현황", style={
+                        'textAlign': 'left',
+                        'fontSize': '2.2rem',
+                        'margin': 0,
+                        'fontWeight': 700,
+                    }),
+                    html.Div(
+                        f"데이터 기준: {snapshot.checked_at:%Y-%m-%d %H:%M}",
+                        id='data-as-of',
+                        style={'fontSize': '0.9rem', 'color': '#888', 'marginTop': '6px'}
+                    ),
+                    stale_notice(snapshot.stale),
+                ], style={'paddingLeft': '10px', 'flex': '1'}),
                 # 우측: 설정 영역
                 html.Div([
                     html.Div([
@@ -127,6 +214,13 @@ def serve_layout():
                             ],
                             value='환산',
                             labelStyle={'display': 'inline-block', 'marginRight': '10px', 'fontSize': '0.98rem'}
+                        ),
+                        dcc.Checklist(
+                            id='exact-view',
+                            options=[{'label': '모든 점 표시', 'value': 'exact'}],
+                            value=[],
+                            labelStyle={'fontSize': '0.85rem', 'color': '#666'},
+                            style={'marginTop': '6px'}
                         )
                     ], style={'display': 'flex', 'flexDirection': 'column', 'width': '148px', 'height' : '75px'}),
                 ], style={
@@ -156,7 +250,9 @@ def serve_layout():
 app.layout = serve_layout
 
 # ----- 콜백 -----
-@app.callback(
+# 기간 드롭다운 보정은 브라우저에서 (assets/dates.js): dataset-meta의 날짜 범위만 쓰므로 서버 왕복 없음
+app.clientside_callback(
+    ClientsideFunction(namespace='dates', function_name='resolve'),
     Output('resolved-dates', 'data'),
     Output('start-year', 'value'),
     Output('start-month', 'value'),
@@ -171,75 +267,33 @@ app.layout = serve_layout
     Input('end-month', 'value'),
     Input('end-day', 'value'),
     Input('reset-date-btn', 'n_clicks'),
-    State('main-data', 'data'),
+    State('dataset-meta', 'data'),
+    State('resolved-dates', 'data'),
     prevent_initial_call=True
 )
-def sync_target_date_options(start_y, start_m, start_d, end_y, end_m, end_d, reset_clicks, data_json):
-    df = pd.read_json(data_json, orient='split')
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
-    min_date = df['날짜'].min().date()
-    max_date = df['날짜'].max().date()
-
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        trigger_id = None
-    else:
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
-    # '기간 초기화' 버튼 클릭 시 → 디폴트 날짜 강제 적용
-    if trigger_id == 'reset-date-btn':
-        start_date = max(max_date.replace(day=1), min_date)
-        end_date = max_date
-    else:
-        # None 방지
-        start_y = start_y if start_y is not None else min_date.year
-        start_m = start_m if start_m is not None else min_date.month
-        start_d = start_d if start_d is not None else min_date.day
-
-        end_y = end_y if end_y is not None else max_date.year
-        end_m = end_m if end_m is not None else max_date.month
-        end_d = end_d if end_d is not None else max_date.day
-
-        # 유효성 보정
-        start_y = max(min_date.year, min(start_y, max_date.year))
-        start_m = max(1, min(start_m, 12))
-        max_start_day = calendar.monthrange(start_y, start_m)[1]
-        start_d = max(1, min(start_d, max_start_day))
-        start_date = datetime.date(start_y, start_m, start_d)
-        if start_date < min_date:
-            start_date = min_date
-        if start_date > max_date:
-            start_date = max_date
-
-        end_y = max(min_date.year, min(end_y, max_date.year))
-        end_m = max(1, min(end_m, 12))
-        if datetime.date(end_y, end_m, 1) > max_date.replace(day=1):
-            end_y = max_date.year
-            end_m = max_date.month
-        max_end_day = calendar.monthrange(end_y, end_m)[1]
-        end_d = max(1, min(end_d, max_end_day))
-        end_date = datetime.date(end_y, end_m, end_d)
-        if end_date > max_date:
-            end_date = max_date
-        if end_date < min_date:
-            end_date = min_date
-
-    return (
-        {'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()},
-        start_date.year, start_date.month, start_date.day,
-        end_date.year, end_date.month, end_date.day
-    )
-    
+# 긴 일별 시계열 점 수 기준: 반폭 카드 그래프의 너비(브라우저 창 너비 기준)와 '모든 점 표시' 여부
+app.clientside_callback(
+    """
+    function(exact) {
+        return {width: Math.round(window.innerWidth * 0.49), exact: (exact || []).indexOf('exact') >= 0};
+    }
+    """,
+    Output('chart-view', 'data'),
+    Input('exact-view', 'value'),
+)
+
 @app.callback(
     dash.dependencies.Output('dashboard-content', 'children'),
     dash.dependencies.Input('resolved-dates', 'data'),
     dash.dependencies.Input('unit', 'value'),
     dash.dependencies.Input('value-type', 'value'),
     dash.dependencies.State('main-data', 'data'),
+    dash.dependencies.Input('chart-view', 'data'),
 )
-def update_dashboard(resolved_dates, unit, value_type, data_json):    
-    df = pd.read_json(data_json, orient='split')
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
+def update_dashboard(resolved_dates, unit, value_type, store_data, chart_view=None):
+    # 날짜 × 부서 집계 큐브 (버전당 1번 생성) → 카드/차트는 원본 행 대신 큐브에서 조회
+    cube = dataset_store.cube(store_data)
     start_date = pd.to_datetime(resolved_dates['start_date'])
     end_date = pd.to_datetime(resolved_dates['end_date'])
     
@@ -249,65 +303,48 @@ def update_dashboard(resolved_dates, unit, value_type, data_json):
         "unit": unit,
         "value_type": value_type
     }
+    # 요청당 1개: 같은 기간 합계/누적/부서별 합계는 행끼리 한 번만 계산
+    query_ctx = QueryContext(cube, hparams, point_budget(chart_view))
     return [
-        kpi_row(df, hparams),
+        kpi_row(query_ctx),
         #target_row(df, hparams),
-        period_summary_row(df, hparams),
-        cnt_row(df, hparams),
-        amt_row(df, hparams),
-        personal_row(df, hparams),
-        dept_amt_row(df, hparams),
-        dept_compare_row(df, hparams),
-        dept_line_row(df, hparams),
-        dept_heatmap_row(df, hparams)
+        period_summary_row(query_ctx),
+        cnt_row(query_ctx),
+        amt_row(query_ctx),
+        personal_row(query_ctx),
+        dept_amt_row(query_ctx),
+        dept_compare_row(query_ctx),
+        dept_line_row(query_ctx),
+        dept_heatmap_row(query_ctx)
     ]
 
-@app.callback(
-    Output('cnt-bar-graph', 'figure'),
-    Input('cnt-bar-tabs', 'value'),
-    Input('resolved-dates', 'data'),
-    Input('unit', 'value'),
-    State('main-data', 'data'),
-)
-def update_cnt_bar(tab, resolved_dates, unit, data_json):
-    df = pd.read_json(data_json, orient='split')
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
-    start_date = pd.to_datetime(resolved_dates['start_date'])
-    end_date = pd.to_datetime(resolved_dates['end_date'])
-    
-    if unit == '전체':
-        df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    else:
-        df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == unit)].copy()
+def cnt_bar_figure(tab, rollup, start_date, end_date, unit, max_points=None):
     value_col = '건수'
 
     if tab == 'day':
-        all_days = pd.date_range(start_date, end_date, freq="D")
-        daily_df = (df_period.groupby('날짜')[value_col].sum()
-                    .reindex(all_days, fill_value=0)
-                    .rename_axis('날짜').reset_index())
+        daily = rollup.daily(value_col, start_date, end_date, unit)
+        # 기간이 길면 구간별 최대(또는 합계) 막대로 묶음
+        x_days, y_days, size = bucket_bars(daily.index, daily.to_numpy(), max_points)
         fig = go.Figure(go.Bar(
-            x=daily_df['날짜'], y=daily_df[value_col], marker_color='#9baaff', name='일별'
+            x=x_days, y=y_days, marker_color='#9baaff', name=bucket_name('일별', size)
         ))
         fig.update_layout(xaxis=dict(tickformat='%m-%d'))
     elif tab == 'week':
-        df_week = df_period[df_period['날짜'].dt.weekday < 5].copy()
-        df_week['주월요일'] = df_week['날짜'] - pd.to_timedelta(df_week['날짜'].dt.weekday, unit='d')
-        df_week['주월요일'] = pd.to_datetime(df_week['주월요일'])
-        week_sum = df_week.groupby('주월요일')[value_col].sum().reset_index()
-        week_sum = week_sum.sort_values('주월요일')
-
-        tick_vals = week_sum['주월요일'] + pd.Timedelta(hours=12)
-        tick_text = week_sum['주월요일'].dt.strftime('%m-%d')
+        # 평일 행이 있는 주만 (월요일 기준)
+        weeks, week_sum, present = rollup.weekly(value_col, start_date, end_date, unit)
+        weeks, week_sum = weeks[present], week_sum[present]
+
+        tick_vals = weeks + pd.Timedelta(hours=12)
+        tick_text = rollup.week_label(weeks)
         fig = go.Figure(go.Bar(
             x=tick_vals,
-            y=week_sum[value_col],
+            y=week_sum,
             marker_color='#9baaff',
             name='주별'
         ))
 
         # ---- 티커 표시 조건 분기 ----
-        if len(week_sum) <= 10:
+        if len(weeks) <= 10:
             fig.update_layout(
                 xaxis=dict(
                     tickmode='array',
@@ -324,19 +361,13 @@ def update_cnt_bar(tab, resolved_dates, unit, data_json):
                 )
             )
     else:  # tab == 'month'
-        # ===== 월별 집계 =====
-        df_period['연도'] = df_period['날짜'].dt.year
-        df_period['월'] = df_period['날짜'].dt.month
-        month_df = (
-            df_period.groupby(['연도', '월'])[value_col]
-            .sum().reset_index()
-        )
-        # x축 라벨 생성: 연도가 바뀌는 1월만 'YYYY-1', 나머지는 'M'
+        # ===== 월별 집계 (행이 있는 달만) =====
+        months, month_sum, present = rollup.monthly(value_col, start_date, end_date, unit)
         # x축 라벨: 항상 'YY-MM'로 표기 (예: 25-04, 25-05)
-        x_tick = month_df.apply(lambda row: f"{str(row['연도'])[2:]}-{row['월']:02d}", axis=1)
+        x_tick = rollup.month_label(months[present])
         fig = go.Figure(go.Bar(
             x=x_tick,
-            y=month_df[value_col],
+            y=month_sum[present],
             marker_color='#9baaff',
             name='월별'
         ))
@@ -352,53 +383,48 @@ def update_cnt_bar(tab, resolved_dates, unit, data_json):
     return fig
 
 @app.callback(
-    Output('amt-bar-graph', 'figure'),
-    Input('amt-bar-tabs', 'value'),
+    Output('cnt-bar-figures', 'data'),
     Input('resolved-dates', 'data'),
     Input('unit', 'value'),
-    Input('value-type', 'value'),
     State('main-data', 'data'),
+    Input('chart-view', 'data'),
 )
-def update_amt_bar(tab, resolved_dates, unit, value_type, data_json):
-    df = pd.read_json(data_json, orient='split')
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
+def update_cnt_bar(resolved_dates, unit, store_data, chart_view=None):
+    # 버전당 1번 만든 일/주/월 집계에서 기간만 잘라 세 탭 그림을 한 번에 보냄 (탭 전환은 브라우저에서)
+    rollup = dataset_store.rollup(store_data)
     start_date = pd.to_datetime(resolved_dates['start_date'])
     end_date = pd.to_datetime(resolved_dates['end_date'])
-    
-    if unit == '전체':
-        df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    else:
-        df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == unit)].copy()
+    max_points = point_budget(chart_view)
+    return {tab: cnt_bar_figure(tab, rollup, start_date, end_date, unit, max_points) for tab in CHART_TABS}
+
+def amt_bar_figure(tab, rollup, start_date, end_date, unit, value_type, max_points=None):
     # 컬럼명 동적으로
     value_col = value_type
 
     if tab == 'day':
-        all_days = pd.date_range(start_date, end_date, freq="D")
-        daily_df = (df_period.groupby('날짜')[value_col].sum()
-                    .reindex(all_days, fill_value=0)
-                    .rename_axis('날짜').reset_index())
+        daily = rollup.daily(value_col, start_date, end_date, unit)
+        # 기간이 길면 구간별 최대(또는 합계) 막대로 묶음
+        x_days, y_days, size = bucket_bars(daily.index, daily.to_numpy(), max_points)
         fig = go.Figure(go.Bar(
-            x=daily_df['날짜'], y=daily_df[value_col], marker_color="#9cd7bf", name='일별'
+            x=x_days, y=y_days, marker_color="#9cd7bf", name=bucket_name('일별', size)
         ))
         fig.update_layout(xaxis=dict(tickformat='%m-%d'))
     elif tab == 'week':
-        df_week = df_period[df_period['날짜'].dt.weekday < 5].copy()
-        df_week['주월요일'] = df_week['날짜'] - pd.to_timedelta(df_week['날짜'].dt.weekday, unit='d')
-        df_week['주월요일'] = pd.to_datetime(df_week['주월요일'])
-        week_sum = df_week.groupby('주월요일')[value_col].sum().reset_index()
-        week_sum = week_sum.sort_values('주월요일')
-
-        tick_vals = week_sum['주월요일'] + pd.Timedelta(hours=12)
-        tick_text = week_sum['주월요일'].dt.strftime('%m-%d')
+        # 평일 행이 있는 주만 (월요일 기준)
+        weeks, week_sum, present = rollup.weekly(value_col, start_date, end_date, unit)
+        weeks, week_sum = weeks[present], week_sum[present]
+
+        tick_vals = weeks + pd.Timedelta(hours=12)
+        tick_text = rollup.week_label(weeks)
         fig = go.Figure(go.Bar(
             x=tick_vals,
-            y=week_sum[value_col],
+            y=week_sum,
             marker_color='#9cd7bf',
             name='주별'
         ))
 
         # --- 티커 표시 방식 분기 ---
-        if len(week_sum) <= 10:
+        if len(weeks) <= 10:
             xaxis_opts = dict(
                 tickmode='array',
                 tickvals=tick_vals,
@@ -415,16 +441,11 @@ def update_amt_bar(tab, resolved_dates, unit, value_type, data_json):
             xaxis=xaxis_opts
         )
     else:  # tab == 'month'
-        df_period['연도'] = df_period['날짜'].dt.year
-        df_period['월'] = df_period['날짜'].dt.month
-        month_df = (
-            df_period.groupby(['연도', '월'])[value_col]
-            .sum().reset_index()
-        )
-        x_tick = month_df.apply(lambda row: f"{str(row['연도'])[2:]}-{row['월']:02d}", axis=1)
+        months, month_sum, present = rollup.monthly(value_col, start_date, end_date, unit)
+        x_tick = rollup.month_label(months[present])
         fig = go.Figure(go.Bar(
             x=x_tick,
-            y=month_df[value_col],
+            y=month_sum[present],
             marker_color='#9cd7bf',
             name='월별'
         ))
@@ -440,29 +461,33 @@ def update_amt_bar(tab, resolved_dates, unit, value_type, data_json):
     return fig
 
 @app.callback(
-    Output('dept-cnt-graph', 'figure'),
-    Input('dept-cnt-tabs', 'value'),
+    Output('amt-bar-figures', 'data'),
     Input('resolved-dates', 'data'),
+    Input('unit', 'value'),
+    Input('value-type', 'value'),
     State('main-data', 'data'),
+    Input('chart-view', 'data'),
 )
-def update_dept_cnt(tab, resolved_dates, data_json):
-    df = pd.read_json(data_json, orient='split')
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
+def update_amt_bar(resolved_dates, unit, value_type, store_data, chart_view=None):
+    rollup = dataset_store.rollup(store_data)
     start_date = pd.to_datetime(resolved_dates['start_date'])
     end_date = pd.to_datetime(resolved_dates['end_date'])
-    depts = df['부서'].unique()
+    max_points = point_budget(chart_view)
+    return {tab: amt_bar_figure(tab, rollup, start_date, end_date, unit, value_type, max_points) for tab in CHART_TABS}
+
+def dept_cnt_figure(tab, rollup, depts, start_date, end_date, max_points=None):
     value_col = '건수'
 
     if tab == 'day':
-        x_range = pd.date_range(start_date, end_date, freq="D")
+        x_range, table = rollup.daily_by_dept(value_col, start_date, end_date, depts)
+        # 선형 보간 (날짜 × 부서 표 전체를 한 번에, 0은 빈 값)
+        table = interpolate_zeros(table)
         traces = []
-        for dept in depts:
-            data = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == dept)]
-            y = data.groupby('날짜')[value_col].sum().reindex(x_range, fill_value=0)
-            # 선형 보간
-            y = y.replace(0, pd.NA).interpolate(method='linear').fillna(0)
-            traces.append(go.Scatter(
-                x=x_range, y=y, mode='lines+markers', name=dept, line_shape='spline'
+        for i, dept in enumerate(depts):
+            # 기간이 길면 LTTB로 점 수 제한 (부서마다 모양을 지키는 점이 다름)
+            x_days, y_days = lttb(x_range, table[:, i], max_points)
+            traces.append(line_trace(
+                x=x_days, y=y_days, mode='lines+markers', name=dept, line_shape='spline'
             ))
         fig = go.Figure(traces)
         fig.update_layout(
@@ -472,20 +497,13 @@ def update_dept_cnt(tab, resolved_dates, data_json):
             yaxis=dict(title=None, showgrid=True, gridcolor="#e0e0e0")
         )
     elif tab == 'week':
-        # 1. 시작일이 속한 주의 월요일 구하기
-        start_date = pd.to_datetime(start_date)
-        end_date = pd.to_datetime(end_date)
-        start_week_mon = start_date - pd.Timedelta(days=start_date.weekday())  # 항상 월요일로
-        x_range = pd.date_range(start_week_mon, end_date, freq="W-MON")
+        # 시작일이 속한 주의 월요일부터 (평일만)
+        x_range, table = rollup.weekly_by_dept(value_col, start_date, end_date, depts)
+        table = interpolate_zeros(table)
         traces = []
-        for dept in depts:
-            data = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == dept)].copy()
-            data = data[data['날짜'].dt.weekday < 5]
-            data['주월요일'] = data['날짜'] - pd.to_timedelta(data['날짜'].dt.weekday, unit='d')
-            y = data.groupby('주월요일')[value_col].sum().reindex(x_range, fill_value=0)
-            y = y.replace(0, pd.NA).interpolate(method='linear').fillna(0)
-            traces.append(go.Scatter(
-                x=x_range, y=y, mode='lines+markers', name=dept, line_shape='spline'
+        for i, dept in enumerate(depts):
+            traces.append(line_trace(
+                x=x_range, y=table[:, i], mode='lines+markers', name=dept, line_shape='spline'
             ))
         fig = go.Figure(traces)
         
@@ -502,17 +520,13 @@ def update_dept_cnt(tab, resolved_dates, data_json):
             yaxis=dict(title=None, showgrid=True, gridcolor="#e0e0e0")
         )
     else:  # 'month'
-        # 1. 시작일이 포함된 월의 1일로 보정
-        start_month = pd.to_datetime(start_date).replace(day=1)
-        month_range = pd.date_range(start_month, end_date, freq="MS")
+        # 시작일이 포함된 월의 1일부터
+        month_range, table = rollup.monthly_by_dept(value_col, start_date, end_date, depts)
+        table = interpolate_zeros(table)
         traces = []
-        for dept in depts:
-            data = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == dept)].copy()
-            data['연월'] = data['날짜'].dt.to_period('M').dt.to_timestamp()
-            y = data.groupby('연월')[value_col].sum().reindex(month_range, fill_value=0)
-            y = y.replace(0, pd.NA).interpolate(method='linear').fillna(0)
-            traces.append(go.Scatter(
-                x=month_range, y=y, mode='lines+markers', name=dept, line_shape='spline'
+        for i, dept in enumerate(depts):
+            traces.append(line_trace(
+                x=month_range, y=table[:, i], mode='lines+markers', name=dept, line_shape='spline'
             ))
         fig = go.Figure(traces)
         fig.update_layout(
@@ -524,29 +538,31 @@ def update_dept_cnt(tab, resolved_dates, data_json):
     return fig
 
 @app.callback(
-    Output('dept-amt-graph', 'figure'),
-    Input('dept-amt-tabs', 'value'),
+    Output('dept-cnt-figures', 'data'),
     Input('resolved-dates', 'data'),
-    Input('value-type', 'value'),
     State('main-data', 'data'),
+    Input('chart-view', 'data'),
 )
-def update_dept_amt(tab, resolved_dates, value_type, data_json):
-    df = pd.read_json(data_json, orient='split')
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
+def update_dept_cnt(resolved_dates, store_data, chart_view=None):
+    depts = dataset_store.rows(store_data).depts
+    rollup = dataset_store.rollup(store_data)
     start_date = pd.to_datetime(resolved_dates['start_date'])
     end_date = pd.to_datetime(resolved_dates['end_date'])
-    depts = df['부서'].unique()
+    max_points = point_budget(chart_view)
+    return {tab: encode_figure(dept_cnt_figure(tab, rollup, depts, start_date, end_date, max_points)) for tab in CHART_TABS}
+
+def dept_amt_figure(tab, rollup, depts, start_date, end_date, value_type, max_points=None):
     value_col = value_type
 
     if tab == 'day':
-        x_range = pd.date_range(start_date, end_date, freq="D")
+        x_range, table = rollup.daily_by_dept(value_col, start_date, end_date, depts)
+        table = interpolate_zeros(table)
         traces = []
-        for dept in depts:
-            data = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == dept)]
-            y = data.groupby('날짜')[value_col].sum().reindex(x_range, fill_value=0)
-            y = y.replace(0, pd.NA).interpolate(method='linear').fillna(0)
-            traces.append(go.Scatter(
-                x=x_range, y=y, mode='lines+markers', name=dept, line_shape='spline'
+        for i, dept in enumerate(depts):
+            # 기간이 길면 LTTB로 점 수 제한 (부서마다 모양을 지키는 점이 다름)
+            x_days, y_days = lttb(x_range, table[:, i], max_points)
+            traces.append(line_trace(
+                x=x_days, y=y_days, mode='lines+markers', name=dept, line_shape='spline'
             ))
         fig = go.Figure(traces)
         fig.update_layout(
@@ -556,20 +572,13 @@ def update_dept_amt(tab, resolved_dates, value_type, data_json):
             yaxis=dict(title=None, showgrid=True, gridcolor="#e0e0e0")
         )
     elif tab == 'week':
-        # 1. 시작일이 속한 주의 월요일을 구해서 x_range 생성
-        start_date = pd.to_datetime(start_date)
-        end_date = pd.to_datetime(end_date)
-        start_week_mon = start_date - pd.Timedelta(days=start_date.weekday())
-        x_range = pd.date_range(start_week_mon, end_date, freq="W-MON")
+        # 시작일이 속한 주의 월요일부터 (평일만)
+        x_range, table = rollup.weekly_by_dept(value_col, start_date, end_date, depts)
+        table = interpolate_zeros(table)
         traces = []
-        for dept in depts:
-            data = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == dept)].copy()
-            data = data[data['날짜'].dt.weekday < 5]
-            data['주월요일'] = data['날짜'] - pd.to_timedelta(data['날짜'].dt.weekday, unit='d')
-            y = data.groupby('주월요일')[value_col].sum().reindex(x_range, fill_value=0)
-            y = y.replace(0, pd.NA).interpolate(method='linear').fillna(0)
-            traces.append(go.Scatter(
-                x=x_range, y=y, mode='lines+markers', name=dept, line_shape='spline'
+        for i, dept in enumerate(depts):
+            traces.append(line_trace(
+                x=x_range, y=table[:, i], mode='lines+markers', name=dept, line_shape='spline'
             ))
         fig = go.Figure(traces)
         # -- xaxis 옵션 분기 처리 --
@@ -584,17 +593,13 @@ def update_dept_amt(tab, resolved_dates, value_type, data_json):
             yaxis=dict(title=None, showgrid=True, gridcolor="#e0e0e0")
         )
     else:  # 'month'
-        # 시작일이 포함된 월의 1일로 보정
-        start_month = pd.to_datetime(start_date).replace(day=1)
-        month_range = pd.date_range(start_month, end_date, freq="MS")
+        # 시작일이 포함된 월의 1일부터
+        month_range, table = rollup.monthly_by_dept(value_col, start_date, end_date, depts)
+        table = interpolate_zeros(table)
         traces = []
-        for dept in depts:
-            data = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == dept)].copy()
-            data['연월'] = data['날짜'].dt.to_period('M').dt.to_timestamp()
-            y = data.groupby('연월')[value_col].sum().reindex(month_range, fill_value=0)
-            y = y.replace(0, pd.NA).interpolate(method='linear').fillna(0)
-            traces.append(go.Scatter(
-                x=month_range, y=y, mode='lines+markers', name=dept, line_shape='spline'
+        for i, dept in enumerate(depts):
+            traces.append(line_trace(
+                x=month_range, y=table[:, i], mode='lines+markers', name=dept, line_shape='spline'
             ))
         fig = go.Figure(traces)
         fig.update_layout(
@@ -604,6 +609,37 @@ def update_dept_amt(tab, resolved_dates, value_type, data_json):
             yaxis=dict(title=None, showgrid=True, gridcolor="#e0e0e0")
         )
     return fig
+
+@app.callback(
+    Output('dept-amt-figures', 'data'),
+    Input('resolved-dates', 'data'),
+    Input('value-type', 'value'),
+    State('main-data', 'data'),
+    Input('chart-view', 'data'),
+)
+def update_dept_amt(resolved_dates, value_type, store_data, chart_view=None):
+    depts = dataset_store.rows(store_data).depts
+    rollup = dataset_store.rollup(store_data)
+    start_date = pd.to_datetime(resolved_dates['start_date'])
+    end_date = pd.to_datetime(resolved_dates['end_date'])
+    max_points = point_budget(chart_view)
+    return {tab: encode_figure(dept_amt_figure(tab, rollup, depts, start_date, end_date, value_type, max_points)) for tab in CHART_TABS}
+
+# ---- 탭 전환은 브라우저에서: 받아 둔 일/주/월 그림 중 하나를 고름 (서버 왕복 없음) ----
+for chart_id in TAB_CHARTS:
+    app.clientside_callback(
+        """
+        function(tab, figures) {
+            if (!figures) {
+                return window.dash_clientside.no_update;
+            }
+            return figures[tab] || figures['day'];
+        }
+        """,
+        Output(f'{chart_id}-graph', 'figure'),
+        Input(f'{chart_id}-tabs', 'value'),
+        Input(f'{chart_id}-figures', 'data'),
+    )
     
 @app.callback(
     Output('target-row-container', 'children'),
@@ -613,9 +649,10 @@ def update_dept_amt(tab, resolved_dates, value_type, data_json):
     State('main-data', 'data'),
     State('value-type', 'value')
 )
-def update_target_row(resolved_dates, mode, unit, data_json, value_type):
-    df = pd.read_json(data_json, orient='split')
-    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
+def update_target_row(resolved_dates, mode, unit, store_data, value_type):
+    # 목표는 버전당 1번 만든 (연월, 부서) 표에서, 실적은 큐브 누적합에서
+    cube = dataset_store.cube(store_data)
+    goals = dataset_store.goals(store_data)
     start_date = pd.to_datetime(resolved_dates['start_date'])
     end_date = pd.to_datetime(resolved_dates['end_date'])
     year = pd.to_datetime(end_date).year
@@ -642,7 +679,7 @@ def update_target_row(resolved_dates, mode, unit, data_json, value_type):
         "end_date": target_end
     }
 
-    return target_row(df, hparams)
+    return target_row(cube, goals, hparams)
 
 if __name__ == '__main__':
     app.run_server(debug=True)
@@ -0,0 +1,69 @@
+// 기간 드롭다운 보정 (clientside, 서버 왕복 없음)
+// - dataset-meta 스토어의 min_date / max_date 범위로 년·월·일을 보정해 resolved-dates에 넣음
+// - '기간 초기화' 버튼: 최신 날짜가 속한 달 1일 ~ 최신 날짜
+// - 보정 결과가 이전과 같으면 resolved-dates는 그대로 둠 (대시보드 콜백이 다시 돌지 않도록)
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dates: {
+        resolve: function (startY, startM, startD, endY, endM, endD, resetClicks, meta, current) {
+            var noUpdate = window.dash_clientside.no_update;
+            if (!meta) {
+                return [noUpdate, noUpdate, noUpdate, noUpdate, noUpdate, noUpdate, noUpdate];
+            }
+            var triggered = window.dash_clientside.callback_context.triggered;
+            var trigger = triggered.length ? triggered[0].prop_id.split('.')[0] : null;
+
+            var parse = function (iso) {
+                var parts = iso.split('-');
+                return [Number(parts[0]), Number(parts[1]), Number(parts[2])];
+            };
+            var key = function (d) { return d[0] * 10000 + d[1] * 100 + d[2]; };
+            var clampDate = function (d, lo, hi) {
+                if (key(d) < key(lo)) { return lo; }
+                if (key(d) > key(hi)) { return hi; }
+                return d;
+            };
+            var clamp = function (v, lo, hi) { return Math.max(lo, Math.min(v, hi)); };
+            var daysInMonth = function (y, m) { return new Date(y, m, 0).getDate(); };
+            var pad = function (v) { return (v < 10 ? '0' : '') + v; };
+            var iso = function (d) { return d[0] + '-' + pad(d[1]) + '-' + pad(d[2]); };
+
+            var minDate = parse(meta.min_date);
+            var maxDate = parse(meta.max_date);
+            var start, end;
+
+            if (trigger === 'reset-date-btn') {
+                start = clampDate([maxDate[0], maxDate[1], 1], minDate, maxDate);
+                end = maxDate;
+            } else {
+                // None 방지
+                startY = startY == null ? minDate[0] : startY;
+                startM = startM == null ? minDate[1] : startM;
+                startD = startD == null ? minDate[2] : startD;
+                endY = endY == null ? maxDate[0] : endY;
+                endM = endM == null ? maxDate[1] : endM;
+                endD = endD == null ? maxDate[2] : endD;
+
+                // 유효성 보정
+                startY = clamp(startY, minDate[0], maxDate[0]);
+                startM = clamp(startM, 1, 12);
+                startD = clamp(startD, 1, daysInMonth(startY, startM));
+                start = clampDate([startY, startM, startD], minDate, maxDate);
+
+                endY = clamp(endY, minDate[0], maxDate[0]);
+                endM = clamp(endM, 1, 12);
+                if (endY * 100 + endM > maxDate[0] * 100 + maxDate[1]) {
+                    endY = maxDate[0];
+                    endM = maxDate[1];
+                }
+                endD = clamp(endD, 1, daysInMonth(endY, endM));
+                end = clampDate([endY, endM, endD], minDate, maxDate);
+            }
+
+            var resolved = {start_date: iso(start), end_date: iso(end)};
+            if (current && current.start_date === resolved.start_date && current.end_date === resolved.end_date) {
+                resolved = noUpdate;
+            }
+            return [resolved, start[0], start[1], start[2], end[0], end[1], end[2]];
+        }
+    }
+});
@@ -4,50 +4,38 @@ import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
 
-def dept_heatmap_row(df, hparams):
-    # ----- 날짜 처리 -----
-    df['날짜'] = pd.to_datetime(df['날짜'])
-    end_date = pd.to_datetime(hparams['end_date'])
-    start_date = pd.to_datetime(hparams['start_date'])
+from dataset.cube import ROWS, nonzero
 
-    # == 요일 한글 매핑 ==
-    eng2kor = {
-        'Monday': '월요일',
-        'Tuesday': '화요일',
-        'Wednesday': '수요일',
-        'Thursday': '목요일',
-        'Friday': '금요일',
-    }
-    dow_order = ['월요일', '화요일', '수요일', '목요일', '금요일']
+# == 요일 순서 (평일만) ==
+DOW_ORDER = ['월요일', '화요일', '수요일', '목요일', '금요일']
 
-    # --- [1] 부서별 요일 평균 "건수" (정규화, 0 제외) ---
-    df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    df_period['요일'] = df_period['날짜'].dt.day_name().map(eng2kor)
-    df_period = df_period[df_period['요일'].isin(dow_order)]
+def weekday_norm(ctx, measures):
+    """
+    측정값별 부서 × 평일 평균(0인 값 제외)을 부서마다 Min-Max 정규화 → 측정값마다 DataFrame
+    - 평일 행이 없는 부서는 빠지고, 실적 전무인 요일은 0
+    - 평균/정규화는 측정값 × 부서 × 요일 배열에서 한 번에
+    """
+    rows = ctx.by_weekday(ROWS)
+    present = rows.sum(axis=1).to_numpy() > 0
+    sums = np.stack([ctx.by_weekday(m).to_numpy()[present] for m in measures]).astype('float64')
+    hits = np.stack([ctx.by_weekday(nonzero(m)).to_numpy()[present] for m in measures])
+    mean = np.zeros(sums.shape)
+    np.divide(sums, hits, out=mean, where=hits > 0)
 
-    # 0인 값 NaN으로 처리
-    df_period['건수'] = df_period['건수'].replace(0, np.nan)
-    cnt_mean = (
-        df_period.groupby(['부서', '요일'])['건수'].mean()
-        .unstack(fill_value=np.nan)
-        .reindex(columns=dow_order)
-    ).fillna(0)  # 실적 전무인 요일만 0으로
+    low = mean.min(axis=2, keepdims=True)
+    high = mean.max(axis=2, keepdims=True)
+    norm = (mean - low) / (high - low + 1e-8)
 
-    # 부서별 Min-Max 정규화
-    cnt_norm = cnt_mean.sub(cnt_mean.min(axis=1), axis=0)
-    cnt_norm = cnt_norm.div(cnt_mean.max(axis=1) - cnt_mean.min(axis=1) + 1e-8, axis=0)
+    index = rows.index[present]
+    columns = pd.Index(DOW_ORDER, name='요일')
+    return [pd.DataFrame(table, index=index, columns=columns) for table in norm]
 
-    # --- [2] 부서별 요일 평균 "환산(보험료)" (정규화, 0 제외) ---
-    value_col = hparams.get('value_type', '환산')
-    df_period[value_col] = df_period[value_col].replace(0, np.nan)
-    amt_mean = (
-        df_period.groupby(['부서', '요일'])[value_col].mean()
-        .unstack(fill_value=np.nan)
-        .reindex(columns=dow_order)
-    ).fillna(0)
+def dept_heatmap_row(ctx):
+    hparams = ctx.hparams
 
-    amt_norm = amt_mean.sub(amt_mean.min(axis=1), axis=0)
-    amt_norm = amt_norm.div(amt_mean.max(axis=1) - amt_mean.min(axis=1) + 1e-8, axis=0)
+    # --- 부서별 요일 평균 "건수" / "환산(보험료)" (0 제외, 부서별 Min-Max 정규화) ---
+    value_col = ctx.value_col
+    cnt_norm, amt_norm = weekday_norm(ctx, ['건수', value_col])
 
     # plotly.express imshow (좌: 건수, 우: 환산/보험료)
     fig_cnt = px.imshow(
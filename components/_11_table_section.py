@@ -2,10 +2,123 @@ import pandas as pd
 from dash import html, dcc, dash_table
 import dash
 from dash.dependencies import Input, Output, State
-import io
 import base64
+import math
+import operator
+import os
 
-def register_table_callback(app):
+import numpy as np
+
+from dataset.export import EXPORT_FORMATS, ExportCache, export_rows
+from dataset.refresher import SHARED_DIR, private_dir
+
+try:
+    import diskcache
+    from dash import DiskcacheManager
+except ImportError:     # diskcache가 없으면 내보내기는 요청 안에서 바로 처리
+    diskcache = None
+
+# ---- 내보내기: DATASET_EXPORT_BACKGROUND=1이고 diskcache가 있으면 백그라운드 작업(진행률 표시)으로 ----
+EXPORT_BACKGROUND = os.environ.get('DATASET_EXPORT_BACKGROUND', '0') == '1'
+EXPORT_SORT = [{'column_id': '날짜', 'direction': 'asc'}, {'column_id': '부서', 'direction': 'asc'}]
+
+# ---- 상세 테이블: 페이지·정렬·필터는 서버에서 (브라우저에는 보이는 페이지 행만 전송) ----
+PAGE_SIZE = 20
+DEFAULT_SORT = [{'column_id': '날짜', 'direction': 'desc'}, {'column_id': '부서', 'direction': 'asc'}]
+FILTER_OPERATORS = [
+    ('ge ', '>=', operator.ge), ('le ', '<=', operator.le), ('lt ', '<', operator.lt),
+    ('gt ', '>', operator.gt), ('ne ', '!=', operator.ne), ('eq ', '=', operator.eq),
+    ('contains ', None, None), ('datestartswith ', None, None),
+]
+
+def split_filter_part(filter_part):
+    """
+    DataTable filter_query 조각 '{컬럼} 연산자 값' → (컬럼, 연산자 이름, 값)
+    - 연산자는 '}' 바로 뒤에서만 찾음 (값 안의 '=' 등은 값으로 취급), 따옴표로 감싼 값은 벗김
+    """
+    left, brace, rest = filter_part.partition('}')
+    if not brace or '{' not in left:
+        return None, None, None
+    column = left[left.find('{') + 1:]
+    rest = rest.strip()
+    for name, symbol, _ in FILTER_OPERATORS:
+        for token in (name, symbol):
+            if token is None or not rest.startswith(token):
+                continue
+            value = rest[len(token):].strip()
+            if len(value) > 1 and value[0] == value[-1] and value[0] in ("'", '"', '`'):
+                value = value[1:-1].replace('\\' + value[0], value[0])
+            return column, name.strip(), value
+    return None, None, None
+
+def filter_mask(values, op_name, value):
+    """한 컬럼 값 배열에 필터 조건 적용 → bool 배열 (값을 해석할 수 없으면 모두 False)"""
+    series = pd.Series(values)
+    if op_name in ('contains', 'datestartswith'):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            text = series.dt.strftime('%Y-%m-%d')
+        else:
+            text = series.astype(str)
+        if op_name == 'contains':
+            return text.str.contains(value, regex=False).to_numpy()
+        return text.str.startswith(value).to_numpy()
+    compare = next(fn for name, _, fn in FILTER_OPERATORS if name.strip() == op_name)
+    try:
+        if pd.api.types.is_datetime64_any_dtype(series):
+            target = pd.Timestamp(value)
+        elif pd.api.types.is_numeric_dtype(series):
+            target = float(value)
+        else:
+            series, target = series.astype(str), value
+        return compare(series, target).to_numpy()
+    except (TypeError, ValueError):
+        return np.zeros(len(series), dtype=bool)
+
+def sort_positions(df, positions, sort_by):
+    """DataTable sort_by 순서로 행 위치 배열 정렬 (같은 값끼리는 원래 순서 유지)"""
+    keys = []
+    for sort in reversed(sort_by):
+        if sort['column_id'] not in df.columns:
+            continue
+        values = df[sort['column_id']].to_numpy()[positions]
+        codes = np.unique(values.astype(str) if values.dtype == object else values, return_inverse=True)[1]
+        keys.append(-codes if sort['direction'] == 'desc' else codes)
+    if keys:
+        positions = positions[np.lexsort(keys)]
+    return positions
+
+def table_page(rows, start_date, end_date, depts, page_current=0, page_size=PAGE_SIZE, sort_by=None, filter_query=''):
+    """
+    상세 테이블 한 페이지 → (행 records, 전체 행 수)
+    - 정렬된 행 인덱스에서 기간·부서 행 위치만 고른 뒤, 필터·정렬은 위치 배열로 처리
+    - 프레임으로 만드는 것은 보이는 page_size개 행뿐
+    """
+    df = rows.df
+    positions = rows.positions(start_date, end_date, depts)
+    for part in (filter_query or '').split(' && '):
+        column, op_name, value = split_filter_part(part)
+        if column in df.columns:
+            positions = positions[filter_mask(df[column].to_numpy()[positions], op_name, value)]
+    positions = sort_positions(df, positions, sort_by or DEFAULT_SORT)
+    page = positions[page_current * page_size:(page_current + 1) * page_size]
+    return df.take(page).to_dict('records'), len(positions)
+
+def current_page(triggered, page_current):
+    """콜백4를 부른 prop_id 목록 → 보여줄 페이지 (정렬/필터/페이지 크기가 바뀌면 첫 페이지부터)"""
+    if any(not prop_id.endswith('.page_current') for prop_id in triggered):
+        return 0
+    return page_current or 0
+
+def register_table_callback(app, dataset_store):
+    # dataset_store: main-data 스토어 값 → 스냅샷·원본 행 인덱스 (app의 DatasetStore)
+    resolve_rows = dataset_store.rows
+    manager = disk = None
+    jobs_dir = os.path.join(SHARED_DIR, 'export-jobs')
+    if EXPORT_BACKGROUND and diskcache is not None and private_dir(jobs_dir):
+        # diskcache는 값을 pickle로 저장하므로 현재 사용자만 쓸 수 있는 디렉터리에서만 사용
+        disk = diskcache.Cache(jobs_dir)
+        manager = DiskcacheManager(disk)
+    export_cache = ExportCache(disk=disk)
     # 테이블 필터 및 컴포넌트 레이아웃만 정의 (데이터는 사용하지 않음!)
     table_layout = html.Div([
         html.H3("일별 실적 상세 테이블"),
@@ -20,10 +133,18 @@ def register_table_callback(app):
                 display_format='YYYY-MM-DD',
                 style={'marginBottom': '1rem'}
             ),
-            html.Div(
-                html.Button("엑셀 다운로드", id="table-download-btn"),
-                style={'marginLeft': '30px', 'display': 'inline-block', 'verticalAlign': 'middle'}
-            ),
+            html.Div([
+                dcc.RadioItems(
+                    id='table-download-format',
+                    options=[{'label': label, 'value': fmt} for fmt, label in EXPORT_FORMATS.items()],
+                    value='xlsx',
+                    inline=True,
+                    style={'display': 'inline-block', 'marginRight': '10px'}
+                ),
+                html.Button("다운로드", id="table-download-btn"),
+                html.Progress(id='table-download-progress', value='0', max='1',
+                              style={'display': 'none', 'marginLeft': '10px'}),
+            ], style={'marginLeft': '30px', 'display': 'inline-block', 'verticalAlign': 'middle'}),
             dcc.Download(id="table-download-excel"),
         ]),
         html.Div(id='table-dataframe-container'),
@@ -39,12 +160,11 @@ def register_table_callback(app):
         Output('table-date-picker', 'end_date'),
         Input('main-data', 'data')
     )
-    def set_table_filter_options(data_json):
-        df = pd.read_json(data_json, orient='split')
-        df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
-        dept_list = df['부서'].unique().tolist()
-        min_date = df['날짜'].min().date()
-        max_date = df['날짜'].max().date()
+    def set_table_filter_options(store_data):
+        rows = resolve_rows(store_data)
+        dept_list = list(rows.depts)
+        min_date = rows.min_date.date()
+        max_date = rows.max_date.date()
         return (
             [{'label': d, 'value': d} for d in dept_list],
             dept_list,  # 전체 선택 default
@@ -59,52 +179,99 @@ def register_table_callback(app):
         Input('table-date-picker', 'end_date'),
         State('main-data', 'data')
     )
-    def update_table(selected_dept, start_date, end_date, data_json):
-        df = pd.read_json(data_json, orient='split')
-        df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
+    def update_table(selected_dept, start_date, end_date, store_data):
+        rows = resolve_rows(store_data)
         if not selected_dept or not start_date or not end_date:
             return "필터를 선택하세요."
-        filtered_df = df[
-            (df['부서'].isin(selected_dept)) &
-            (df['날짜'] >= pd.to_datetime(start_date)) &
-            (df['날짜'] <= pd.to_datetime(end_date))
-        ].copy()
-        filtered_df = filtered_df.sort_values(by=['날짜', '부서'], ascending=[False, True])
-        if filtered_df.empty:
+        # 첫 페이지는 테이블과 같이 내려보내고, 이후 페이지/정렬/필터는 콜백4에서
+        records, total = table_page(rows, pd.to_datetime(start_date), pd.to_datetime(end_date), selected_dept)
+        if total == 0:
             return "조회 결과가 없습니다."
-        return dash_table.DataTable(
-            data=filtered_df.to_dict('records'),
-            columns=[{"name": i, "id": i} for i in filtered_df.columns],
-            page_size=20,
-            style_table={'overflowX': 'auto'},
-            style_cell={'textAlign': 'center'},
-        )
+        return html.Div([
+            html.Div(f"총 {total:,}건", id='table-total', style={'textAlign': 'right', 'marginBottom': '0.5rem'}),
+            dash_table.DataTable(
+                id='table-detail',
+                data=records,
+                columns=[{"name": i, "id": i} for i in rows.df.columns],
+                page_current=0,
+                page_size=PAGE_SIZE,
+                page_count=math.ceil(total / PAGE_SIZE),
+                page_action='custom',
+                sort_action='custom',
+                sort_mode='multi',
+                sort_by=[],
+                filter_action='custom',
+                filter_query='',
+                style_table={'overflowX': 'auto'},
+                style_cell={'textAlign': 'center'},
+            ),
+        ])
 
-    # --- 콜백3: 엑셀 다운로드
+    # --- 콜백4: 페이지 이동 / 정렬 / 필터 (보이는 페이지 행과 전체 건수만 전송)
     @app.callback(
-        Output("table-download-excel", "data"),
-        Input("table-download-btn", "n_clicks"),
-        Input('table-dept-dropdown', 'value'),
-        Input('table-date-picker', 'start_date'),
-        Input('table-date-picker', 'end_date'),
+        Output('table-detail', 'data'),
+        Output('table-detail', 'page_count'),
+        Output('table-detail', 'page_current'),
+        Output('table-total', 'children'),
+        Input('table-detail', 'page_current'),
+        Input('table-detail', 'page_size'),
+        Input('table-detail', 'sort_by'),
+        Input('table-detail', 'filter_query'),
+        State('table-dept-dropdown', 'value'),
+        State('table-date-picker', 'start_date'),
+        State('table-date-picker', 'end_date'),
         State('main-data', 'data'),
         prevent_initial_call=True
     )
-    def download_excel(n_clicks, selected_dept, start_date, end_date, data_json):
-        df = pd.read_json(data_json, orient='split')
-        df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
-        if n_clicks is None or not selected_dept:
+    def update_table_page(page_current, page_size, sort_by, filter_query, selected_dept, start_date, end_date, store_data):
+        rows = resolve_rows(store_data)
+        page_current = current_page([t['prop_id'] for t in dash.callback_context.triggered], page_current)
+        records, total = table_page(
+            rows, pd.to_datetime(start_date), pd.to_datetime(end_date), selected_dept,
+            page_current, page_size, sort_by, filter_query,
+        )
+        return records, max(math.ceil(total / page_size), 1), page_current, f"총 {total:,}건"
+
+    # --- 콜백3: 다운로드 (버튼을 누를 때만, 같은 버전·부서·기간·형식이면 만들어 둔 파일 사용)
+    def download_table(set_progress, n_clicks, fmt, selected_dept, start_date, end_date, store_data):
+        if not n_clicks or not selected_dept or not start_date or not end_date:
             return dash.no_update
-        filtered_df = df[
-            (df['부서'].isin(selected_dept)) &
-            (df['날짜'] >= pd.to_datetime(start_date)) &
-            (df['날짜'] <= pd.to_datetime(end_date))
-        ].copy()
-        filtered_df = filtered_df.sort_values(by=['날짜', '부서'], ascending=[True, True])
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            filtered_df.to_excel(writer, index=False, sheet_name='실적')
-        processed_data = output.getvalue()
-        return dcc.send_bytes(processed_data, filename="실적_상세_테이블.xlsx")
+        snapshot = dataset_store.resolve(store_data)
+        rows = resolve_rows(store_data)
+        start, end = pd.to_datetime(start_date), pd.to_datetime(end_date)
+        key = (snapshot.version, tuple(sorted(selected_dept)), start.date().isoformat(), end.date().isoformat(), fmt)
+
+        def build():
+            positions = sort_positions(rows.df, rows.positions(start, end, selected_dept), EXPORT_SORT)
+            progress = (lambda done, total: set_progress((str(done), str(total)))) if set_progress else None
+            return export_rows(rows.df, positions, fmt, progress)
+
+        return dcc.send_bytes(export_cache.get(key, build), filename=f"실적_상세_테이블.{fmt}")
+
+    download_deps = (
+        Output("table-download-excel", "data"),
+        Input("table-download-btn", "n_clicks"),
+        State('table-download-format', 'value'),
+        State('table-dept-dropdown', 'value'),
+        State('table-date-picker', 'start_date'),
+        State('table-date-picker', 'end_date'),
+        State('main-data', 'data'),
+    )
+    if manager is not None:
+        app.callback(
+            *download_deps,
+            background=True,
+            manager=manager,
+            progress=[Output('table-download-progress', 'value'), Output('table-download-progress', 'max')],
+            running=[
+                (Output('table-download-btn', 'disabled'), True, False),
+                (Output('table-download-progress', 'style'), {'display': 'inline-block', 'marginLeft': '10px'}, {'display': 'none'}),
+            ],
+            prevent_initial_call=True
+        )(download_table)
+    else:
+        @app.callback(*download_deps, prevent_initial_call=True)
+        def download_table_now(*args):
+            return download_table(None, *args)
 
     return table_layout
@@ -2,6 +2,8 @@ import pandas as pd
 from dash import html
 import dash_iconify
 
+from dataset.cube import DAYS
+
 def kpi_card(title, value, icon, accent="#2176ff"):
     return html.Div([
         html.Div(style={
@@ -37,28 +39,19 @@ def kpi_card(title, value, icon, accent="#2176ff"):
         "justifyContent": "center"
     })
 
-def kpi_row(df, hparams):
-    start_date = hparams["start_date"]
-    end_date = hparams["end_date"]
-    unit = hparams["unit"]
-    value_col = hparams["value_type"]
+def kpi_row(ctx):
+    hparams = ctx.hparams
+    value_col = ctx.value_col
 
-    # 부서 필터링
-    if unit == "전체":
-        dff = df[(df["날짜"] >= start_date) & (df["날짜"] <= end_date)]
-    else:
-        dff = df[(df["날짜"] >= start_date) & (df["날짜"] <= end_date) & (df["부서"] == unit)]
-        
-    if dff.empty:
+    # 행이 있는 날 수 (부서 필터 반영) = 실근무일
+    unique_work_days = ctx.total(DAYS)
+    if not unique_work_days:
         return html.Div("해당 기간에 데이터가 없습니다.", style={"padding": "2em", "textAlign": "center"})
 
-    total_count = int(dff['건수'].sum()) if not dff.empty else 0
-
-    total_count = int(dff['건수'].sum())
-    total_amt = int(dff[value_col].sum())
+    total_count = ctx.total('건수')
+    total_amt = ctx.total(value_col)
     
     # *** 실근무일(데이터 존재 날짜)로 나누기 ***
-    unique_work_days = dff['날짜'].nunique()  # 데이터가 존재하는 날짜의 개수
     avg_count = round(total_count / unique_work_days, 2) if unique_work_days else 0
     avg_amt = round(total_amt / unique_work_days, 0) if unique_work_days else 0
     
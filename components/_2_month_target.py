@@ -4,6 +4,8 @@ import pandas as pd
 import calendar
 from dash_iconify import DashIconify
 
+from dataset.goals import group_totals, overall_goal
+
 DASH_BG = "#FFFFFF"
 
 TITLE_STYLE = {
@@ -61,11 +63,12 @@ def side_donut(item):
     })
 
 
-def target_row(df, hparams):
+def target_row(cube, goal_table, hparams):
+    # cube: dataset.cube.Cube (기간 합계) / goal_table: dataset.goals.GoalTable (연월·부서별 목표)
     # ---- 1. 연/월 옵션 생성 ----
     end_date = hparams.get('end_date')
     if end_date is None:
-        end_date = df['날짜'].max()
+        end_date = cube.dates.max()
     else:
         end_date = pd.to_datetime(end_date)
 
@@ -84,49 +87,33 @@ def target_row(df, hparams):
         target_month_start = pd.Timestamp(year=year, month=month, day=1)
         target_month_end = pd.Timestamp(year=year, month=month, day=last_day)
 
-    # ---- 4. 월별 데이터 필터링 ----
-    df_month = df[(df['날짜'] >= target_month_start) & (df['날짜'] <= target_month_end)].copy()
-
+    # ---- 4. 목표 표 × 기간 합계 (부서 수만큼, 원본 행을 훑지 않음) ----
     sidebar_depts = ['전체', '알파실', '드림1실', '드림2실', '골드1실', '골드2실', '레전드실']
     all_real_depts = ['알파실', '드림1실', '드림2실', '골드1실', '골드2실', '레전드실']
 
-    summary = {}
-
-    # (1) 개별 부서 집계
-    for dept in all_real_depts:
-        if dept in ['드림1실', '드림2실']:
-            dr_sum = df_month[df_month['부서'].isin(['드림1실', '드림2실'])]['환산'].sum()
-            dept_goal_arr = df_month[df_month['부서'] == dept]['목표환산'].unique()
-            goal = dept_goal_arr[0] if len(dept_goal_arr) > 0 else 0
-            ratio = round((dr_sum/goal)*100,1) if goal else 0
-            remain = goal - dr_sum
-            summary[dept] = {
-                '부서': dept, '목표환산': goal, '누적환산': dr_sum,
-                '달성률': ratio, '남은금액': remain
-            }
-        else:
-            sub_df = df_month[df_month['부서'] == dept]
-            goal_arr = sub_df['목표환산'].unique()
-            goal = goal_arr[0] if len(goal_arr) > 0 else 0
-            _sum = sub_df['환산'].sum()
-            ratio = round((_sum/goal)*100,1) if goal else 0
-            remain = goal - _sum
-            summary[dept] = {
-                '부서': dept, '목표환산': goal, '누적환산': _sum,
-                '달성률': ratio, '남은금액': remain
-            }
-
-    # (2) 전체 목표
-    goal_per_dept = df_month.groupby('부서')['목표환산'].first()
-    dr2_goal = df_month.query("부서 == '드림2실'")['목표환산'].unique()
-    dr2_goal_val = dr2_goal[0] if len(dr2_goal) > 0 else 0
-    overall_goal = goal_per_dept.sum() - dr2_goal_val
-    overall_sum = df_month['환산'].sum()
-    overall_ratio = round((overall_sum / overall_goal) * 100, 1) if overall_goal else 0
-    overall_remain = overall_goal - overall_sum
+    goals = goal_table.month(target_month_start, target_month_end)
+    depts = pd.Index(list(dict.fromkeys(all_real_depts + cube.depts)), name='부서')
+    sums = cube.dept_totals(['환산'], target_month_start, target_month_end)['환산'].reindex(depts, fill_value=0)
+
+    # (1) 개별 부서 (드림1실/드림2실은 같은 목표 → 두 실 합계로 비교)
+    frame = pd.DataFrame({
+        '부서': depts,
+        '목표환산': goals.reindex(depts, fill_value=0).to_numpy(),
+        '누적환산': group_totals(sums).to_numpy(),
+    }, index=depts)
+    goal = frame['목표환산']
+    frame['달성률'] = (frame['누적환산'] / goal.where(goal != 0) * 100).round(1).fillna(0)
+    frame['남은금액'] = goal - frame['누적환산']
+    summary = frame.to_dict('index')
+
+    # (2) 전체 목표 (공유 목표는 한 번만)
+    overall_goal_val = overall_goal(goals)
+    overall_sum = cube.total('환산', target_month_start, target_month_end)
+    overall_ratio = round((overall_sum / overall_goal_val) * 100, 1) if overall_goal_val else 0
+    overall_remain = overall_goal_val - overall_sum
     summary['전체'] = {
         '부서': '전체',
-        '목표환산': overall_goal,
+        '목표환산': overall_goal_val,
         '누적환산': overall_sum,
         '달성률': overall_ratio,
         '남은금액': overall_remain
@@ -199,7 +186,7 @@ def target_row(df, hparams):
     # 기간 계산
     start_date = f"{year_str}-0{month_str}-01"
     if hparams.get('mode', 'auto') == 'auto':
-        max_date = df['날짜'].max()
+        max_date = cube.dates.max()
         # end_date가 없으면 max_date, 있으면 그것을 사용
         end_date = pd.to_datetime(hparams.get('end_date')) if hparams.get('end_date') is not None else max_date
 
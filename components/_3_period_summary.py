@@ -2,7 +2,7 @@ import pandas as pd
 from dash import html, dcc
 import plotly.graph_objects as go
 
-def period_summary_row(df, hparams):
+def period_summary_row(ctx):
     """
     오늘의 실적, 이번 주 실적, 이번 달 실적 카드 3개(1행)
     """
@@ -19,47 +19,27 @@ def period_summary_row(df, hparams):
     }
 
     # --------- 1. 오늘의 실적 카드 ---------
-    base_date = hparams["end_date"]
-    unit = hparams["unit"]
-    value_col = hparams["value_type"]
+    hparams = ctx.hparams
+    base_date = ctx.end_date
+    unit = ctx.unit
+    value_col = ctx.value_col
 
-    df['날짜'] = pd.to_datetime(df['날짜'])
-    
     # 오늘 날짜 기준으로 과거 중 실적이 있는 마지막 날짜 찾기
-    df_sorted = df.sort_values("날짜")
-    df_with_data = df_sorted[(df_sorted["날짜"] < base_date)]
-    if unit != "전체":
-        df_with_data = df_with_data[df_with_data["부서"] == unit]
-
-    # 데이터가 존재하는 가장 최근 날짜
-    if not df_with_data.empty:
-        last_working_date = df_with_data["날짜"].max()
-    else:
-        last_working_date = None
+    last_working_date = ctx.last_date_before(base_date)
 
     yesterday = base_date
     day_before = last_working_date
 
-    if unit == "전체":
-        yesterday_df = df[df['날짜'] == yesterday]
-        day_before_df = df[df['날짜'] == day_before]
-    else:
-        yesterday_df = df[(df['날짜'] == yesterday) & (df['부서'] == unit)]
-        day_before_df = df[(df['날짜'] == day_before) & (df['부서'] == unit)]
-        
+    y_count = ctx.total('건수', yesterday, yesterday)
+    y_amt = ctx.total(value_col, yesterday, yesterday)
     if day_before is not None:
-        day_before_df = df[df["날짜"] == day_before]
-        if unit != "전체":
-            day_before_df = day_before_df[day_before_df["부서"] == unit]
-        db_count = int(day_before_df["건수"].sum())
-        db_amt = int(day_before_df[value_col].sum())
+        db_count = ctx.total('건수', day_before, day_before)
+        db_amt = ctx.total(value_col, day_before, day_before)
     else:
         db_count = 0
         db_amt = 0
 
-    y_count = int(yesterday_df['건수'].sum())
     diff_count = y_count - db_count
-    y_amt = int(yesterday_df[value_col].sum())
     diff_amt = y_amt - db_amt
 
     def diff_text_html(diff):
@@ -100,16 +80,10 @@ def period_summary_row(df, hparams):
     week_start = base_date - pd.Timedelta(days=base_date.weekday())
     last_week_start = week_start - pd.Timedelta(days=7)
     last_week_end = week_start - pd.Timedelta(days=1)
-    if unit == '전체':
-        df_this_week = df[(df['날짜'] >= week_start) & (df['날짜'] <= base_date)]
-        df_last_week = df[(df['날짜'] >= last_week_start) & (df['날짜'] <= last_week_end)]
-    else:
-        df_this_week = df[(df['날짜'] >= week_start) & (df['날짜'] <= base_date) & (df['부서'] == unit)]
-        df_last_week = df[(df['날짜'] >= last_week_start) & (df['날짜'] <= last_week_end) & (df['부서'] == unit)]
-    count_this = int(df_this_week['건수'].sum())
-    count_last = int(df_last_week['건수'].sum())
-    amt_this = int(df_this_week[value_col].sum())
-    amt_last = int(df_last_week[value_col].sum())
+    count_this = ctx.total('건수', week_start, base_date)
+    count_last = ctx.total('건수', last_week_start, last_week_end)
+    amt_this = ctx.total(value_col, week_start, base_date)
+    amt_last = ctx.total(value_col, last_week_start, last_week_end)
 
     bar_data = {
         '구분': ['지난 주', '이번 주'],
@@ -157,16 +131,10 @@ def period_summary_row(df, hparams):
     this_month = today.replace(day=1)
     last_month_last = this_month - pd.Timedelta(days=1)
     last_month = last_month_last.replace(day=1)
-    if unit == '전체':
-        df_this_month = df[(df['날짜'] >= this_month) & (df['날짜'] <= today)]
-        df_last_month = df[(df['날짜'] >= last_month) & (df['날짜'] <= last_month_last)]
-    else:
-        df_this_month = df[(df['날짜'] >= this_month) & (df['날짜'] <= today) & (df['부서'] == unit)]
-        df_last_month = df[(df['날짜'] >= last_month) & (df['날짜'] <= last_month_last) & (df['부서'] == unit)]
-    count_this_month = int(df_this_month['건수'].sum())
-    count_last_month = int(df_last_month['건수'].sum())
-    amt_this_month = int(df_this_month[value_col].sum())
-    amt_last_month = int(df_last_month[value_col].sum())
+    count_this_month = ctx.total('건수', this_month, today)
+    count_last_month = ctx.total('건수', last_month, last_month_last)
+    amt_this_month = ctx.total(value_col, this_month, today)
+    amt_last_month = ctx.total(value_col, last_month, last_month_last)
 
     bar_data_month = {
         '구분': ['지난 달', '이번 달'],
@@ -23,7 +23,8 @@ TITLE_STYLE = {
     "color": "#454a4f",
 }
 
-def cnt_row(df, hparams):
+def cnt_row(ctx):
+    hparams = ctx.hparams
     # ----- 좌측: 건수 -----
     start_str = pd.to_datetime(hparams.get('start_date')).strftime('%y.%m.%d')
     end_str = pd.to_datetime(hparams.get('end_date')).strftime('%y.%m.%d')
@@ -2,6 +2,8 @@ import pandas as pd
 from dash import html, dcc
 import plotly.graph_objects as go
 
+from components.figure_encoding import encode_figure, line_trace
+
 CARD_STYLE = {
     "background": "#fff",
     "borderRadius": "7px",
@@ -23,39 +25,27 @@ TITLE_STYLE = {
     "color": "#454a4f",
 }
 
-def amt_row(df, hparams):
-    start_date = pd.to_datetime(hparams['start_date'])
-    end_date = pd.to_datetime(hparams['end_date'])
-    value_col = hparams['value_type']
+def amt_row(ctx):
+    hparams = ctx.hparams
+    start_date = ctx.start_date
+    end_date = ctx.end_date
+    value_col = ctx.value_col
 
     # ===== col6. 누적 건수 Line Chart =====
     # (value_col은 '건수'로 고정)
     value_col_cnt = '건수'
-    if hparams['unit'] == '전체':
-        df_this_cnt = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-        df_prev_cnt = df[(df['날짜'] < start_date) & (df['날짜'] >= (start_date - (end_date - start_date + pd.Timedelta(days=1))))].copy()
-    else:
-        df_this_cnt = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == hparams['unit'])].copy()
-        df_prev_cnt = df[(df['날짜'] < start_date) & (df['날짜'] >= (start_date - (end_date - start_date + pd.Timedelta(days=1)))) & (df['부서'] == hparams['unit'])].copy()
-
     x_dates = pd.date_range(start_date, end_date, freq='D')
     n_days = len(x_dates)
 
-    this_daily_cnt = df_this_cnt.groupby('날짜')[value_col_cnt].sum().reindex(x_dates, fill_value=0)
-    this_cum_cnt = this_daily_cnt.cumsum().values
+    this_cum_cnt = ctx.cumulative(value_col_cnt)
 
-    # 직전 기간 계산 (기존 방식과 일치)
-    period_length = (end_date - start_date).days + 1
-    prev_end = start_date - pd.Timedelta(days=1)
-    prev_start = prev_end - pd.Timedelta(days=period_length-1)
-    prev_dates = pd.date_range(prev_start, prev_end, freq='D')
-    prev_daily_cnt = df_prev_cnt.groupby('날짜')[value_col_cnt].sum().reindex(prev_dates, fill_value=0)
-    prev_cum_cnt = prev_daily_cnt.cumsum().values
+    # 직전 기간 (설정 기간과 같은 길이, 바로 앞)
+    prev_cum_cnt = ctx.prev_cumulative(value_col_cnt)
     prev_cum_cnt_aligned = [prev_cum_cnt[i] if i < len(prev_cum_cnt) else None for i in range(n_days)]
 
     fig_col6 = go.Figure()
     # 1. 설정 기간 누적 (라인+면적)
-    fig_col6.add_trace(go.Scatter(
+    fig_col6.add_trace(line_trace(
         x=x_dates, y=this_cum_cnt,
         mode='lines+markers',
         name='설정 기간 누적',
@@ -66,7 +56,7 @@ def amt_row(df, hparams):
         marker=dict(size=5)
     ))
     # 2. 직전 기간 누적 (라인+면적)
-    fig_col6.add_trace(go.Scatter(
+    fig_col6.add_trace(line_trace(
         x=x_dates, y=prev_cum_cnt_aligned,
         mode='lines+markers',
         name='직전 기간 누적',
@@ -86,23 +76,13 @@ def amt_row(df, hparams):
     )
 
     # ===== col7. 누적 환산실적(보험료) Line Chart =====
-    if hparams['unit'] == '전체':
-        df_this = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-        df_prev = df[(df['날짜'] >= prev_start) & (df['날짜'] <= prev_end)].copy()
-    else:
-        df_this = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == hparams['unit'])].copy()
-        df_prev = df[(df['날짜'] >= prev_start) & (df['날짜'] <= prev_end) & (df['부서'] == hparams['unit'])].copy()
-
-    this_daily_amt = df_this.groupby('날짜')[value_col].sum().reindex(x_dates, fill_value=0)
-    this_cum_amt = this_daily_amt.cumsum().values
-
-    prev_daily_amt = df_prev.groupby('날짜')[value_col].sum().reindex(prev_dates, fill_value=0)
-    prev_cum_amt = prev_daily_amt.cumsum().values
+    this_cum_amt = ctx.cumulative(value_col)
+    prev_cum_amt = ctx.prev_cumulative(value_col)
     prev_cum_amt_aligned = [prev_cum_amt[i] if i < len(prev_cum_amt) else None for i in range(n_days)]
 
     fig_col7 = go.Figure()
     # 1. 설정 기간 누적 (라인+면적)
-    fig_col7.add_trace(go.Scatter(
+    fig_col7.add_trace(line_trace(
         x=x_dates, y=this_cum_amt,
         mode='lines+markers',
         name='설정 기간 누적',
@@ -113,7 +93,7 @@ def amt_row(df, hparams):
         marker=dict(size=5)
     ))
     # 2. 직전 기간 누적 (라인+면적)
-    fig_col7.add_trace(go.Scatter(
+    fig_col7.add_trace(line_trace(
         x=x_dates, y=prev_cum_amt_aligned,
         mode='lines+markers',
         name='직전 기간 누적',
@@ -144,10 +124,10 @@ def amt_row(df, hparams):
     return html.Div([
         html.Div([
             html.Div(left_title, style=TITLE_STYLE),
-            dcc.Graph(figure=fig_col6, config={"displayModeBar": False}, style={"height": "320px"}),
+            dcc.Graph(figure=encode_figure(fig_col6), config={"displayModeBar": False}, style={"height": "320px"}),
         ], style={**CARD_STYLE, "width": "49%"}),
         html.Div([
             html.Div(right_title, style=TITLE_STYLE),
-            dcc.Graph(figure=fig_col7, config={"displayModeBar": False}, style={"height": "320px"}),
+            dcc.Graph(figure=encode_figure(fig_col7), config={"displayModeBar": False}, style={"height": "320px"}),
         ], style={**CARD_STYLE, "width": "49%"}),
     ], style={"width": "100%", "display": "flex", "justifyContent": "space-between", "gap": "2%", "marginBottom": "16px"})
@@ -2,6 +2,8 @@ import pandas as pd
 from dash import html, dcc
 import plotly.graph_objects as go
 
+from dataset.cube import safe_ratio
+
 CARD_STYLE = {
     "background": "#fff",
     "borderRadius": "7px",
@@ -23,18 +25,22 @@ TITLE_STYLE = {
     "color": "#454a4f",
 }
 
-def personal_row(df, hparams):
-    start_date = pd.to_datetime(hparams['start_date'])
-    end_date = pd.to_datetime(hparams['end_date'])
-    value_col = hparams['value_type']  # '환산' 또는 '보험료'
+def dept_ratios(ctx, value_col):
+    """부서별 1인당 건수 / 건당 금액 / 1인당 금액을 한 번에 계산 (기간 내 행이 있는 부서, 이름순)"""
+    totals = ctx.dept_totals(['건수', '가동인원', value_col])
+    return pd.DataFrame({
+        '1인당건수': safe_ratio(totals['건수'], totals['가동인원'], 2),
+        '건당금액': safe_ratio(totals[value_col], totals['건수'], 0),
+        '1인당금액': safe_ratio(totals[value_col], totals['가동인원'], 0),
+    }, index=totals.index)
+
+def personal_row(ctx):
+    hparams = ctx.hparams
+    value_col = ctx.value_col  # '환산' 또는 '보험료'
 
     # ========== [카드1] 1인당 일평균 계약건수 ==========
-    if hparams['unit'] == '전체':
-        df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    else:
-        df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == hparams['unit'])].copy()
-    total_person = df_period['가동인원'].sum()
-    total_contract = df_period['건수'].sum()
+    total_person = ctx.total('가동인원')
+    total_contract = ctx.total('건수')
     avg_contract_per_person = round(total_contract / total_person, 2) if total_person else 0
 
     fig_gauge_contract = go.Figure(go.Indicator(
@@ -53,15 +59,10 @@ def personal_row(df, hparams):
     ))
     fig_gauge_contract.update_layout(height=250, margin=dict(t=30, b=30, l=20, r=20), paper_bgcolor="#fff")
 
-    # 부서별 집계 및 막대
-    df_period_all = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    departments = sorted(df_period_all['부서'].unique())
-    avg_contract_per_person_list = []
-    for dept in departments:
-        d = df_period_all[df_period_all['부서'] == dept]
-        total_person = d['가동인원'].sum()
-        total_contract = d['건수'].sum()
-        avg_contract_per_person_list.append(round(total_contract / total_person, 2) if total_person else 0)
+    # 부서별 집계 및 막대 (세 카드의 부서별 비율을 한 번에)
+    ratios = dept_ratios(ctx, value_col)
+    departments = ratios.index.tolist()
+    avg_contract_per_person_list = ratios['1인당건수'].tolist()
     #overall_avg = round(sum(avg_contract_per_person_list) / len(avg_contract_per_person_list), 2) if avg_contract_per_person_list else 0
 
     selected_unit = hparams['unit']
@@ -88,12 +89,8 @@ def personal_row(df, hparams):
     )
 
     # ========== [카드2] 1건당 일평균 환산(보험료) ==========
-    if hparams['unit'] == '전체':
-        df_period_amt = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    else:
-        df_period_amt = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == hparams['unit'])].copy()
-    total_contract = df_period_amt['건수'].sum()
-    total_amt = df_period_amt[value_col].sum()
+    total_contract = ctx.total('건수')
+    total_amt = ctx.total(value_col)
     avg_amt_per_contract = round(total_amt / total_contract, 0) if total_contract else 0
 
     fig_gauge_amt = go.Figure(go.Indicator(
@@ -112,14 +109,7 @@ def personal_row(df, hparams):
     ))
     fig_gauge_amt.update_layout(height=250, margin=dict(t=30, b=30, l=20, r=20), paper_bgcolor="#fff")
 
-    df_period_bar = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    departments = sorted(df_period_bar['부서'].unique())
-    avg_amt_per_contract_list = []
-    for dept in departments:
-        d = df_period_bar[df_period_bar['부서'] == dept]
-        total_contract = d['건수'].sum()
-        total_amt = d[value_col].sum()
-        avg_amt_per_contract_list.append(round(total_amt / total_contract, 0) if total_contract else 0)
+    avg_amt_per_contract_list = ratios['건당금액'].tolist()
     #overall_avg_amt = round(sum(avg_amt_per_contract_list) / len(avg_amt_per_contract_list), 0) if avg_amt_per_contract_list else 0
     if selected_unit == "전체":
         colors_amt = ['#f5bab5'] * len(departments)
@@ -143,12 +133,8 @@ def personal_row(df, hparams):
     )
 
     # ========== [카드3] 1인당 일평균 환산(보험료) ==========
-    if hparams['unit'] == '전체':
-        df_period_gauge = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    else:
-        df_period_gauge = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date) & (df['부서'] == hparams['unit'])].copy()
-    total_person = df_period_gauge['가동인원'].sum()
-    total_amt = df_period_gauge[value_col].sum()
+    total_person = ctx.total('가동인원')
+    total_amt = ctx.total(value_col)
     avg_amt_per_person_per_day = round(total_amt / total_person, 0) if total_person else 0
 
     fig_gauge_amt_person = go.Figure(go.Indicator(
@@ -167,12 +153,7 @@ def personal_row(df, hparams):
     ))
     fig_gauge_amt_person.update_layout(height=250, margin=dict(t=30, b=30, l=20, r=20), paper_bgcolor="#fff")
 
-    avg_amt_per_person_per_day_list = []
-    for dept in departments:
-        d = df_period_bar[df_period_bar['부서'] == dept]
-        total_person = d['가동인원'].sum()
-        total_amt = d[value_col].sum()
-        avg_amt_per_person_per_day_list.append(round(total_amt / total_person, 0) if total_person else 0)
+    avg_amt_per_person_per_day_list = ratios['1인당금액'].tolist()
     #overall_avg_amt_person = round(sum(avg_amt_per_person_per_day_list) / len(avg_amt_per_person_per_day_list), 0) if avg_amt_per_person_per_day_list else 0
     if selected_unit == "전체":
         colors_person = ['#9cd7bf'] * len(departments)
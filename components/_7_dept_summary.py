@@ -24,18 +24,17 @@ TITLE_STYLE = {
     "color": "#454a4f",
 }
 
-def dept_amt_row(df, hparams):
-    start_date = pd.to_datetime(hparams['start_date'])
-    end_date = pd.to_datetime(hparams['end_date'])
-    value_col = hparams['value_type']
-    selected_unit = hparams['unit']
+def dept_amt_row(ctx):
+    hparams = ctx.hparams
+    value_col = ctx.value_col
+    selected_unit = ctx.unit
 
-    # 기간 필터링
-    df_period = df[(df['날짜'] >= start_date) & (df['날짜'] <= end_date)].copy()
-    departments = sorted(df_period['부서'].unique())
+    # 기간 내 행이 있는 부서(이름순)별 합계 (건수·금액 한 번에)
+    totals = ctx.dept_totals(['건수', value_col])
+    departments = totals.index.tolist()
 
     # --- 11. 부서별 계약 건수 Bar ---
-    counts = [df_period[df_period['부서'] == dept]['건수'].sum() for dept in departments]
+    counts = totals['건수'].tolist()
     highlight_color = "#9baaff"
     pale_color = '#d6d9e5'
     
@@ -90,7 +89,7 @@ def dept_amt_row(df, hparams):
     )
 
     # --- 13. 부서별 환산/보험료 Bar ---
-    amts = [df_period[df_period['부서'] == dept][value_col].sum() for dept in departments]
+    amts = totals[value_col].tolist()
     highlight_color = "#9cd7bf"
     if selected_unit == "전체":
         bar_colors = [highlight_color] * len(departments)
@@ -23,7 +23,8 @@ TITLE_STYLE = {
     "color": "#454a4f",
 }
 
-def dept_compare_row(df, hparams):
+def dept_compare_row(ctx):
+    hparams = ctx.hparams
     # 공통 파라미터
     start_str = pd.to_datetime(hparams.get('start_date')).strftime('%y.%m.%d')
     end_str = pd.to_datetime(hparams.get('end_date')).strftime('%y.%m.%d')
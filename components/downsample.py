@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+
+from components import figure_encoding
+
+# ---- 긴 일별 시계열 점 줄이기 (환경변수로 조정) ----
+# - 트레이스당 점 수를 그래프 너비(px) × FIGURE_POINTS_PER_PX로 제한
+# - 선: LTTB(Largest-Triangle-Three-Buckets) / 막대: 구간별 최대 또는 합계
+#   (LTTB는 x 간격이 불규칙해져 x0/dx 대신 epoch ms 배열이 붙으므로, 그래도 더 작아질 때만 줄임)
+# - FIGURE_DOWNSAMPLE=0이거나 화면의 '모든 점 표시'를 켜면 줄이지 않음
+FIGURE_DOWNSAMPLE = os.environ.get('FIGURE_DOWNSAMPLE', '1') == '1'
+FIGURE_POINTS_PER_PX = float(os.environ.get('FIGURE_POINTS_PER_PX', '0.5'))
+FIGURE_DEFAULT_WIDTH = int(os.environ.get('FIGURE_DEFAULT_WIDTH', '600'))    # 브라우저 너비를 모를 때 그래프 너비(px)
+FIGURE_MIN_POINTS = int(os.environ.get('FIGURE_MIN_POINTS', '100'))          # 좁은 화면에서도 이만큼은 남김
+FIGURE_BAR_BUCKET = os.environ.get('FIGURE_BAR_BUCKET', 'max')               # 막대 구간 값: max(하루 최대) / sum(구간 합계)
+
+
+def point_budget(view):
+    """chart-view 스토어 값({'width', 'exact'}) → 트레이스당 최대 점 수 (None이면 줄이지 않음)"""
+    view = view or {}
+    if not FIGURE_DOWNSAMPLE or view.get('exact'):
+        return None
+    width = view.get('width') or FIGURE_DEFAULT_WIDTH
+    return max(FIGURE_MIN_POINTS, int(width * FIGURE_POINTS_PER_PX))
+
+
+def lttb(x, y, budget):
+    """
+    선 트레이스 (x, y) → 모양을 유지하는 budget개 이하의 점 (첫 점·마지막 점은 항상 포함)
+    - 점이 budget 이하이거나 줄여도 전송 크기가 줄지 않으면(lttb_pays_off) 그대로
+    - x는 같은 간격(일·주)이라고 보고 위치로 계산, 빈 값(None/NaN)은 0으로 보고 고르되 값은 그대로 둠
+    """
+    y = np.asarray(y)
+    if budget is None or len(y) <= budget or not lttb_pays_off(y, budget):
+        return x, y
+    index = lttb_indices(y, budget)
+    return x[index], y[index]
+
+
+def lttb_pays_off(y, budget):
+    """
+    LTTB 결과가 모든 점보다 작게 전송되는지 (타입 배열 기준, JSON 목록이면 항상 True)
+    - 모든 점: 같은 간격 x는 x0/dx, y만 n개 / LTTB: x(epoch ms, 8바이트)와 y가 budget개씩
+    - y가 f8이면 budget의 2배, i4면 3배보다 점이 많아야 줄이는 의미가 있음
+    """
+    if not figure_encoding.FIGURE_TYPED_ARRAYS:
+        return True
+    size = 4 if figure_encoding.typed_dtype(y) == 'i4' else 8
+    return budget * (8 + size) < len(y) * size
+
+
+def lttb_indices(y, budget):
+    values = np.nan_to_num(np.asarray(y, dtype='float64'))
+    n = len(values)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    every = (n - 2) / (budget - 2)
+    picked = np.empty(budget, dtype='int64')
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        next_lo, next_hi = hi, min(int((i + 2) * every) + 1, n)
+        avg_x = (next_lo + next_hi - 1) / 2
+        avg_y = values[next_lo:next_hi].mean()
+        # a, 다음 구간 평균과 이루는 삼각형 넓이가 가장 큰 점
+        area = np.abs((a - avg_x) * (values[lo:hi] - values[a]) - (a - np.arange(lo, hi)) * (avg_y - values[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def bucket_bars(x, y, budget, how=FIGURE_BAR_BUCKET):
+    """
+    막대 트레이스 (x, y) → budget개 이하 구간 (x는 구간 첫 값, y는 구간 최대 또는 합계)
+    → (x, y, 구간 길이) / 줄이지 않으면 구간 길이 1
+    """
+    y = np.asarray(y)
+    if budget is None or len(y) <= budget:
+        return x, y, 1
+    size = -(-len(y) // budget)
+    starts = np.arange(0, len(y), size)
+    reduce = np.add if how == 'sum' else np.maximum
+    return x[starts], reduce.reduceat(y, starts), size
+
+
+def bucket_name(name, size, how=FIGURE_BAR_BUCKET):
+    """구간으로 묶은 막대의 범례·호버 이름 (예: '일별 (7일 최대)')"""
+    if size == 1:
+        return name
+    return f"{name} ({size}일 {'합계' if how == 'sum' else '최대'})"
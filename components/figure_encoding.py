@@ -0,0 +1,90 @@
+import base64
+import datetime
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+
+# ---- 그림 데이터 경량화 (환경변수로 조정) ----
+# - 숫자 배열은 JSON 숫자 목록 대신 base64 타입 배열({dtype, bdata}, plotly.js 2.28+)
+# - 간격이 일정한 날짜 축은 x 배열 없이 x0/dx, 간격이 불규칙하면 epoch ms 타입 배열
+FIGURE_TYPED_ARRAYS = os.environ.get('FIGURE_TYPED_ARRAYS', '1') == '1'
+FIGURE_MARKER_MAX_POINTS = int(os.environ.get('FIGURE_MARKER_MAX_POINTS', '62'))    # 트레이스 점이 이보다 많으면 마커 생략
+FIGURE_WEBGL_MIN_POINTS = int(os.environ.get('FIGURE_WEBGL_MIN_POINTS', '1000'))    # 트레이스 점이 이 이상이면 Scattergl
+
+
+def line_trace(x, y, **kwargs):
+    """
+    시간 축 선 트레이스 (go.Scatter와 같은 인자)
+    - 점이 FIGURE_MARKER_MAX_POINTS보다 많으면 'lines+markers' → 'lines'
+    - FIGURE_WEBGL_MIN_POINTS 이상이면 Scattergl (WebGL은 spline을 지원하지 않아 직선)
+    """
+    n = len(y)
+    if n > FIGURE_MARKER_MAX_POINTS and kwargs.get('mode') == 'lines+markers':
+        kwargs['mode'] = 'lines'
+    if n >= FIGURE_WEBGL_MIN_POINTS:
+        kwargs.pop('line_shape', None)
+        return go.Scattergl(x=x, y=y, **kwargs)
+    return go.Scatter(x=x, y=y, **kwargs)
+
+
+def encode_figure(fig):
+    """go.Figure → 브라우저로 보낼 그림 dict (FIGURE_TYPED_ARRAYS=0이면 그대로)"""
+    if not FIGURE_TYPED_ARRAYS:
+        return fig
+    figure = fig.to_plotly_json()
+    dates = False
+    for trace in figure['data']:
+        for key in ('x', 'y'):
+            if key not in trace:
+                continue
+            values = np.asarray(trace[key])
+            if _is_dates(values):
+                dates = True
+                del trace[key]
+                trace.update(_encode_dates(key, values))
+            elif values.dtype.kind in 'iuf' or values.dtype == object and _is_numbers(values):
+                trace[key] = _typed_array(values)
+    if dates:
+        # x0/dx나 epoch ms만으로는 축 종류를 추론하지 못하므로 날짜 축으로 고정
+        figure['layout'].setdefault('xaxis', {}).setdefault('type', 'date')
+    return figure
+
+
+def _is_dates(values):
+    if values.dtype.kind == 'M':
+        return True
+    return values.dtype == object and len(values) > 0 and all(isinstance(v, datetime.datetime) for v in values)
+
+
+def _is_numbers(values):
+    return len(values) > 0 and all(v is None or isinstance(v, (int, float, np.number)) for v in values)
+
+
+def _encode_dates(key, values):
+    """날짜 배열 → 간격이 일정하면(일·주) {x0, dx}, 아니면(월) {x: epoch ms 타입 배열}"""
+    ms = values.astype('datetime64[ms]').astype('int64')
+    steps = np.diff(ms)
+    if len(ms) > 1 and steps[0] > 0 and (steps == steps[0]).all():
+        start = str(values.astype('datetime64[ms]')[0]).replace('T', ' ')
+        return {f'{key}0': start, f'd{key}': int(steps[0])}
+    return {key: _typed_array(ms)}
+
+
+def typed_dtype(values):
+    """숫자 배열을 타입 배열로 보낼 때의 dtype (정수는 int32 범위면 'i4', 나머지는 'f8')"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu' and (len(values) == 0 or
+                                      (values.min() >= np.iinfo('int32').min and values.max() <= np.iinfo('int32').max)):
+        return 'i4'
+    return 'f8'
+
+
+def _typed_array(values):
+    """숫자 배열 → {'dtype', 'bdata'} (None·NaN은 빈 값)"""
+    values = np.asarray(values)
+    if values.dtype == object:
+        values = np.array([np.nan if v is None else v for v in values], dtype='float64')
+    dtype = typed_dtype(values)
+    values = values.astype('<' + dtype)
+    return {'dtype': dtype, 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
@@ -0,0 +1,74 @@
+import pandas as pd
+
+
+class QueryContext:
+    """
+    update_dashboard 1번 호출 동안 모든 행(row) 빌더가 같이 쓰는 조회 상태
+    - 기간·부서·측정값 파라미터는 여기서 한 번만 정리
+    - 기간 합계, 누적, 직전 기간, 부서별 합계, 요일 표는 처음 필요할 때 계산하고 같은 요청 안에서 재사용
+    - 돌려주는 배열/프레임은 빌더끼리 공유되므로 수정하지 말 것
+    """
+
+    def __init__(self, cube, hparams, max_points=None):
+        self.cube = cube
+        self.hparams = hparams
+        self.max_points = max_points    # 긴 시계열 그래프의 트레이스당 최대 점 수 (None이면 모든 점)
+        self.start_date = pd.to_datetime(hparams['start_date'])
+        self.end_date = pd.to_datetime(hparams['end_date'])
+        self.unit = hparams['unit']
+        self.value_col = hparams['value_type']
+        self._memo = {}
+
+    def _cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    # ---- 직전 기간 (설정 기간과 같은 길이, 바로 앞) ----
+    @property
+    def prev_end(self):
+        return self.start_date - pd.Timedelta(days=1)
+
+    @property
+    def prev_start(self):
+        return self.prev_end - pd.Timedelta(days=(self.end_date - self.start_date).days)
+
+    # ---- 조회 (기간·부서를 생략하면 설정 기간·선택 부서) ----
+    def total(self, measure, start=None, end=None, unit=None):
+        start, end, unit = self._resolve(start, end, unit)
+        return self._cached(('total', measure, start, end, unit),
+                            lambda: self.cube.total(measure, start, end, unit))
+
+    def cumulative(self, measure, start=None, end=None, unit=None):
+        start, end, unit = self._resolve(start, end, unit)
+        return self._cached(('cumulative', measure, start, end, unit),
+                            lambda: self.cube.cumulative(measure, start, end, unit))
+
+    def prev_cumulative(self, measure):
+        return self.cumulative(measure, self.prev_start, self.prev_end)
+
+    def last_date_before(self, date, unit=None):
+        unit = self.unit if unit is None else unit
+        return self._cached(('last_date_before', date, unit),
+                            lambda: self.cube.last_date_before(date, unit))
+
+    def dept_totals(self, measures):
+        """설정 기간의 부서별 합계 (측정값마다 1번만 계산, 요청한 열 순서로)"""
+        columns = {
+            measure: self._cached(('dept_totals', measure),
+                                  lambda: self.cube.by_dept(measure, self.start_date, self.end_date))
+            for measure in measures
+        }
+        return pd.DataFrame(columns)
+
+    def by_weekday(self, measure):
+        """설정 기간의 부서 × 요일 합계"""
+        return self._cached(('by_weekday', measure),
+                            lambda: self.cube.by_weekday(measure, self.start_date, self.end_date))
+
+    def _resolve(self, start, end, unit):
+        return (
+            self.start_date if start is None else pd.Timestamp(start),
+            self.end_date if end is None else pd.Timestamp(end),
+            self.unit if unit is None else unit,
+        )
@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+
+# ---- 큐브에 쌓는 측정값 ----
+MEASURES = ['건수', '환산', '보험료', '가동인원', '목표환산']
+ROWS = '행수'                                  # 날짜 × 부서별 원본 행 수
+DAYS = '실적일'                                 # 행이 있는 날 1 (전체 열은 어느 부서든 행이 있는 날)
+NONZERO_MEASURES = ['건수', '환산', '보험료']    # 0이 아닌 행 수도 같이 쌓는 측정값 (요일 평균용)
+WEEKDAYS = 5                                    # 요일 표는 평일(0=월 ~ 4=금)만
+
+
+def nonzero(measure):
+    """0이 아닌 행 수를 담은 큐브 키 (예: '건수>0')"""
+    return f"{measure}>0"
+
+
+class Cube:
+    """
+    날짜(달력 전체, 빈 날은 0) × 부서(이름순) × 측정값 집계 (스냅샷 버전당 1번 생성)
+    - 목표환산은 부서·월마다 같은 값이 반복되므로 합계 대신 날짜별 최댓값
+    - 조회: query(측정값, 시작, 끝, unit, bucket='D'|'W'|'M'), total, by_dept
+    - 누적합(부서별 + 전체 열)을 미리 만들어 기간 합계는 뺄셈 1번, 누적 그래프는 슬라이스로 계산
+    """
+
+    def __init__(self, df):
+        dates = df['날짜'].dt.normalize()
+        if len(df):
+            self.dates = pd.date_range(dates.min(), dates.max(), freq='D')
+        else:
+            self.dates = pd.DatetimeIndex([], dtype='datetime64[ns]')
+        codes, uniques = pd.factorize(df['부서'], sort=True)
+        self.depts = [str(d) for d in uniques]
+
+        shape = (len(self.dates), len(self.depts))
+        day = ((dates - self.dates[0]).dt.days.to_numpy() if len(df) else np.zeros(0, dtype='int64'))
+        flat = day * len(self.depts) + codes
+        size = shape[0] * shape[1]
+
+        self._arrays = {}
+        for measure in MEASURES:
+            values = df[measure].to_numpy(dtype='int64')
+            if measure == '목표환산':
+                agg = np.zeros(size, dtype='int64')
+                np.maximum.at(agg, flat, values)
+            else:
+                agg = np.bincount(flat, weights=values, minlength=size).round().astype('int64')
+            self._arrays[measure] = agg.reshape(shape)
+        self._arrays[ROWS] = np.bincount(flat, minlength=size).astype('int64').reshape(shape)
+        for measure in NONZERO_MEASURES:
+            hits = df[measure].to_numpy() != 0
+            self._arrays[nonzero(measure)] = np.bincount(flat[hits], minlength=size).astype('int64').reshape(shape)
+
+        # 누적합: prefix[k][i, j] = 첫날부터 i일 전까지 j열 합계 (마지막 열 = 전체)
+        self._prefix = {}
+        for key, values in self._arrays.items():
+            self._prefix[key] = _prefix(np.column_stack([values, values.sum(axis=1)]))
+        rows = self._arrays[ROWS] > 0
+        self._prefix[DAYS] = _prefix(np.column_stack([rows, rows.any(axis=1)]).astype('int64'))
+
+        # 요일별 누적합 (정수 요일): weekday_prefix[k][i, w, j] = 첫날부터 i일 전까지 평일 w의 j부서 합계
+        # → 기간 × 부서 × 요일 표는 뺄셈 1번 (요일 평균 히트맵용 키만)
+        onehot = (self.dates.weekday.to_numpy()[:, None] == np.arange(WEEKDAYS)).astype('int64')
+        self._weekday_prefix = {}
+        for key in [ROWS] + NONZERO_MEASURES + [nonzero(m) for m in NONZERO_MEASURES]:
+            tensor = onehot[:, :, None] * self._arrays[key][:, None, :]
+            prefix = np.zeros((tensor.shape[0] + 1,) + tensor.shape[1:], dtype='int64')
+            np.cumsum(tensor, axis=0, out=prefix[1:])
+            self._weekday_prefix[key] = prefix
+
+    # ---- 기본 조회 ----
+    def days(self, start, end):
+        return pd.date_range(start, end, freq='D')
+
+    def matrix(self, measure, start, end):
+        """[start, end] 날짜 × 부서 배열 (큐브 범위 밖의 날짜는 0)"""
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        n = max((end - start).days + 1, 0)
+        out = np.zeros((n, len(self.depts)), dtype='int64')
+        if n == 0 or len(self.dates) == 0:
+            return out
+        lo = max((start - self.dates[0]).days, 0)
+        hi = min((end - self.dates[0]).days, len(self.dates) - 1)
+        if lo <= hi:
+            offset = (self.dates[0] - start).days + lo
+            out[offset:offset + hi - lo + 1] = self._arrays[measure][lo:hi + 1]
+        return out
+
+    def column(self, unit):
+        """unit → 부서 열 인덱스 ('전체'면 None, 없는 부서면 -1)"""
+        if unit == '전체':
+            return None
+        return self.depts.index(unit) if unit in self.depts else -1
+
+    def _position(self, date):
+        """date 전날까지의 누적합 위치 (0 ~ 날짜 수로 자름)"""
+        if len(self.dates) == 0:
+            return 0
+        return min(max((pd.Timestamp(date).normalize() - self.dates[0]).days, 0), len(self.dates))
+
+    def _prefix_column(self, key, unit):
+        col = self.column(unit)
+        if col is not None and col < 0:
+            return None
+        return self._prefix[key][:, len(self.depts) if col is None else col]
+
+    def daily(self, measure, start, end, unit='전체'):
+        """[start, end] 날짜별 값 (unit 기준 합계)"""
+        values = self.matrix(measure, start, end)
+        col = self.column(unit)
+        if col is None:
+            return values.sum(axis=1)
+        if col < 0:
+            return np.zeros(len(values), dtype='int64')
+        return values[:, col]
+
+    def query(self, measure, start, end, unit='전체', bucket='D'):
+        """
+        기간·부서·측정값·단위별 합계 Series (빈 구간은 0, end < start면 빈 Series)
+        - D: 날짜별 / W: 주(월요일 기준, 평일만) / M: 월(1일 기준)
+        """
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        days = self.days(start, end)
+        values = self.daily(measure, start, end, unit)
+        if bucket == 'D':
+            return pd.Series(values, index=days)
+        if bucket == 'W':
+            weekday = days.weekday.to_numpy()
+            first_monday = start - pd.Timedelta(days=start.weekday())
+            index = pd.date_range(first_monday, end, freq='W-MON') if len(days) else days
+            week = (days - first_monday).days.to_numpy() // 7
+            keep = weekday < 5
+            sums = np.bincount(week[keep], weights=values[keep], minlength=len(index))
+            return pd.Series(sums.round().astype('int64'), index=index)
+        if bucket == 'M':
+            index = pd.date_range(start.replace(day=1), end, freq='MS') if len(days) else days
+            month = (days.year - start.year) * 12 + (days.month - start.month)
+            sums = np.bincount(month.to_numpy(), weights=values, minlength=len(index))
+            return pd.Series(sums.round().astype('int64'), index=index)
+        raise ValueError(f"알 수 없는 bucket: {bucket}")
+
+    def total(self, measure, start, end, unit='전체'):
+        """[start, end] 합계 (누적합 뺄셈, DAYS면 행이 있는 날 수)"""
+        prefix = self._prefix_column(measure, unit)
+        if prefix is None:
+            return 0
+        lo = self._position(start)
+        hi = self._position(pd.Timestamp(end) + pd.Timedelta(days=1))
+        return int(prefix[hi] - prefix[lo]) if hi > lo else 0
+
+    def cumulative(self, measure, start, end, unit='전체'):
+        """[start, end] 날짜별 누적 합계 (start부터, 큐브 범위 밖 날짜는 0 또는 마지막 값 유지)"""
+        days = self.days(start, end)
+        prefix = self._prefix_column(measure, unit)
+        if prefix is None or len(self.dates) == 0:
+            return np.zeros(len(days), dtype='int64')
+        ends = np.clip((days - self.dates[0]).days.to_numpy() + 1, 0, len(self.dates))
+        return prefix[ends] - prefix[self._position(start)]
+
+    def by_dept(self, measure, start, end):
+        """기간 내 행이 있는 부서(이름순)별 합계"""
+        return self.dept_totals([measure], start, end)[measure]
+
+    def dept_totals(self, measures, start, end):
+        """기간 내 행이 있는 부서(이름순) × 측정값 합계 DataFrame (측정값마다 누적합 뺄셈 1번)"""
+        lo = self._position(start)
+        hi = max(self._position(pd.Timestamp(end) + pd.Timedelta(days=1)), lo)
+        present = (self._prefix[ROWS][hi] - self._prefix[ROWS][lo])[:-1] > 0
+        index = pd.Index(np.array(self.depts, dtype=object)[present], name='부서')
+        return pd.DataFrame(
+            {m: (self._prefix[m][hi] - self._prefix[m][lo])[:-1][present] for m in measures},
+            index=index,
+        )
+
+    def by_weekday(self, measure, start, end):
+        """부서 × 평일(0=월 ~ 4=금) 합계 DataFrame (모든 부서, 요일별 누적합 뺄셈)"""
+        lo = self._position(start)
+        hi = max(self._position(pd.Timestamp(end) + pd.Timedelta(days=1)), lo)
+        table = self._weekday_prefix[measure][hi] - self._weekday_prefix[measure][lo]
+        return pd.DataFrame(table.T, index=pd.Index(self.depts, name='부서'), columns=range(WEEKDAYS))
+
+    def last_date_before(self, date, unit='전체'):
+        """date 이전에 행이 있는 마지막 날짜 (없으면 None, 누적합에서 이진 탐색)"""
+        prefix = self._prefix_column(DAYS, unit)
+        if prefix is None:
+            return None
+        count = prefix[self._position(date)]
+        if count == 0:
+            return None
+        return self.dates[int(np.searchsorted(prefix, count)) - 1]
+
+
+def safe_ratio(num, den, decimals=0):
+    """num / den 반올림 (분모가 0이면 0, 배열이면 원소별로 한 번에)"""
+    num = np.asarray(num, dtype='float64')
+    den = np.asarray(den, dtype='float64')
+    out = np.zeros(np.broadcast(num, den).shape)
+    np.divide(num, den, out=out, where=den != 0)
+    return out.round(decimals)
+
+
+def _prefix(values):
+    """앞에 0행을 붙인 누적합 (prefix[i] = values[:i] 합계)"""
+    out = np.zeros((values.shape[0] + 1, values.shape[1]), dtype='int64')
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
@@ -0,0 +1,124 @@
+import collections
+import io
+import os
+import threading
+
+import pandas as pd
+import xlsxwriter
+
+try:
+    import pyarrow  # noqa: F401  (to_parquet 엔진)
+except ImportError:     # pyarrow가 없으면 Parquet 내보내기는 목록에서 뺌
+    pyarrow = None
+
+# ---- 상세 테이블 내보내기 설정 (환경변수로 조정) ----
+EXPORT_CACHE_SIZE = int(os.environ.get('DATASET_EXPORT_CACHE_SIZE', '8'))     # 워커별로 보관할 내보낸 파일 수
+EXPORT_CHUNK_ROWS = int(os.environ.get('DATASET_EXPORT_CHUNK_ROWS', '5000'))  # 한 번에 프레임으로 만드는 행 수 (진행률 단위)
+EXPORT_FORMATS = {
+    'xlsx': '엑셀(.xlsx)',
+    'csv': 'CSV',
+    **({'parquet': 'Parquet'} if pyarrow is not None else {}),
+}
+
+
+class ExportCache:
+    """
+    (데이터셋 버전, 부서, 기간, 형식) → 내보낸 파일 바이트 LRU
+    - 같은 조건으로 다시 받으면 파일을 다시 만들지 않음 (버전이 바뀌면 키가 달라짐)
+    - disk: 백그라운드 작업(별도 프로세스)과 결과를 나눠 쓸 diskcache.Cache (없으면 메모리만)
+    """
+
+    def __init__(self, size=EXPORT_CACHE_SIZE, disk=None):
+        self.size = size
+        self.disk = disk
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """key의 파일 바이트 (없으면 build()로 만들어 보관)"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        data = self.disk.get(('export',) + key) if self.disk is not None else None
+        if data is None:
+            data = build()
+            if self.disk is not None:
+                self.disk.set(('export',) + key, data)
+        with self._lock:
+            self._items[key] = data
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return data
+
+
+def export_rows(df, positions, fmt, progress=None):
+    """
+    df의 positions 행 → fmt 형식 파일 바이트
+    - EXPORT_CHUNK_ROWS 행씩만 프레임으로 만들어 기록, 청크마다 progress(기록한 행, 전체 행)
+    """
+    writer = {'xlsx': _write_xlsx, 'csv': _write_csv, 'parquet': _write_parquet}.get(fmt)
+    if writer is None or fmt not in EXPORT_FORMATS:
+        raise ValueError(f"알 수 없는 내보내기 형식: {fmt}")
+    return writer(df, positions, progress or (lambda done, total: None))
+
+
+def _chunks(df, positions, progress):
+    total = len(positions)
+    for lo in range(0, total, EXPORT_CHUNK_ROWS):
+        yield df.take(positions[lo:lo + EXPORT_CHUNK_ROWS])
+        progress(min(lo + EXPORT_CHUNK_ROWS, total), total)
+
+
+def _write_xlsx(df, positions, progress):
+    """
+    xlsxwriter constant_memory 모드로 한 행씩 기록 (끝난 행은 바로 임시 파일로 내려감)
+    - 빈 값(None/NA/NaN/NaT)은 빈 칸으로 둠 (xlsxwriter는 NaN·NaT를 쓰지 못함)
+    - pandas to_excel은 열 단위로 쓰므로 constant_memory와 같이 쓸 수 없어 Workbook을 직접 사용
+    """
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    sheet = workbook.add_worksheet('실적')
+    header = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+    columns = list(df.columns)
+    dates = {i for i, c in enumerate(columns) if str(df[c].dtype).startswith('datetime64')}
+    sheet.write_row(0, 0, columns, header)
+    for i in dates:
+        sheet.set_column(i, i, 12)
+
+    row = 1
+    for chunk in _chunks(df, positions, progress):
+        values = [
+            chunk[c].to_numpy().astype('datetime64[us]').tolist() if i in dates else chunk[c].astype(object).tolist()
+            for i, c in enumerate(columns)
+        ]
+        for record in zip(*values):
+            for col, value in enumerate(record):
+                if value is None or value is pd.NA or value != value:
+                    continue        # 빈 값(None/NA/NaN/NaT)은 빈 칸
+                if col in dates:
+                    sheet.write_datetime(row, col, value, date_format)
+                else:
+                    sheet.write(row, col, str(value) if not isinstance(value, (int, float)) else value)
+            row += 1
+    workbook.close()
+    return output.getvalue()
+
+
+def _write_csv(df, positions, progress):
+    """엑셀에서 한글이 깨지지 않도록 BOM 붙인 UTF-8"""
+    output = io.StringIO()
+    for i, chunk in enumerate(_chunks(df, positions, progress)):
+        chunk.to_csv(output, index=False, header=i == 0, date_format='%Y-%m-%d')
+    if len(positions) == 0:
+        df.iloc[:0].to_csv(output, index=False)
+    return output.getvalue().encode('utf-8-sig')
+
+
+def _write_parquet(df, positions, progress):
+    """컬럼 단위 형식이라 청크로 나누지 않고 한 번에 기록"""
+    output = io.BytesIO()
+    df.take(positions).reset_index(drop=True).to_parquet(output, index=False)
+    progress(len(positions), len(positions))
+    return output.getvalue()
@@ -0,0 +1,47 @@
+import pandas as pd
+
+# ---- 목표를 같이 쓰는 부서 그룹 ----
+# 그룹 안 부서는 각자 목표환산 행을 갖지만 값은 공유 → 실적은 그룹 합계로 비교하고
+# 전체 목표에는 그룹의 첫 부서 목표만 더함
+GOAL_GROUPS = {'드림': ['드림1실', '드림2실']}
+DEPT_GROUP = {dept: group for group, depts in GOAL_GROUPS.items() for dept in depts}
+SHARED_GOAL_REPEATS = [dept for depts in GOAL_GROUPS.values() for dept in depts[1:]]
+
+
+class GoalTable:
+    """
+    (연월, 부서) → 목표환산 차원 표 (스냅샷 버전당 1번 생성)
+    - 목표환산은 일별 행마다 반복되므로 달·부서별 한 행의 값과 그 날짜만 남김
+    - 그 달 목표 = 그 달에서 날짜가 가장 이른 행의 값 (같은 날 행이 여러 개면 가장 큰 값)
+      → 행 순서(소스 순서, 스냅샷 정렬)와 관계없이 정해짐. 달 중간에 목표가 바뀌어도 월초 값을 씀
+    - 조회는 달 하나를 찾아 기간 안에 행이 있는 부서만 고르는 것 (부서 수만큼)
+    """
+
+    def __init__(self, df):
+        ordered = df.sort_values(['날짜', '목표환산'], ascending=[True, False], kind='stable')
+        first = ordered.assign(연월=ordered['날짜'].dt.to_period('M')).drop_duplicates(['연월', '부서'])
+        self._months = {
+            period: pd.DataFrame(
+                {'목표환산': frame['목표환산'].to_numpy(), '첫날짜': frame['날짜'].to_numpy()},
+                index=pd.Index(frame['부서'].astype(str).to_numpy(), name='부서'),
+            )
+            for period, frame in first.groupby('연월', sort=False)
+        }
+
+    def month(self, month_start, end):
+        """month_start가 속한 달의 부서별 목표 (달 1일 ~ end 안에 행이 있는 부서만)"""
+        frame = self._months.get(pd.Timestamp(month_start).to_period('M'))
+        if frame is None:
+            return pd.Series(dtype='int64', name='목표환산')
+        return frame.loc[frame['첫날짜'] <= pd.Timestamp(end), '목표환산']
+
+
+def group_totals(totals):
+    """부서별 실적 → 목표 그룹 합계로 바꾼 부서별 실적 (그룹이 없는 부서는 그대로)"""
+    groups = totals.index.map(lambda dept: DEPT_GROUP.get(dept, dept))
+    return totals.groupby(groups).transform('sum')
+
+
+def overall_goal(goals):
+    """전체 목표: 부서별 목표 합계 (그룹 목표는 한 번만)"""
+    return goals.sum() - goals.reindex(SHARED_GOAL_REPEATS, fill_value=0).sum()
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from dataset.schema import COLUMNS, concat_frames
+
+# ---- 히스토리 저장소 설정 (환경변수로 조정) ----
+HISTORY_DIR = os.environ.get('DATASET_HISTORY_DIR', '')                           # 비어 있으면 사용 안 함
+HISTORY_OPEN_MONTHS = int(os.environ.get('DATASET_HISTORY_OPEN_MONTHS', '2'))     # 원본에서 계속 다시 읽는 최근 개월 수(이번 달 포함)
+
+
+def window_start(today=None, open_months=HISTORY_OPEN_MONTHS):
+    """열린 구간의 시작일 (이 날짜 이전 달은 닫힌 달 → 저장소에서 읽음)"""
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    return (today.to_period('M') - (max(open_months, 1) - 1)).to_timestamp()
+
+
+class HistoryStore:
+    """
+    닫힌 달을 월 × 부서(소스) 단위 Parquet로 고정해두는 로컬 저장소
+        {root}/{YYYY-MM}/{source}.parquet
+        {root}/_frozen/{source}.json     ← 어느 달까지 고정했는지 (frozen_until, 미포함)
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._cache = {}        # (source, signature) → 고정된 달 전체 프레임
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, '_frozen'), exist_ok=True)
+
+    def frozen_until(self, source):
+        try:
+            with open(self._marker(source), encoding='utf-8') as f:
+                return pd.Timestamp(json.load(f)['frozen_until'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def months(self, source):
+        return sorted(
+            m for m in os.listdir(self.root)
+            if not m.startswith('_') and os.path.exists(self._partition(m, source))
+        )
+
+    def signature(self, source):
+        """고정 구간이 바뀔 때만 바뀌는 값 (데이터셋 버전 계산용)"""
+        until = self.frozen_until(source)
+        return f"{until:%Y-%m}:{','.join(self.months(source))}" if until is not None else ''
+
+    def freeze(self, source, df, before):
+        """df에서 before 이전 달 중 아직 고정되지 않은 달을 파티션으로 기록"""
+        until = self.frozen_until(source)
+        if until is not None and until >= before:
+            return []
+        closed = df[df['날짜'] < before]
+        if until is not None:
+            closed = closed[closed['날짜'] >= until]
+        written = []
+        for period, part in closed.groupby(closed['날짜'].dt.to_period('M')):
+            month = period.strftime('%Y-%m')
+            path = self._partition(month, source)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp.{os.getpid()}"
+            part.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+            written.append(month)
+        tmp = f"{self._marker(source)}.tmp.{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'frozen_until': f"{before:%Y-%m-%d}"}, f)
+        os.replace(tmp, self._marker(source))
+        return written
+
+    def load(self, source, before):
+        """고정된 달 중 before 이전 데이터 (고정 구간이 그대로면 메모리 캐시 사용)"""
+        key = (source, self.signature(source))
+        with self._lock:
+            if key not in self._cache:
+                frames = [
+                    pd.read_parquet(self._partition(m, source), columns=COLUMNS)
+                    for m in self.months(source)
+                ]
+                self._cache = {k: v for k, v in self._cache.items() if k[0] != source}
+                self._cache[key] = concat_frames(frames) if frames else None
+            frozen = self._cache[key]
+        if frozen is None:
+            return None
+        return frozen[frozen['날짜'] < before]
+
+    def _partition(self, month, source):
+        return os.path.join(self.root, month, f"{source}.parquet")
+
+    def _marker(self, source):
+        return os.path.join(self.root, '_frozen', f"{source}.json")
+
+
+class HistorySource:
+    """
+    소스를 감싸서 닫힌 달은 HistoryStore에서, 열린 구간만 원본에서 읽도록 함
+    - 저장소가 window_start까지 고정돼 있으면 원본에는 since(열린 구간 시작일)를 넘김
+      (window_url이 있는 HTTP 소스는 해당 구간만 내려받음)
+    - 아직 고정 안 된 경우(첫 실행, 재시작 후 월 변경 등)는 전체를 읽고 닫힌 달을 고정
+    """
+
+    def __init__(self, source, store):
+        self.source = source
+        self.store = store
+        self.name = source.name
+        self.dept = source.dept
+
+    def read(self, state, since=None):
+        inner = state.setdefault('inner', {})
+        cutoff = window_start()
+
+        # 월이 바뀌어 닫힌 달은 직전까지 들고 있던 프레임에서 고정
+        if 'frame' in state:
+            self.store.freeze(self.name, state['frame'], before=cutoff)
+        until = self.store.frozen_until(self.name)
+        complete = until is not None and until >= cutoff
+
+        changed = self.source.read(inner, since=cutoff if complete else None)
+        if not complete:
+            self.store.freeze(self.name, inner['frame'], before=cutoff)
+
+        signature = self.store.signature(self.name)
+        if not changed and 'frame' in state and state.get('signature') == signature:
+            return False
+
+        recent = inner['frame'][inner['frame']['날짜'] >= cutoff]
+        frozen = self.store.load(self.name, before=cutoff)
+        state['frame'] = concat_frames([frozen, recent]) if frozen is not None else recent.reset_index(drop=True)
+        # 전체/구간 중 어느 쪽으로 받았든 같은 내용이면 같은 digest (워커 간 버전 일치)
+        rows = pd.util.hash_pandas_object(recent, index=False).to_numpy()
+        state['digest'] = hashlib.sha1(rows.tobytes() + signature.encode('utf-8')).hexdigest()
+        state['signature'] = signature
+        return True
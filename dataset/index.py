@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+
+def sort_rows(df):
+    """(부서, 날짜) 순으로 정렬 (부서는 처음 나온 순서 = 소스 순서 유지)"""
+    codes, _ = pd.factorize(df['부서'])
+    order = np.lexsort((df['날짜'].to_numpy(), codes))
+    if (order == np.arange(len(order))).all():
+        return df
+    return df.take(order).reset_index(drop=True)
+
+
+class RowIndex:
+    """
+    (부서, 날짜) 순으로 정렬된 프레임에서 원본 행 위치 고르기 (스냅샷 버전당 1번 생성, 상세 테이블·내보내기용)
+    - 부서 → 행 구간(offset) 표 + 구간 안에서 날짜 이분 탐색
+    - 여러 부서면 구간만 이어 붙인 위치 배열 (전체 행을 훑는 마스크 없음), 프레임은 필요한 행만 take
+    """
+
+    def __init__(self, df):
+        self.df = sort_rows(df)
+        codes, uniques = pd.factorize(self.df['부서'])
+        self.depts = [str(d) for d in uniques]
+        bounds = np.searchsorted(codes, np.arange(len(self.depts) + 1))
+        self._bounds = {dept: (int(bounds[i]), int(bounds[i + 1])) for i, dept in enumerate(self.depts)}
+        self._dates = self.df['날짜'].to_numpy()
+
+    @property
+    def min_date(self):
+        return self.df['날짜'].min()
+
+    @property
+    def max_date(self):
+        return self.df['날짜'].max()
+
+    def span(self, dept, start=None, end=None):
+        """dept 행 중 [start, end] 구간의 (lo, hi) 위치 (없는 부서면 빈 구간)"""
+        lo, hi = self._bounds.get(dept, (0, 0))
+        dates = self._dates[lo:hi]
+        left = int(np.searchsorted(dates, pd.Timestamp(start).to_datetime64(), 'left')) if start is not None else 0
+        right = int(np.searchsorted(dates, pd.Timestamp(end).to_datetime64(), 'right')) if end is not None else len(dates)
+        return lo + left, lo + max(left, right)
+
+    def positions(self, start=None, end=None, unit='전체'):
+        """기간·부서에 해당하는 행 위치 배열 (부서 순서 → 날짜 순, 프레임은 건드리지 않음)"""
+        if unit == '전체':
+            depts = self.depts
+        elif isinstance(unit, str):
+            depts = [unit]
+        else:
+            wanted = set(unit)
+            depts = [d for d in self.depts if d in wanted]
+        spans = [self.span(dept, start, end) for dept in depts]
+        if not spans:
+            return np.zeros(0, dtype='int64')
+        return np.concatenate([np.arange(lo, hi, dtype='int64') for lo, hi in spans])
@@ -0,0 +1,80 @@
+import datetime
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# ---- 수집 설정 (환경변수로 조정) ----
+FETCH_TIMEOUT = float(os.environ.get('SHEET_FETCH_TIMEOUT', '20'))         # 시트 1개당 타임아웃(초)
+FETCH_CONCURRENCY = int(os.environ.get('SHEET_FETCH_CONCURRENCY', '6'))    # 동시에 받는 시트 수
+RETRY_BASE = float(os.environ.get('SOURCE_RETRY_BASE', '5'))               # 실패 후 첫 재시도 대기(초), 이후 2배씩
+BREAKER_THRESHOLD = int(os.environ.get('SOURCE_BREAKER_THRESHOLD', '3'))   # 연속 실패 몇 번이면 서킷 열림
+BREAKER_COOLDOWN = float(os.environ.get('SOURCE_BREAKER_COOLDOWN', '300')) # 서킷 열림 유지 시간(초)
+
+
+class SourceFetcher:
+    """
+    변경 감지 기능이 있는 소스 수집기 (소스 종류는 dataset.sources 참고)
+    - 소스별 상태(ETag/Last-Modified/파일 mtime, 본문 해시, 파싱된 프레임)를 보관
+    - 바뀌지 않은 소스는 기존 프레임을 재사용하고, 바뀐 소스가 없으면 version이 그대로 유지됨
+    - 실패한 소스는 마지막 정상 프레임(last-known-good)을 계속 쓰고 stale로 표시
+      → 지수 백오프로 재시도, 연속 실패가 쌓이면 서킷을 열어 cooldown 동안 요청하지 않음
+    """
+
+    def __init__(self, sources, max_workers=FETCH_CONCURRENCY):
+        self.sources = list(sources)
+        self.max_workers = max_workers
+        self._state = {source.name: {} for source in self.sources}
+
+    @property
+    def version(self):
+        """소스별 내용 해시를 합친 데이터셋 버전 키"""
+        digests = '|'.join(f"{name}:{state.get('digest', '')}" for name, state in self._state.items())
+        return hashlib.sha1(digests.encode('utf-8')).hexdigest()[:12]
+
+    @property
+    def stale(self):
+        """최신이 아닌 소스 → {부서: 마지막 정상 수집 시각(iso) 또는 None}"""
+        return {
+            source.dept: self._state[source.name].get('ok_at')
+            for source in self.sources
+            if self._state[source.name].get('failures')
+        }
+
+    def error(self, name):
+        """소스의 마지막 수집 오류 (정상이면 None)"""
+        return self._state[name].get('error')
+
+    def fetch(self):
+        """
+        전체 소스를 동시에 확인 → {소스 이름: DataFrame} (매니페스트 순서)
+        - 한 번도 읽지 못한 소스(정상 프레임이 없는 소스)는 빠짐 → stale로 확인
+        """
+        workers = max(1, min(self.max_workers, len(self.sources)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='source-fetch') as pool:
+            list(pool.map(self._fetch_one, self.sources))
+
+        frames = {s.name: self._state[s.name]['frame'] for s in self.sources if 'frame' in self._state[s.name]}
+        if not frames:
+            raise RuntimeError(f"읽어온 소스가 없습니다: {self._state[self.sources[0].name].get('error')}")
+        return frames
+
+    def _fetch_one(self, source):
+        state = self._state[source.name]
+        if time.monotonic() < state.get('retry_at', 0):
+            return          # 백오프/서킷 열림 → 마지막 정상 프레임 유지
+        try:
+            source.read(state)
+        except Exception as e:
+            failures = state.get('failures', 0) + 1
+            if failures >= BREAKER_THRESHOLD:
+                wait = BREAKER_COOLDOWN
+            else:
+                wait = min(RETRY_BASE * 2 ** (failures - 1), BREAKER_COOLDOWN)
+            state.update(failures=failures, retry_at=time.monotonic() + wait, error=repr(e))
+            logger.warning("소스 수집 실패: %s (%d회 연속, %.0f초 후 재시도) %r", source.name, failures, wait, e)
+            return
+        state.update(failures=0, retry_at=0, error=None, ok_at=datetime.datetime.now().isoformat(timespec='seconds'))
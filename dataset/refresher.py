@@ -0,0 +1,284 @@
+import datetime
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import stat
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:     # Windows 등 → 워커 간 조율 없이 각자 갱신
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ---- 백그라운드 갱신 설정 (환경변수로 조정) ----
+REFRESH_INTERVAL = float(os.environ.get('DATASET_REFRESH_INTERVAL', '120'))        # 갱신 주기(초), 0이면 사용 안 함
+REFRESH_JITTER = float(os.environ.get('DATASET_REFRESH_JITTER', '0.1'))            # 주기 대비 ± 흔들림 비율
+REFRESH_MAX_BACKOFF = float(os.environ.get('DATASET_REFRESH_MAX_BACKOFF', '900'))  # 실패 시 최대 대기(초)
+SHARED_DIR = os.environ.get('DATASET_SHARED_DIR', os.path.join(tempfile.gettempdir(), 'goodrich-dashboard'))
+MANUAL_REFRESH_TOKEN = os.environ.get('DATASET_REFRESH_TOKEN', '')                # 수동 갱신(POST /refresh-data) 토큰, 비어 있으면 사용 안 함
+MANUAL_REFRESH_MIN_INTERVAL = float(os.environ.get('DATASET_REFRESH_MIN_INTERVAL', '60'))  # 수동 갱신 최소 간격(초)
+SNAPSHOT_FORMAT = 3     # 공유 스냅샷 프레임 구조가 바뀌면 올림 (이전 배포가 남긴 파일 무시)
+SNAPSHOT_FILE = re.compile(r'snapshot-[0-9a-f]+\.parquet')     # 공유 디렉터리에서 읽는 스냅샷 파일 이름
+
+
+class Refresher:
+    """
+    일정 주기로 스냅샷을 다시 만드는 백그라운드 스레드
+    - 요청 경로는 갱신을 기다리지 않고 항상 마지막 스냅샷을 바로 사용
+    - 실패하면 지수 백오프(최대 max_backoff), 매 주기마다 jitter를 줘서 워커끼리 겹치지 않게 함
+    - gunicorn 워커 여러 개: 락 파일을 잡은 워커만 원본을 읽어 공유 디렉터리에 스냅샷을 기록하고,
+      나머지 워커는 그 파일을 읽어서 교체 (시트 요청은 주기당 1번)
+    """
+
+    def __init__(self, cache, interval=REFRESH_INTERVAL, jitter=REFRESH_JITTER,
+                 max_backoff=REFRESH_MAX_BACKOFF, shared_dir=SHARED_DIR):
+        self.cache = cache
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.shared_dir = shared_dir
+        self.shared = False     # 공유 디렉터리를 안전하게 쓸 수 있을 때만 워커 간 공유
+        self.failures = 0
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._force = False
+        self._refreshing = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def busy(self):
+        """갱신 중이거나 수동 갱신이 대기 중이면 True"""
+        return self._force or self._refreshing
+
+    def start(self):
+        """공유 스냅샷이 있으면 먼저 채택하고 갱신 스레드 시작"""
+        if self.running:
+            return
+        self.shared = private_dir(self.shared_dir)
+        if not self.shared:
+            logger.error("공유 디렉터리 %s를 쓸 수 없음 (소유자/권한 확인) → 워커마다 각자 갱신", self.shared_dir)
+        self._adopt_shared(max_age=self.interval)
+        self.cache.auto_reload = False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='dataset-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.cache.auto_reload = True
+
+    def trigger(self):
+        """다음 주기를 기다리지 않고 바로 원본을 다시 읽게 함 (수동 갱신)"""
+        self._force = True
+        self._wake.set()
+
+    def next_delay(self):
+        delay = self.interval
+        if self.failures:
+            delay = min(self.interval * 2 ** self.failures, self.max_backoff)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def refresh_once(self, force=False):
+        """
+        1) 공유 스냅샷이 주기 절반 이내로 최신이면 그것을 채택
+        2) 아니면 락을 잡은 워커 1개만 원본을 읽고 공유 스냅샷 기록
+        """
+        if not self.shared:
+            return self.cache.refresh()
+        if not force and self._adopt_shared(max_age=self.interval / 2):
+            return self.cache.current
+        with _FileLock(os.path.join(self.shared_dir, 'refresh.lock')) as acquired:
+            if not acquired:
+                # 다른 워커가 갱신 중 → 지금 있는 공유 스냅샷만 확인
+                self._adopt_shared()
+                return self.cache.current
+            if not force and self._adopt_shared(max_age=self.interval / 2):
+                return self.cache.current
+            snapshot = self.cache.refresh()
+            self._publish(snapshot)
+            return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.next_delay())
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self._refreshing = True
+            force, self._force = self._force, False
+            try:
+                self.refresh_once(force=force)
+                self.failures = 0
+            except Exception:
+                self.failures += 1
+                logger.exception("데이터 갱신 실패 (%d회 연속)", self.failures)
+            finally:
+                self._refreshing = False
+
+    # ---- 워커 간 공유 스냅샷 ----
+    def _meta_path(self):
+        return os.path.join(self.shared_dir, 'snapshot.json')
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_path(), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _adopt_shared(self, max_age=None):
+        """
+        공유 스냅샷을 채택 (max_age를 주면 그보다 오래된 것은 무시) → 채택했으면 True
+        - 파일은 공유 디렉터리 안의 snapshot-<hex>.parquet만 읽음 (pickle 등 코드 실행 가능한 형식은 쓰지 않음)
+        """
+        if not self.shared:
+            return False
+        meta = self._read_meta()
+        if not isinstance(meta, dict) or meta.get('format') != SNAPSHOT_FORMAT:
+            return False
+        try:
+            checked_at = datetime.datetime.fromisoformat(meta['checked_at'])
+            if max_age is not None and (datetime.datetime.now() - checked_at).total_seconds() >= max_age:
+                return False
+            current = self.cache.current
+            if current is None or current.version != meta['version']:
+                if not SNAPSHOT_FILE.fullmatch(str(meta['file'])):
+                    logger.warning("공유 스냅샷 파일 이름이 올바르지 않음: %r", meta['file'])
+                    return False
+                df = pd.read_parquet(os.path.join(self.shared_dir, meta['file']))
+                self.cache.install(df, meta['version'], checked_at, meta.get('stale'))
+            elif current.checked_at < checked_at:
+                self.cache.install(current.df, current.version, checked_at, meta.get('stale'))
+        except (OSError, ValueError, KeyError, TypeError):
+            return False    # 리더가 파일을 교체하는 중이거나 잘린 파일 → 다음 주기에 다시 확인
+        return True
+
+    def _publish(self, snapshot):
+        if fcntl is None or not self.shared:
+            return      # 조율하지 않는 환경에서는 공유할 필요 없음
+        meta = self._read_meta()
+        file_name = f"snapshot-{snapshot.version}.parquet"
+        if not isinstance(meta, dict) or meta.get('version') != snapshot.version or meta.get('format') != SNAPSHOT_FORMAT:
+            tmp = os.path.join(self.shared_dir, f".{file_name}.tmp")
+            snapshot.df.to_parquet(tmp, index=False)
+            os.replace(tmp, os.path.join(self.shared_dir, file_name))
+        _write_json_atomic(self._meta_path(), {
+            'version': snapshot.version,
+            'checked_at': snapshot.checked_at.isoformat(),
+            'file': file_name,
+            'stale': snapshot.stale,
+            'format': SNAPSHOT_FORMAT,
+        })
+        # 지난 버전 파일 정리 (직전 1개는 읽는 중일 수 있어 남김)
+        stale = sorted(
+            (f for f in os.listdir(self.shared_dir) if f.startswith('snapshot-') and f != file_name),
+            key=lambda f: os.path.getmtime(os.path.join(self.shared_dir, f)),
+        )
+        for f in stale[:-1]:
+            try:
+                os.remove(os.path.join(self.shared_dir, f))
+            except OSError:
+                pass
+
+
+class ManualRefreshGate:
+    """
+    수동 갱신 요청 확인 (POST /refresh-data)
+    - 토큰이 설정돼 있지 않으면 사용 안 함, 요청 토큰이 다르면 거부
+    - 갱신 중이거나 마지막 수동 갱신 후 min_interval이 지나지 않았으면 거절 (원본 요청 폭주 방지)
+    """
+
+    def __init__(self, token=MANUAL_REFRESH_TOKEN, min_interval=MANUAL_REFRESH_MIN_INTERVAL):
+        self.token = token
+        self.min_interval = min_interval
+        self._last = None
+        self._lock = threading.Lock()
+
+    def check(self, token, busy=False):
+        """→ (HTTP 상태 코드, 재시도까지 초) / 200이면 갱신해도 됨 (이때 간격 계산 시작)"""
+        if not self.token:
+            return 404, None
+        if not hmac.compare_digest((token or '').encode('utf-8'), self.token.encode('utf-8')):
+            return 403, None
+        with self._lock:
+            now = time.monotonic()
+            wait = 0 if self._last is None else self._last + self.min_interval - now
+            if busy or wait > 0:
+                return 429, max(int(wait + 0.999), 1)
+            self._last = now
+        return 200, None
+
+
+def private_dir(path):
+    """
+    워커끼리 파일을 주고받을 디렉터리를 0o700으로 만들고 확인 → 쓸 수 있으면 True
+    - 임시 디렉터리처럼 다른 사용자도 먼저 만들 수 있는 위치라서, SHARED_DIR부터 path까지
+      모두 현재 사용자 소유의 실제 디렉터리여야 함 (권한이 넓으면 0o700으로 줄임)
+    """
+    path = os.path.abspath(path)
+    root = os.path.abspath(SHARED_DIR)
+    chain = [path]
+    if os.path.commonpath([path, root]) == root:
+        while chain[-1] != root:
+            chain.append(os.path.dirname(chain[-1]))
+    try:
+        for directory in reversed(chain):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            st = os.lstat(directory)
+            if not stat.S_ISDIR(st.st_mode) or (hasattr(os, 'getuid') and st.st_uid != os.getuid()):
+                return False
+            if st.st_mode & 0o077:
+                os.chmod(directory, 0o700)
+    except OSError:
+        return False
+    return True
+
+
+class _FileLock:
+    """non-blocking 파일 락 (fcntl이 없으면 항상 획득)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return True
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            os.close(self._fd)
+            self._fd = None
+            return False
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def _write_json_atomic(path, data):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from dataset.cube import MEASURES, ROWS, _prefix
+
+
+class Rollup:
+    """
+    일별/주별/월별 탭용 집계 (스냅샷 버전당 1번 생성, 큐브 기반)
+    - 주: 월요일 기준, 평일만 / 월: 1일 기준
+    - 평일만 쌓은 누적합과 데이터 기간 전체의 주·월 키, 눈금 라벨을 미리 만들어 둠
+    - 탭 전환은 버킷 경계 위치 찾기 + 누적합 뺄셈 (원본 행 groupby 없음)
+    """
+
+    def __init__(self, cube):
+        self.cube = cube
+        weekday = (cube.dates.weekday < 5).astype('int64')[:, None]
+        self._weekday_prefix = {}
+        for key in MEASURES + [ROWS]:
+            values = cube._arrays[key] * weekday
+            self._weekday_prefix[key] = _prefix(np.column_stack([values, values.sum(axis=1)]))
+
+        if len(cube.dates):
+            first, last = cube.dates[0], cube.dates[-1]
+            self.weeks = pd.date_range(first - pd.Timedelta(days=first.weekday()), last, freq='W-MON')
+            self.months = pd.date_range(first.replace(day=1), last, freq='MS')
+        else:
+            self.weeks = self.months = pd.DatetimeIndex([], dtype='datetime64[ns]')
+        self.week_labels = np.asarray(self.weeks.strftime('%m-%d'), dtype=object)
+        self.month_labels = np.asarray(self.months.strftime('%y-%m'), dtype=object)
+
+    # ---- 버킷 합계 ----
+    def daily(self, measure, start, end, unit='전체'):
+        """[start, end] 날짜별 합계 Series (빈 날은 0)"""
+        return self.cube.query(measure, start, end, unit, 'D')
+
+    def weekly(self, measure, start, end, unit='전체'):
+        """
+        [start, end] 주별 합계 (평일만) → (월요일 키, 합계, 평일 행이 있는 주 여부)
+        - 키는 start가 속한 주의 월요일부터 end까지 (end < start면 빈 키)
+        """
+        keys, sums, rows = self._weekly_table(measure, start, end)
+        return (keys,) + self._pick(sums, rows, unit)
+
+    def monthly(self, measure, start, end, unit='전체'):
+        """[start, end] 월별 합계 → (월 1일 키, 합계, 행이 있는 달 여부)"""
+        keys, sums, rows = self._monthly_table(measure, start, end)
+        return (keys,) + self._pick(sums, rows, unit)
+
+    # ---- 부서별 2차원 표 (버킷 × depts 순서의 부서, 없는 부서는 0) ----
+    def daily_by_dept(self, measure, start, end, depts):
+        return self.cube.days(start, end), self._columns(self.cube.matrix(measure, start, end), depts)
+
+    def weekly_by_dept(self, measure, start, end, depts):
+        keys, sums, _ = self._weekly_table(measure, start, end)
+        return keys, self._columns(sums, depts)
+
+    def monthly_by_dept(self, measure, start, end, depts):
+        keys, sums, _ = self._monthly_table(measure, start, end)
+        return keys, self._columns(sums, depts)
+
+    # ---- 눈금 라벨 (미리 만든 라벨에서 찾기) ----
+    def week_label(self, keys):
+        """월요일 키 → 'MM-DD' 라벨"""
+        return _lookup(self.weeks, self.week_labels, keys, '%m-%d')
+
+    def month_label(self, keys):
+        """월 1일 키 → 'YY-MM' 라벨"""
+        return _lookup(self.months, self.month_labels, keys, '%y-%m')
+
+    def _weekly_table(self, measure, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        keys = pd.date_range(start - pd.Timedelta(days=start.weekday()), end, freq='W-MON')[:None if end >= start else 0]
+        return (keys,) + self._table(self._weekday_prefix, keys, measure, start, end)
+
+    def _monthly_table(self, measure, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        keys = pd.date_range(start.replace(day=1), end, freq='MS')[:None if end >= start else 0]
+        return (keys,) + self._table(self.cube._prefix, keys, measure, start, end)
+
+    def _table(self, prefixes, keys, measure, start, end):
+        """버킷 키 × 부서(+전체 열)별 [start, end] 안쪽 합계와 행 수 (누적합 뺄셈)"""
+        if len(keys) == 0:
+            zeros = np.zeros((0, len(self.cube.depts) + 1), dtype='int64')
+            return zeros, zeros
+        lo = self._positions(keys.where(keys > start, start))
+        hi = self._positions(keys[1:].append(pd.DatetimeIndex([end + pd.Timedelta(days=1)])))
+        hi = np.maximum(hi, lo)
+        return prefixes[measure][hi] - prefixes[measure][lo], prefixes[ROWS][hi] - prefixes[ROWS][lo]
+
+    def _pick(self, sums, rows, unit):
+        """unit 열의 합계와 행 수 > 0 여부 (없는 부서면 0)"""
+        col = self.cube.column(unit)
+        if col is not None and col < 0:
+            zeros = np.zeros(len(sums), dtype='int64')
+            return zeros, zeros > 0
+        col = len(self.cube.depts) if col is None else col
+        return sums[:, col], rows[:, col] > 0
+
+    def _columns(self, table, depts):
+        """큐브 부서 열(이름순) → depts 순서로 (큐브에 없는 부서는 0 열)"""
+        cols = np.array([self.cube.column(dept) for dept in depts], dtype='int64')
+        return np.where(cols >= 0, table[:, cols], 0)
+
+    def _positions(self, dates):
+        """날짜들 → 그 전날까지의 누적합 위치 (큐브 범위로 자름)"""
+        if len(self.cube.dates) == 0:
+            return np.zeros(len(dates), dtype='int64')
+        days = (dates - self.cube.dates[0]).days.to_numpy()
+        return np.clip(days, 0, len(self.cube.dates))
+
+
+def _lookup(keys, labels, wanted, fmt):
+    """미리 만든 라벨에서 찾기 (데이터 기간 밖 키가 섞이면 직접 포맷)"""
+    pos = keys.get_indexer(wanted)
+    if (pos >= 0).all():
+        return labels[pos]
+    return np.asarray(pd.DatetimeIndex(wanted).strftime(fmt), dtype=object)
+
+
+def interpolate_zeros(values):
+    """
+    0을 빈 값으로 보고 시간 축(행) 방향으로 열마다 선형 보간 (2차원 배열 한 번에)
+    - pandas의 replace(0, nan).interpolate(method='linear').fillna(0)과 같은 규칙
+    - 첫 값 이전은 0, 마지막 값 이후는 마지막 값 유지, 사이는 위치 기준 직선
+    """
+    values = np.asarray(values, dtype='float64')
+    n = values.shape[0]
+    valid = values != 0
+    pos = np.arange(n)[:, None]
+    prev = np.maximum.accumulate(np.where(valid, pos, -1), axis=0)
+    nxt = np.minimum.accumulate(np.where(valid, pos, n)[::-1], axis=0)[::-1]
+    cols = np.arange(values.shape[1])[None, :]
+    prev_val = values[np.clip(prev, 0, n - 1), cols]
+    next_val = values[np.clip(nxt, 0, n - 1), cols]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (next_val - prev_val) / (nxt - prev)
+        out = slope * (pos - prev) + prev_val
+    out = np.where(nxt >= n, prev_val, out)
+    out = np.where(prev < 0, 0.0, out)
+    return np.where(valid, values, out)
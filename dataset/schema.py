@@ -0,0 +1,105 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:     # pyarrow가 없으면 pandas C 엔진으로 읽음
+    pa = None
+
+# ---- 대시보드에서 쓰는 컬럼과 타입 (이 외 컬럼은 읽지 않음) ----
+SCHEMA = {
+    '날짜': 'datetime64[ns]',
+    '부서': 'category',
+    '건수': 'int32',
+    '환산': 'int64',
+    '보험료': 'int64',
+    '가동인원': 'int32',
+    '목표환산': 'int64',
+}
+COLUMNS = list(SCHEMA)
+NUMERIC_COLUMNS = [c for c, t in SCHEMA.items() if t.startswith('int')]
+
+# 시트의 날짜 형식 (형식이 맞지 않는 값이 있으면 자동 추론으로 재시도)
+DATE_FORMAT = os.environ.get('SHEET_DATE_FORMAT', '%Y-%m-%d')
+
+
+def read_csv_typed(raw):
+    """필요한 컬럼만, 지정한 타입으로 CSV(bytes) 읽기 (pyarrow 엔진 우선)"""
+    if pa is not None:
+        try:
+            return apply_schema(_read_arrow(raw))
+        except (pa.ArrowInvalid, KeyError):
+            pass    # 날짜 형식이 다르거나 숫자 칸에 문자가 섞인 경우 → pandas로 재시도
+    return apply_schema(_read_pandas(raw))
+
+
+def _read_arrow(raw):
+    column_types = {
+        '날짜': pa.timestamp('ns'),
+        '부서': pa.dictionary(pa.int32(), pa.string()),
+        **{col: pa.float64() for col in NUMERIC_COLUMNS},
+    }
+    options = pa_csv.ConvertOptions(
+        include_columns=COLUMNS,
+        column_types=column_types,
+        timestamp_parsers=[DATE_FORMAT],
+    )
+    return pa_csv.read_csv(io.BytesIO(raw), convert_options=options).to_pandas()
+
+
+def _read_pandas(raw):
+    dtypes = {'날짜': str, '부서': 'category', **{col: str for col in NUMERIC_COLUMNS}}
+    df = pd.read_csv(io.BytesIO(raw), usecols=COLUMNS, dtype=dtypes, encoding='utf-8')
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col].str.replace(',', ''), errors='coerce')
+    return df
+
+
+def apply_schema(df):
+    """
+    백엔드(CSV/Parquet)와 상관없이 같은 모양의 프레임으로 맞춤
+    - 날짜: tz 없는 datetime64 (날짜가 없는 빈 행은 제거)
+    - 부서: category (앞뒤 공백 제거, 부서가 비어 있는 행은 제거)
+    - 숫자: 빈 칸은 0, int32/int64
+    """
+    dates = _parse_dates(df['날짜'])
+    # 부서는 category 값(종류 수만큼)에서만 공백 정리 → 행마다 문자열을 다루지 않음
+    depts = pd.Categorical(df['부서'])
+    names = np.asarray(depts.categories.astype(str).str.strip(), dtype=object)
+    categories, remap = np.unique(names, return_inverse=True)
+    valid = np.append(names != '', False)       # codes -1(빈 칸)은 마지막 False
+    keep = dates.notna().to_numpy() & valid[depts.codes]
+
+    out = pd.DataFrame({'날짜': dates.to_numpy()[keep]})
+    used = categories != ''
+    codes = np.cumsum(used)[remap] - 1          # 빈 이름('')을 뺀 범주 기준 코드
+    out['부서'] = pd.Categorical.from_codes(codes[depts.codes[keep]], categories=categories[used])
+    for col in NUMERIC_COLUMNS:
+        values = np.nan_to_num(df[col].to_numpy(dtype='float64')[keep])
+        out[col] = values.round().astype(SCHEMA[col])
+    return out
+
+
+def concat_frames(frames):
+    """소스별 프레임 합치기 (부서 category는 이름순 → groupby 결과 순서가 문자열 컬럼일 때와 같음)"""
+    depts = union_categoricals([f['부서'].array for f in frames], sort_categories=True)
+    df = pd.concat([f.drop(columns='부서') for f in frames], axis=0, ignore_index=True)
+    df.insert(1, '부서', depts)
+    return df
+
+
+def _parse_dates(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = values
+    else:
+        parsed = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+        if parsed.isna().sum() > values.isna().sum():
+            parsed = pd.to_datetime(values, errors='coerce')
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.astype('datetime64[ns]')
@@ -0,0 +1,148 @@
+import collections
+import datetime
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ---- 캐시 설정 (환경변수로 조정) ----
+SNAPSHOT_TTL = float(os.environ.get('SNAPSHOT_TTL', '300'))    # 스냅샷 유지 시간(초)
+RETRY_AFTER_FAILURE = 30                                       # 백그라운드 재검증 실패 후 다시 시도까지(초)
+KEEP_VERSIONS = 3                                              # 버전 키로 찾을 수 있게 남겨두는 최근 스냅샷 수
+
+
+class Snapshot:
+    """한 버전의 데이터셋과 그 버전에서 파생된 값(직렬화 결과 등)을 함께 보관"""
+
+    def __init__(self, df, version, loaded_at, stale=None):
+        self.df = df
+        self.version = version
+        self.loaded_at = loaded_at      # 이 버전을 처음 읽어온 시각
+        self.checked_at = loaded_at     # 원본을 마지막으로 확인한 시각 ("데이터 기준" 표시용)
+        self.stale = stale or {}        # 최신이 아닌 부서 → 마지막 정상 수집 시각
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derived(self, key, build):
+        """버전당 1번만 계산되는 파생값: build(df) 결과를 key로 memoize"""
+        if key in self._derived:
+            return self._derived[key]
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = build(self.df)
+            return self._derived[key]
+
+    def has(self, key):
+        return key in self._derived
+
+    def to_json(self):
+        return self.derived('json', lambda df: df.to_json(date_format='iso', orient='split'))
+
+
+class SnapshotCache:
+    """
+    프로세스 내 TTL 스냅샷 캐시
+    - loader: (현재 스냅샷 또는 None) -> (df, version, stale)
+    - 내용이 같으면(version 동일) 기존 스냅샷을 그대로 유지 → 파생값 캐시도 유지
+    - TTL이 지나면 기존 스냅샷을 바로 돌려주고 백그라운드에서 다시 읽음 (stale-while-revalidate)
+    - auto_reload=False면 요청 경로에서는 다시 읽지 않음 (Refresher가 갱신 담당)
+    - 최근 KEEP_VERSIONS개 스냅샷은 버전 키로 다시 찾을 수 있음 (갱신 직전에 열린 페이지용)
+    """
+
+    def __init__(self, loader, ttl=SNAPSHOT_TTL):
+        self._loader = loader
+        self.ttl = ttl
+        self.auto_reload = True
+        self._snapshot = None
+        self._recent = collections.OrderedDict()
+        self._expires = 0.0
+        self._lock = threading.Lock()
+        self._revalidating = threading.Lock()
+
+    @property
+    def current(self):
+        """갱신 없이 현재 스냅샷 반환 (없으면 None)"""
+        return self._snapshot
+
+    @property
+    def revalidating(self):
+        """백그라운드 재검증이 진행 중이면 True"""
+        return self._revalidating.locked()
+
+    def snapshot_for(self, version):
+        """버전 키에 해당하는 스냅샷 (이미 밀려났으면 None)"""
+        return self._recent.get(version)
+
+    def recent(self):
+        """버전 키로 찾을 수 있는 스냅샷들 (최신이 마지막)"""
+        return list(self._recent.values())
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            # 첫 로드만 요청 경로에서 기다림
+            with self._lock:
+                if self._snapshot is None:
+                    return self._reload()
+                return self._snapshot
+        if self.auto_reload and time.monotonic() >= self._expires:
+            self._revalidate_async()
+        return snapshot
+
+    def refresh(self):
+        """TTL과 상관없이 즉시 원본을 다시 읽음"""
+        with self._lock:
+            return self._reload()
+
+    def install(self, df, version, checked_at, stale=None):
+        """외부에서 만든 데이터(다른 워커가 공유한 스냅샷 등)로 교체"""
+        with self._lock:
+            if self._snapshot is not None and self._snapshot.version == version:
+                self._snapshot.checked_at = max(self._snapshot.checked_at, checked_at)
+                self._snapshot.stale = stale or {}
+            else:
+                self._replace(Snapshot(df, version, checked_at, stale))
+            self._expires = time.monotonic() + self.ttl
+            return self._snapshot
+
+    def invalidate(self):
+        """다음 get()에서 원본을 다시 읽도록 만료 처리"""
+        self._expires = 0.0
+
+    def _revalidate_async(self):
+        # 이미 다른 스레드가 재검증 중이면 그대로 둠 (single-flight)
+        if not self._revalidating.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("스냅샷 재검증 실패 → 기존 스냅샷 유지")
+                self._expires = time.monotonic() + min(self.ttl, RETRY_AFTER_FAILURE)
+            finally:
+                self._revalidating.release()
+
+        threading.Thread(target=run, name='snapshot-revalidate', daemon=True).start()
+
+    def _reload(self):
+        df, version, stale = self._loader(self._snapshot)
+        now = datetime.datetime.now()
+        if self._snapshot is not None and self._snapshot.version == version:
+            self._snapshot.checked_at = now
+            self._snapshot.stale = stale
+        else:
+            # 참조 1번 교체로 원자적으로 바뀜 → 요청 스레드는 항상 완성된 스냅샷만 봄
+            self._replace(Snapshot(df, version, now, stale))
+        self._expires = time.monotonic() + self.ttl
+        return self._snapshot
+
+    def _replace(self, snapshot):
+        self._snapshot = snapshot
+        recent = collections.OrderedDict(self._recent)
+        recent[snapshot.version] = snapshot
+        while len(recent) > KEEP_VERSIONS:
+            recent.popitem(last=False)
+        self._recent = recent
@@ -0,0 +1,137 @@
+import hashlib
+import io
+import json
+import os
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from dataset.ingest import FETCH_TIMEOUT
+from dataset.schema import COLUMNS, apply_schema, read_csv_typed
+
+# ---- 소스 매니페스트 (환경변수 DATASET_MANIFEST로 교체 가능) ----
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sources.json')
+DATASET_MANIFEST = os.environ.get('DATASET_MANIFEST', DEFAULT_MANIFEST)
+
+
+class HttpCsvSource:
+    """
+    구글 시트 export 등 HTTP CSV 소스
+    - ETag/Last-Modified가 있으면 조건부 요청 → 304면 재사용
+    - 없으면 본문 해시로 비교
+    - window_url: since 이후 행만 돌려주는 주소 (예: gviz tq 쿼리, "{since}"에 YYYY-MM-DD)
+      → 히스토리 저장소가 닫힌 달을 갖고 있으면 열린 구간만 내려받음
+    """
+    kind = 'http-csv'
+
+    def __init__(self, name, url, dept=None, timeout=FETCH_TIMEOUT, window_url=None):
+        self.name = name
+        self.dept = dept or name
+        self.url = url
+        self.window_url = window_url
+        self.timeout = float(timeout)
+
+    def read(self, state, since=None):
+        """state(dict)를 갱신하고, 새로 파싱했으면 True"""
+        url = self.url
+        if since is not None and self.window_url:
+            url = self.window_url.format(since=f"{since:%Y-%m-%d}")
+        request = urllib.request.Request(url)
+        # 주소가 바뀌면(전체 ↔ 구간) 이전 검증값은 의미 없음
+        if 'frame' in state and state.get('url') == url:
+            if state.get('etag'):
+                request.add_header('If-None-Match', state['etag'])
+            if state.get('last_modified'):
+                request.add_header('If-Modified-Since', state['last_modified'])
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+                raw = resp.read()
+                etag = resp.headers.get('ETag')
+                last_modified = resp.headers.get('Last-Modified')
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and 'frame' in state:
+                return False
+            raise
+
+        state['url'] = url
+        state['etag'] = etag
+        state['last_modified'] = last_modified
+        return _update_if_changed(state, raw, read_csv_typed)
+
+
+class _LocalFileSource:
+    """
+    로컬 디렉터리의 {name}.{ext} 파일 소스 (mtime/크기가 같으면 파일을 읽지 않음)
+    - 형식별 하위 클래스가 ext와 parse(raw)를 정의 (매니페스트 type → SOURCE_TYPES에서 하위 클래스 선택)
+    """
+    ext = None
+
+    def __init__(self, name, path, dept=None):
+        self.name = name
+        self.dept = dept or name
+        self.file = os.path.join(path, f"{name}.{self.ext}")
+
+    def read(self, state, since=None):
+        st = os.stat(self.file)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if 'frame' in state and state.get('stamp') == stamp:
+            return False
+        with open(self.file, 'rb') as f:
+            raw = f.read()
+        state['stamp'] = stamp
+        return _update_if_changed(state, raw, self.parse)
+
+
+class CsvDirSource(_LocalFileSource):
+    kind = 'csv-dir'
+    ext = 'csv'
+
+    def parse(self, raw):
+        return read_csv_typed(raw)
+
+
+class ParquetDirSource(_LocalFileSource):
+    kind = 'parquet-dir'
+    ext = 'parquet'
+
+    def parse(self, raw):
+        return apply_schema(pd.read_parquet(io.BytesIO(raw), columns=COLUMNS))
+
+
+def _update_if_changed(state, raw, parse):
+    digest = hashlib.sha1(raw).hexdigest()
+    if 'frame' in state and digest == state.get('digest'):
+        return False
+    state['frame'] = parse(raw)
+    state['digest'] = digest
+    return True
+
+
+SOURCE_TYPES = {cls.kind: cls for cls in (HttpCsvSource, CsvDirSource, ParquetDirSource)}
+
+
+def load_manifest(path=DATASET_MANIFEST):
+    """
+    매니페스트(json) → 소스 목록
+    {"sources": [{"name": "alpha", "dept": "알파실", "type": "http-csv", "url": "..."},
+                 {"name": "gold1", "dept": "골드1실", "type": "csv-dir", "path": "snapshots"}, ...]}
+    - dept는 화면 표시용 부서명 (지연 표시 등)
+    - path는 매니페스트 파일 위치 기준 상대경로 허용
+    - http-csv는 window_url(선택)로 최근 구간만 받는 주소 지정 가능
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    sources = []
+    for entry in manifest['sources']:
+        entry = dict(entry)
+        kind = entry.pop('type')
+        if kind not in SOURCE_TYPES:
+            raise ValueError(f"알 수 없는 소스 타입: {kind} ({entry.get('name')})")
+        if 'path' in entry:
+            entry['path'] = os.path.join(base_dir, entry['path'])
+        sources.append(SOURCE_TYPES[kind](**entry))
+    return sources
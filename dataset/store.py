@@ -0,0 +1,111 @@
+import collections
+import datetime
+import hashlib
+import io
+import logging
+import os
+import threading
+
+import pandas as pd
+
+from dataset.cube import Cube
+from dataset.goals import GoalTable
+from dataset.index import RowIndex
+from dataset.rollup import Rollup
+from dataset.snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+# ---- dcc.Store('main-data') 모드 (환경변수로 조정) ----
+# server: 브라우저에는 버전 키만 내려주고 콜백에서 서버 캐시의 프레임을 사용
+# client: 예전처럼 전체 데이터를 JSON으로 내려주고 콜백마다 되돌려 받음
+STORE_MODE = os.environ.get('DATASET_STORE_MODE', 'server')
+DECODE_CACHE_SIZE = int(os.environ.get('DATASET_DECODE_CACHE_SIZE', '4'))   # client 모드에서 워커별로 보관할 복원 프레임 수
+
+
+class DatasetStore:
+    """main-data 스토어에 넣을 값과, 콜백에서 그 값으로 프레임을 찾는 방법을 한곳에서 관리"""
+
+    def __init__(self, cache, mode=STORE_MODE):
+        if mode not in ('server', 'client'):
+            raise ValueError(f"알 수 없는 DATASET_STORE_MODE: {mode}")
+        self.cache = cache
+        self.mode = mode
+        self._decoded = collections.OrderedDict()   # 본문 해시 → 복원한 스냅샷 (LRU)
+        self._lock = threading.Lock()
+
+    def payload(self, snapshot):
+        """레이아웃의 dcc.Store(id='main-data')에 넣을 값"""
+        if self.mode == 'server':
+            return {'version': snapshot.version}
+        return snapshot.to_json()
+
+    def meta(self, snapshot):
+        """레이아웃의 dcc.Store(id='dataset-meta')에 넣을 값: 날짜 범위·부서 목록·버전 (브라우저에서 기간 보정용)"""
+        return snapshot.derived('meta', lambda df: {
+            'version': snapshot.version,
+            'min_date': df['날짜'].min().date().isoformat(),
+            'max_date': df['날짜'].max().date().isoformat(),
+            'depts': [str(d) for d in df['부서'].unique()],
+        })
+
+    def resolve(self, data):
+        """
+        스토어 값 → 스냅샷 (df와 버전별 파생값), 콜백이 데이터를 찾는 유일한 입구
+        - cube/goals/rollup/rows는 이 스냅샷의 버전별 파생값
+        - 돌려주는 프레임/파생값은 요청끼리 공유되므로 콜백에서 수정하지 말 것
+        """
+        if isinstance(data, dict):
+            snapshot = self.cache.snapshot_for(data.get('version'))
+            if snapshot is None:
+                # 페이지를 연 뒤 여러 번 갱신돼 해당 버전이 밀려남 → 최신 버전으로 응답
+                logger.info("스토어 버전 %s 없음 → 현재 스냅샷 사용", data.get('version'))
+                snapshot = self.cache.get()
+            return snapshot
+        return self._decode(data)
+
+    def cube(self, data):
+        """스토어 값 → 날짜 × 부서 집계 큐브 (버전당 1번 생성)"""
+        return self.resolve(data).derived('cube', Cube)
+
+    def goals(self, data):
+        """스토어 값 → (연월, 부서) 목표환산 표 (버전당 1번 생성)"""
+        return self.resolve(data).derived('goals', GoalTable)
+
+    def rollup(self, data):
+        """스토어 값 → 일별/주별/월별 탭 집계 (버전당 1번 생성)"""
+        snapshot = self.resolve(data)
+        cube = snapshot.derived('cube', Cube)   # derived는 락을 잡고 만들므로 큐브를 먼저 꺼내 둠
+        return snapshot.derived('rollup', lambda df: Rollup(cube))
+
+    def rows(self, data):
+        """스토어 값 → 기간·부서로 원본 행을 고르는 인덱스 (버전당 1번 생성)"""
+        return self.resolve(data).derived('rows', RowIndex)
+
+    def _decode(self, data_json):
+        """
+        client 모드: 같은 본문은 워커당 1번만 복원
+        - 서버가 내려준 최근 버전 그대로면 복원 없이 그 스냅샷 사용
+        - 아니면 본문 해시로 LRU 캐시 (복원한 프레임의 파생값도 같이 보관)
+        """
+        for snapshot in self.cache.recent():
+            if snapshot.has('json') and snapshot.to_json() == data_json:
+                return snapshot
+        key = hashlib.sha1(data_json.encode('utf-8')).hexdigest()
+        with self._lock:
+            if key in self._decoded:
+                self._decoded.move_to_end(key)
+                return self._decoded[key]
+        snapshot = Snapshot(decode_frame(data_json), key, datetime.datetime.now())
+        with self._lock:
+            self._decoded[key] = snapshot
+            while len(self._decoded) > DECODE_CACHE_SIZE:
+                self._decoded.popitem(last=False)
+        return snapshot
+
+
+def decode_frame(data_json):
+    """client 모드: to_json(orient='split') 결과를 프레임으로 복원"""
+    df = pd.read_json(io.StringIO(data_json), orient='split')
+    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce').dt.tz_localize(None)
+    return df
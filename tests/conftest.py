@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset.schema import apply_schema
+from tools import fake_sheets
+
+# ---- 테스트용 작은 고정 프레임 ----
+# - 부서는 이름순이 아닌 순서로 섞음 / 주말·빠진 날·같은 날 여러 행·부서가 빈 행 포함
+# - 2024-01-24(수) ~ 2024-03-12(화): 시작·끝 주와 1월·3월이 모두 일부만 걸침
+DEPTS = ['실버3실', '골드1실', '다이아2실']
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    days = pd.date_range('2024-01-24', '2024-03-12', freq='D')
+    rows = []
+    for day in days:
+        for dept in DEPTS:
+            if rng.random() < 0.25:
+                continue
+            for _ in range(rng.integers(1, 3)):
+                rows.append({
+                    '날짜': day.strftime('%Y-%m-%d'),
+                    '부서': dept,
+                    '건수': int(rng.integers(0, 5)),
+                    '환산': int(rng.integers(0, 4)) * 10000,
+                    '보험료': int(rng.integers(0, 9)) * 1000,
+                    '가동인원': int(rng.integers(1, 4)),
+                    '목표환산': 500000 + 10000 * DEPTS.index(dept) + 1000 * day.month,
+                })
+    # 날짜는 있는데 부서가 빈 행 (시트의 빈 줄·입력 실수) → apply_schema에서 제거
+    for dept in ['', '  ', None]:
+        rows.append({**rows[-1], '부서': dept})
+    return apply_schema(pd.DataFrame(rows))
+
+
+@pytest.fixture
+def sheets(tmp_path):
+    """가짜 시트 서버 + 그 주소로 만든 매니페스트 → (server, 매니페스트 경로)"""
+    server, urls = fake_sheets.serve(delay=0, days=60)
+    manifest = fake_sheets.write_manifest(urls, str(tmp_path / 'sources.json'))
+    yield server, manifest
+    server.shutdown()
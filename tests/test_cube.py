@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset.cube import Cube
+
+
+def expected(df, measure, start, end, unit='전체', bucket='D'):
+    """이전 방식: 원본 행을 걸러 groupby/resample 합계 (빈 구간은 0)"""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    rows = df[(df['날짜'] >= start) & (df['날짜'] <= end)]
+    if unit != '전체':
+        rows = rows[rows['부서'] == unit]
+    if bucket == 'W':
+        rows = rows[rows['날짜'].dt.weekday < 5]
+        keys = rows['날짜'] - pd.to_timedelta(rows['날짜'].dt.weekday, unit='D')
+        index = pd.date_range(start - pd.Timedelta(days=start.weekday()), end, freq='W-MON')
+    elif bucket == 'M':
+        keys = rows['날짜'].dt.to_period('M').dt.to_timestamp()
+        index = pd.date_range(start.replace(day=1), end, freq='MS')
+    else:
+        keys = rows['날짜']
+        index = pd.date_range(start, end, freq='D')
+    return rows.groupby(keys)[measure].sum().reindex(index, fill_value=0).astype('int64')
+
+
+@pytest.mark.parametrize('bucket', ['D', 'W', 'M'])
+@pytest.mark.parametrize('unit', ['전체', '골드1실', '실버3실'])
+@pytest.mark.parametrize('start, end', [
+    ('2024-01-24', '2024-03-12'),     # 전체 기간 (시작·끝 주와 달이 일부만 걸침)
+    ('2024-02-07', '2024-02-20'),     # 수요일 ~ 화요일
+    ('2024-01-31', '2024-02-01'),     # 월 경계
+    ('2024-01-10', '2024-01-26'),     # 데이터 시작 전부터
+    ('2024-03-09', '2024-04-02'),     # 데이터 끝 이후까지
+])
+def test_query_matches_groupby(frame, bucket, unit, start, end):
+    cube = Cube(frame)
+    for measure in ['건수', '환산', '보험료']:
+        got = cube.query(measure, start, end, unit, bucket)
+        pd.testing.assert_series_equal(got, expected(frame, measure, start, end, unit, bucket), check_names=False,
+                                       check_freq=False, check_index_type=False)
+
+
+def test_query_outside_data_is_zero(frame):
+    cube = Cube(frame)
+    got = cube.query('건수', '2023-05-01', '2023-05-31', bucket='D')
+    assert len(got) == 31 and (got == 0).all()
+    assert (cube.query('건수', '2023-05-01', '2023-06-30', bucket='M') == 0).all()
+
+
+def test_query_empty_range(frame):
+    cube = Cube(frame)
+    for bucket in ['D', 'W', 'M']:
+        assert len(cube.query('건수', '2024-02-10', '2024-02-01', bucket=bucket)) == 0
+    assert cube.total('건수', '2024-02-10', '2024-02-01') == 0
+
+
+def test_query_unknown_dept_is_zero(frame):
+    cube = Cube(frame)
+    got = cube.query('환산', '2024-02-01', '2024-02-29', '없는부서', 'W')
+    assert (got == 0).all()
+    assert cube.total('환산', '2024-02-01', '2024-02-29', '없는부서') == 0
+
+
+def test_single_dept(frame):
+    one = frame[frame['부서'] == '다이아2실'].reset_index(drop=True)
+    cube = Cube(one)
+    assert cube.depts == ['다이아2실']
+    got = cube.query('건수', '2024-01-24', '2024-03-12', '다이아2실', 'M')
+    pd.testing.assert_series_equal(got, expected(one, '건수', '2024-01-24', '2024-03-12', bucket='M'),
+                                   check_names=False, check_freq=False, check_index_type=False)
+
+
+def test_depts_sorted_by_name(frame):
+    assert Cube(frame).depts == ['골드1실', '다이아2실', '실버3실']       # 부서가 빈 행은 빠짐
+    assert list(frame['부서'].cat.categories) == ['골드1실', '다이아2실', '실버3실']
+
+
+def test_goal_is_daily_max(frame):
+    cube = Cube(frame)
+    day = pd.Timestamp('2024-02-14')
+    rows = frame[frame['날짜'] == day]
+    expect = rows.groupby('부서', observed=True)['목표환산'].max().reindex(cube.depts, fill_value=0)
+    np.testing.assert_array_equal(cube.matrix('목표환산', day, day)[0], expect.to_numpy())
+
+
+def test_empty_frame():
+    cube = Cube(pd.DataFrame({
+        '날짜': pd.to_datetime([]), '부서': pd.Categorical([]),
+        **{m: np.zeros(0, dtype='int64') for m in ['건수', '환산', '보험료', '가동인원', '목표환산']},
+    }))
+    assert cube.depts == []
+    assert cube.total('건수', '2024-01-01', '2024-01-31') == 0
+    assert (cube.query('건수', '2024-01-01', '2024-01-31', bucket='W') == 0).all()
+
+
+# ---- 누적합 조회 ----
+@pytest.mark.parametrize('unit', ['전체', '다이아2실', '없는부서'])
+def test_total_matches_row_sum(frame, unit):
+    cube = Cube(frame)
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2024-01-20', '2024-03-15', freq='D')
+    for _ in range(50):
+        start, end = sorted(rng.choice(days, 2))
+        for measure in ['건수', '환산', '가동인원']:
+            assert cube.total(measure, start, end, unit) == expected(frame, measure, start, end, unit).sum()
+
+
+def test_cumulative_matches_cumsum(frame):
+    cube = Cube(frame)
+    start, end = '2024-01-20', '2024-03-15'      # 양쪽 끝이 데이터 밖
+    got = cube.cumulative('환산', start, end, '골드1실')
+    np.testing.assert_array_equal(got, expected(frame, '환산', start, end, '골드1실').cumsum().to_numpy())
+
+
+def test_last_date_before(frame):
+    cube = Cube(frame)
+    dates = frame.loc[frame['부서'] == '실버3실', '날짜']
+    for day in ['2024-01-24', '2024-02-05', '2024-03-12', '2024-04-01']:
+        before = dates[dates < pd.Timestamp(day)]
+        assert cube.last_date_before(day, '실버3실') == (before.max() if len(before) else None)
+    assert cube.last_date_before('2024-03-01', '없는부서') is None
@@ -0,0 +1,111 @@
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from components import downsample, figure_encoding
+from components.downsample import bucket_bars, bucket_name, lttb, lttb_indices, point_budget
+
+
+@pytest.fixture
+def json_lists(monkeypatch):
+    """JSON 목록으로 보낼 때 (크기 비교 없이 budget만으로 줄임)"""
+    monkeypatch.setattr(figure_encoding, 'FIGURE_TYPED_ARRAYS', False)
+
+
+@pytest.fixture
+def series():
+    x = pd.date_range('2022-01-03', periods=1000, freq='D')
+    y = np.random.default_rng(5).integers(0, 100, 1000).astype('float64')
+    return x, y
+
+
+@pytest.mark.parametrize('budget', [3, 10, 137, 999])
+def test_lttb_keeps_ends_within_budget(series, budget, json_lists):
+    x, y = series
+    dx, dy = lttb(x, y, budget)
+    assert len(dx) == len(dy) == budget
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert dy[0] == y[0] and dy[-1] == y[-1]
+    index = lttb_indices(y, budget)
+    assert (np.diff(index) > 0).all()                           # 순서 유지, 중복 없음
+    np.testing.assert_array_equal(dy, y[index])
+
+
+def test_lttb_keeps_peaks(series, json_lists):
+    x, y = series
+    y = y.copy()
+    y[[250, 600]] = [1000, -1000]
+    _, dy = lttb(x, y, 100)
+    assert dy.max() == 1000 and dy.min() == -1000
+
+
+@pytest.mark.parametrize('budget', [None, 1000, 5000])
+def test_lttb_no_op(series, budget):
+    x, y = series
+    dx, dy = lttb(x, y, budget)
+    assert dx is x
+    np.testing.assert_array_equal(dy, y)
+
+
+def test_lttb_small_budget_and_missing_values(json_lists):
+    y = np.array([1.0, np.nan, 3.0, 0.0, 8.0, np.nan])
+    np.testing.assert_array_equal(lttb_indices(y, 2), np.arange(6))          # 3개 미만이면 그대로
+    _, dy = lttb(np.arange(6), y, 4)
+    assert len(dy) == 4 and dy[0] == 1.0 and np.isnan(dy[-1])                # 빈 값은 그대로 둠
+
+
+@pytest.mark.parametrize('dtype, budget, reduced', [
+    ('float64', 499, True), ('float64', 500, False),     # f8: 점이 budget의 2배보다 많아야
+    ('int64', 333, True), ('int64', 334, False),         # i4: 3배
+])
+def test_lttb_only_when_smaller(series, monkeypatch, dtype, budget, reduced):
+    monkeypatch.setattr(figure_encoding, 'FIGURE_TYPED_ARRAYS', True)
+    x, y = series
+    dx, dy = lttb(x, y.astype(dtype), budget)
+    assert (len(dy) == budget) is reduced and (dx is x) is not reduced
+
+
+def test_lttb_payload_not_larger(series, monkeypatch):
+    """타입 배열 그림 크기: 줄인 결과가 모든 점보다 커지지 않음"""
+    monkeypatch.setattr(figure_encoding, 'FIGURE_TYPED_ARRAYS', True)
+    x, y = series
+    for n in [300, 450, 600, 1000]:
+        for budget in [150, 200, 299]:
+            exact = figure_encoding.encode_figure(go.Figure(go.Scatter(x=x[:n], y=y[:n])))
+            dx, dy = lttb(x[:n], y[:n], budget)
+            small = figure_encoding.encode_figure(go.Figure(go.Scatter(x=dx, y=dy)))
+            assert len(json.dumps(small['data'])) <= len(json.dumps(exact['data']))
+
+
+def test_bucket_bars():
+    x = np.arange(10)
+    y = np.array([1, 5, 2, 0, 0, 7, 3, 3, 3, 9])
+    bx, by, size = bucket_bars(x, y, 4, 'max')
+    assert size == 3
+    np.testing.assert_array_equal(bx, [0, 3, 6, 9])
+    np.testing.assert_array_equal(by, [5, 7, 3, 9])
+    _, by, _ = bucket_bars(x, y, 4, 'sum')
+    np.testing.assert_array_equal(by, [8, 7, 9, 9])
+    assert by.sum() == y.sum()
+    bx, by, size = bucket_bars(x, y, 10)
+    assert bx is x and size == 1
+
+
+def test_bucket_name():
+    assert bucket_name('일별', 1) == '일별'
+    assert bucket_name('일별', 7, 'max') == '일별 (7일 최대)'
+    assert bucket_name('일별', 7, 'sum') == '일별 (7일 합계)'
+
+
+def test_point_budget(monkeypatch):
+    monkeypatch.setattr(downsample, 'FIGURE_DOWNSAMPLE', True)
+    assert point_budget({'width': 1200}) == int(1200 * downsample.FIGURE_POINTS_PER_PX)
+    assert point_budget({'width': 10}) == downsample.FIGURE_MIN_POINTS
+    assert point_budget(None) == max(downsample.FIGURE_MIN_POINTS,
+                                     int(downsample.FIGURE_DEFAULT_WIDTH * downsample.FIGURE_POINTS_PER_PX))
+    assert point_budget({'width': 1200, 'exact': True}) is None
+    monkeypatch.setattr(downsample, 'FIGURE_DOWNSAMPLE', False)
+    assert point_budget({'width': 1200}) is None
@@ -0,0 +1,142 @@
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset import export
+from dataset.export import EXPORT_FORMATS, ExportCache, export_rows
+
+NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def read_xlsx(data):
+    """openpyxl 없이 첫 시트 셀 값 읽기 → {(행, 열): 값} (날짜는 엑셀 일련번호 float, 빈 칸은 없음)"""
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        strings = []
+        if 'xl/sharedStrings.xml' in z.namelist():
+            root = ElementTree.fromstring(z.read('xl/sharedStrings.xml'))
+            strings = [''.join(t.text or '' for t in si.iter(f"{{{NS['s']}}}t")) for si in root.findall('s:si', NS)]
+        sheet = ElementTree.fromstring(z.read('xl/worksheets/sheet1.xml'))
+    cells = {}
+    for c in sheet.iter(f"{{{NS['s']}}}c"):
+        letters, number = re.fullmatch(r'([A-Z]+)(\d+)', c.get('r')).groups()
+        col = sum((ord(ch) - 64) * 26 ** i for i, ch in enumerate(reversed(letters))) - 1
+        inline = c.find('s:is/s:t', NS)
+        value = c.find('s:v', NS)
+        if c.get('t') == 's':
+            cells[int(number) - 1, col] = strings[int(value.text)]
+        elif c.get('t') in ('str', 'inlineStr'):
+            cells[int(number) - 1, col] = inline.text if inline is not None else value.text
+        elif value is not None:
+            cells[int(number) - 1, col] = float(value.text)
+    return cells
+
+
+def excel_date(ts):
+    return (pd.Timestamp(ts) - pd.Timestamp('1899-12-30')).days
+
+
+@pytest.fixture
+def rows(frame):
+    return frame.sort_values(['날짜', '부서'], kind='stable').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('chunk', [7, 5000])
+def test_csv_round_trip(rows, chunk, monkeypatch):
+    monkeypatch.setattr(export, 'EXPORT_CHUNK_ROWS', chunk)
+    positions = np.arange(3, 60)
+    data = export_rows(rows, positions, 'csv')
+    assert data.startswith(b'\xef\xbb\xbf')
+    got = pd.read_csv(io.BytesIO(data), encoding='utf-8-sig', parse_dates=['날짜'])
+    want = rows.take(positions).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, want.astype({'부서': str}), check_dtype=False)
+
+
+@pytest.mark.skipif('parquet' not in EXPORT_FORMATS, reason='pyarrow 없음')
+def test_parquet_round_trip(rows):
+    positions = np.array([10, 2, 40])
+    got = pd.read_parquet(io.BytesIO(export_rows(rows, positions, 'parquet')))
+    pd.testing.assert_frame_equal(got, rows.take(positions).reset_index(drop=True), check_categorical=False)
+
+
+@pytest.mark.parametrize('chunk', [4, 5000])
+def test_xlsx_cells(rows, chunk, monkeypatch):
+    monkeypatch.setattr(export, 'EXPORT_CHUNK_ROWS', chunk)
+    positions = np.arange(0, 9)
+    cells = read_xlsx(export_rows(rows, positions, 'xlsx'))
+    assert [cells[0, i] for i in range(len(rows.columns))] == list(rows.columns)
+    for r, (_, row) in enumerate(rows.take(positions).iterrows(), start=1):
+        assert cells[r, 0] == excel_date(row['날짜'])
+        assert cells[r, 1] == row['부서']
+        assert [cells[r, i] for i in range(2, len(rows.columns))] == [float(v) for v in row.iloc[2:]]
+
+
+def test_xlsx_blank_cells():
+    df = pd.DataFrame({
+        '날짜': pd.to_datetime(['2024-01-02', None]),
+        '부서': ['알파실', None],
+        '환산': [1.5, np.nan],
+        '비고': pd.array(['메모', pd.NA], dtype='string'),
+    })
+    cells = read_xlsx(export_rows(df, np.arange(2), 'xlsx'))
+    assert cells[1, 0] == excel_date('2024-01-02') and cells[1, 1] == '알파실' and cells[1, 2] == 1.5
+    assert cells[1, 3] == '메모'
+    assert not any(r == 2 for r, _ in cells)                    # 빈 값만 있는 행은 빈 칸
+
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS))
+def test_zero_rows(rows, fmt):
+    progress = []
+    data = export_rows(rows, np.zeros(0, dtype='int64'), fmt, lambda done, total: progress.append((done, total)))
+    if fmt == 'csv':
+        assert data.decode('utf-8-sig').strip() == ','.join(rows.columns)
+    elif fmt == 'parquet':
+        got = pd.read_parquet(io.BytesIO(data))
+        assert len(got) == 0 and list(got.columns) == list(rows.columns)
+    else:
+        assert read_xlsx(data) == {(0, i): c for i, c in enumerate(rows.columns)}
+    assert progress in ([], [(0, 0)])
+
+
+def test_progress_and_unknown_format(rows, monkeypatch):
+    monkeypatch.setattr(export, 'EXPORT_CHUNK_ROWS', 10)
+    progress = []
+    export_rows(rows, np.arange(25), 'csv', lambda done, total: progress.append((done, total)))
+    assert progress == [(10, 25), (20, 25), (25, 25)]
+    with pytest.raises(ValueError):
+        export_rows(rows, np.arange(3), 'pdf')
+
+
+# ---- 내보낸 파일 캐시 ----
+class FakeDisk(dict):
+    """diskcache.Cache 대신 (get/set만 사용)"""
+
+    def set(self, key, value):
+        self[key] = value
+
+
+def test_export_cache_lru():
+    cache = ExportCache(size=2)
+    builds = []
+    build = lambda key: lambda: builds.append(key) or key.encode()
+    assert cache.get('a', build('a')) == b'a'
+    assert cache.get('a', build('a')) == b'a'
+    cache.get('b', build('b'))
+    cache.get('a', build('a'))                                  # a가 최근
+    cache.get('c', build('c'))                                  # b가 밀려남
+    cache.get('a', build('a'))
+    cache.get('b', build('b'))
+    assert builds == ['a', 'b', 'c', 'b']
+
+
+def test_export_cache_shares_disk():
+    disk = FakeDisk()
+    key = ('v1', ('골드1실',), '2024-01-01', '2024-01-31', 'csv')
+    assert ExportCache(disk=disk).get(key, lambda: b'data') == b'data'
+    assert disk[('export',) + key] == b'data'
+    other = ExportCache(disk=disk)                              # 다른 프로세스: 디스크에서 읽음
+    assert other.get(key, lambda: pytest.fail('다시 만들면 안 됨')) == b'data'
@@ -0,0 +1,81 @@
+import base64
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from components import figure_encoding
+from components.figure_encoding import encode_figure, line_trace
+
+
+@pytest.fixture(autouse=True)
+def typed_arrays(monkeypatch):
+    monkeypatch.setattr(figure_encoding, 'FIGURE_TYPED_ARRAYS', True)
+
+
+def decode(array):
+    """{'dtype', 'bdata'} → numpy 배열"""
+    return np.frombuffer(base64.b64decode(array['bdata']), dtype='<' + array['dtype'])
+
+
+def decode_x(trace, n):
+    """x0/dx 또는 epoch ms 타입 배열 → DatetimeIndex"""
+    if 'x0' in trace:
+        return pd.Timestamp(trace['x0']) + pd.to_timedelta(np.arange(n) * trace['dx'], unit='ms')
+    return pd.to_datetime(decode(trace['x']).astype('int64'), unit='ms')
+
+
+@pytest.mark.parametrize('x', [
+    pd.date_range('2024-01-01', periods=40, freq='D'),          # 일 → x0/dx
+    pd.date_range('2024-01-01', periods=9, freq='W-MON'),       # 주 → x0/dx
+    pd.date_range('2024-01-01', periods=14, freq='MS'),         # 월(간격 불규칙) → epoch ms
+    pd.DatetimeIndex(['2024-01-03', '2024-01-04', '2024-01-09']),
+])
+def test_dates_round_trip(x):
+    y = np.arange(len(x)) * 3
+    figure = encode_figure(go.Figure(go.Scatter(x=x, y=y)))
+    trace = figure['data'][0]
+    regular = len(set(np.diff(x.asi8))) == 1
+    assert ('x0' in trace) is regular and ('x' in trace) is not regular
+    if not regular:
+        assert trace['x']['dtype'] == 'f8'
+    assert decode_x(trace, len(y)).equals(pd.DatetimeIndex(x))
+    assert figure['layout']['xaxis']['type'] == 'date'
+
+
+@pytest.mark.parametrize('y, dtype', [
+    (np.array([0, 5, -3, 2 ** 31 - 1]), 'i4'),
+    (np.array([0, 2 ** 40]), 'f8'),                              # int32 범위 밖
+    (np.array([0.5, np.nan, 2.25]), 'f8'),
+    (np.array([1, None, 2.5], dtype=object), 'f8'),              # None → 빈 값(NaN)
+])
+def test_numbers_round_trip(y, dtype):
+    figure = encode_figure(go.Figure(go.Bar(x=['가', '나', '다', '라'][:len(y)], y=y)))
+    trace = figure['data'][0]
+    assert trace['x'] == ['가', '나', '다', '라'][:len(y)]       # 문자열 축은 그대로
+    assert trace['y']['dtype'] == dtype
+    np.testing.assert_array_equal(decode(trace['y']), np.array(y, dtype='float64'))
+
+
+def test_disabled_returns_figure(monkeypatch):
+    monkeypatch.setattr(figure_encoding, 'FIGURE_TYPED_ARRAYS', False)
+    fig = go.Figure(go.Scatter(x=[1, 2], y=[3, 4]))
+    assert encode_figure(fig) is fig
+
+
+def test_line_trace_thresholds(monkeypatch):
+    monkeypatch.setattr(figure_encoding, 'FIGURE_MARKER_MAX_POINTS', 62)
+    monkeypatch.setattr(figure_encoding, 'FIGURE_WEBGL_MIN_POINTS', 1000)
+    x = pd.date_range('2020-01-01', periods=1000, freq='D')
+    y = np.ones(1000)
+
+    trace = line_trace(x[:62], y[:62], mode='lines+markers', line_shape='spline')
+    assert isinstance(trace, go.Scatter) and trace.mode == 'lines+markers' and trace.line.shape == 'spline'
+    trace = line_trace(x[:63], y[:63], mode='lines+markers', line_shape='spline')
+    assert isinstance(trace, go.Scatter) and trace.mode == 'lines' and trace.line.shape == 'spline'
+    trace = line_trace(x[:999], y[:999], mode='lines')
+    assert isinstance(trace, go.Scatter)
+    trace = line_trace(x, y, mode='lines+markers', line_shape='spline', name='a')
+    assert isinstance(trace, go.Scattergl) and trace.mode == 'lines' and trace.line.shape is None
+    assert trace.name == 'a'
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from dataset.goals import GoalTable, group_totals, overall_goal
+
+
+def old_goals(df, month_start, end):
+    """이전 방식: 달 1일 ~ end 행에서 부서별 목표환산 첫 값 (행 순서 기준)"""
+    rows = df[(df['날짜'] >= month_start) & (df['날짜'] <= end)]
+    return rows.groupby('부서', observed=True, sort=False)['목표환산'].first()
+
+
+@pytest.mark.parametrize('month_start, end', [
+    ('2024-01-01', '2024-01-31'),
+    ('2024-01-01', '2024-01-24'),       # 데이터 첫날
+    ('2024-02-01', '2024-02-03'),       # 월초 며칠만 (행이 없는 부서는 빠짐)
+    ('2024-03-01', '2024-03-31'),
+])
+def test_month_matches_old_rule(frame, month_start, end):
+    got = GoalTable(frame).month(month_start, end)
+    want = old_goals(frame, pd.Timestamp(month_start), pd.Timestamp(end))
+    pd.testing.assert_series_equal(got.sort_index(), want.set_axis(want.index.astype(str)).sort_index(),
+                                   check_names=False, check_index_type=False)
+
+
+def test_month_without_rows():
+    assert GoalTable(pd.DataFrame({'날짜': pd.to_datetime(['2024-01-05']), '부서': ['알파실'],
+                                   '목표환산': [10]})).month('2024-05-01', '2024-05-31').empty
+
+
+def test_goal_rule_independent_of_row_order():
+    # 달 중간에 목표가 바뀜 + 첫날에 값이 두 개
+    df = pd.DataFrame({
+        '날짜': pd.to_datetime(['2024-02-05', '2024-02-02', '2024-02-02', '2024-02-20', '2024-02-03']),
+        '부서': ['알파실', '알파실', '알파실', '알파실', '드림1실'],
+        '목표환산': [300, 100, 200, 400, 50],
+    })
+    for seed in range(5):
+        shuffled = df.sample(frac=1, random_state=seed)
+        got = GoalTable(shuffled).month('2024-02-01', '2024-02-29')
+        assert got.to_dict() == {'알파실': 200, '드림1실': 50}
+    assert GoalTable(df).month('2024-02-01', '2024-02-02').to_dict() == {'알파실': 200}
+
+
+def test_group_totals_and_overall_goal():
+    totals = pd.Series({'드림1실': 10, '드림2실': 5, '알파실': 7})
+    assert group_totals(totals).to_dict() == {'드림1실': 15, '드림2실': 15, '알파실': 7}
+    goals = pd.Series({'드림1실': 100, '드림2실': 100, '알파실': 70})
+    assert overall_goal(goals) == 170
+    assert overall_goal(goals.drop('드림2실')) == 170
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components._10_heatmap import DOW_ORDER, weekday_norm
+from dataset.context import QueryContext
+from dataset.cube import ROWS, Cube, nonzero
+
+
+def old_norm(df, start, end, measure):
+    """이전 방식: 기간 행을 부서 × 요일로 groupby 평균(0 제외) → 부서별 Min-Max 정규화"""
+    rows = df[(df['날짜'] >= start) & (df['날짜'] <= end)].copy()
+    rows = rows[rows['날짜'].dt.weekday < 5]
+    rows['요일'] = rows['날짜'].dt.weekday.map(dict(enumerate(DOW_ORDER)))
+    rows[measure] = rows[measure].replace(0, np.nan)
+    mean = (rows.groupby(['부서', '요일'], observed=True)[measure].mean()
+            .unstack().reindex(columns=DOW_ORDER)).fillna(0)
+    norm = mean.sub(mean.min(axis=1), axis=0)
+    return norm.div(mean.max(axis=1) - mean.min(axis=1) + 1e-8, axis=0)
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2024-01-24', '2024-03-12'),
+    ('2024-02-05', '2024-02-09'),       # 한 주
+    ('2024-02-10', '2024-02-11'),       # 주말만 → 빈 표
+    ('2024-01-01', '2024-01-26'),
+])
+def test_weekday_norm_matches_groupby(frame, start, end):
+    ctx = QueryContext(Cube(frame), {'start_date': start, 'end_date': end, 'unit': '전체', 'value_type': '환산'})
+    cnt, amt = weekday_norm(ctx, ['건수', '환산'])
+    for got, measure in [(cnt, '건수'), (amt, '환산')]:
+        want = old_norm(frame, pd.Timestamp(start), pd.Timestamp(end), measure)
+        want.index = want.index.astype(str)
+        pd.testing.assert_frame_equal(got, want, check_names=False, check_index_type=False,
+                                      check_column_type=False)
+
+
+def test_by_weekday_tensor(frame):
+    cube = Cube(frame)
+    start, end = pd.Timestamp('2024-01-29'), pd.Timestamp('2024-02-25')
+    rows = frame[(frame['날짜'] >= start) & (frame['날짜'] <= end) & (frame['날짜'].dt.weekday < 5)]
+    keys = [rows['부서'].astype(str), rows['날짜'].dt.weekday]
+    for key, want in [
+        ('보험료', rows.groupby(keys)['보험료'].sum()),
+        (ROWS, rows.groupby(keys).size()),
+        (nonzero('건수'), rows.groupby(keys)['건수'].apply(lambda v: (v != 0).sum())),
+    ]:
+        got = cube.by_weekday(key, start, end)
+        want = want.unstack(fill_value=0).reindex(index=cube.depts, columns=range(5), fill_value=0)
+        np.testing.assert_array_equal(got.to_numpy(), want.to_numpy())
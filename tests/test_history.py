@@ -0,0 +1,95 @@
+import json
+
+import pandas as pd
+import pytest
+
+from dataset import history
+from dataset.history import HistorySource, HistoryStore, window_start
+from dataset.ingest import SourceFetcher
+from dataset.sources import load_manifest
+from tools import fake_sheets
+from tools.fake_sheets import SHEET_DEPTS
+
+
+@pytest.fixture
+def windowed(sheets, tmp_path):
+    """가짜 시트 매니페스트에 ?since= 구간 주소(window_url)를 붙인 것"""
+    server, manifest = sheets
+    with open(manifest, encoding='utf-8') as f:
+        entries = json.load(f)['sources']
+    for entry in entries:
+        entry['window_url'] = entry['url'] + '?since={since}'
+    path = tmp_path / 'windowed.json'
+    path.write_text(json.dumps({'sources': entries}, ensure_ascii=False), encoding='utf-8')
+    return server, str(path)
+
+
+def history_fetcher(manifest, root):
+    store = HistoryStore(root)
+    return store, SourceFetcher([HistorySource(source, store) for source in load_manifest(manifest)])
+
+
+def test_window_start():
+    assert window_start('2024-03-15', open_months=2) == pd.Timestamp('2024-02-01')
+    assert window_start('2024-01-01', open_months=1) == pd.Timestamp('2024-01-01')
+    assert window_start('2024-01-31', open_months=0) == pd.Timestamp('2024-01-01')
+
+
+def test_closed_months_frozen_and_not_refetched_after_restart(windowed, tmp_path):
+    server, manifest = windowed
+    root = str(tmp_path / 'history')
+    cutoff = window_start()
+    store, fetcher = history_fetcher(manifest, root)
+    frames = fetcher.fetch()
+    assert store.frozen_until('alpha') == cutoff
+    closed = frames['alpha'][frames['alpha']['날짜'] < cutoff]
+    assert len(closed) and store.months('alpha') == sorted(closed['날짜'].dt.strftime('%Y-%m').unique())
+    version = fetcher.version
+
+    # 재시작: 새 저장소 객체·새 수집기 (이전 프레임 없음) / 원본의 닫힌 달 값이 바뀌어도 저장소 값 사용
+    lines = server.sheets['alpha'].decode('utf-8').splitlines(keepends=True)
+    first = lines[1].split(',')
+    first[2] = '999'
+    server.sheets['alpha'] = ''.join(lines[:1] + [','.join(first)] + lines[2:]).encode('utf-8')
+    store, restarted = history_fetcher(manifest, root)
+    again = restarted.fetch()
+    pd.testing.assert_frame_equal(again['alpha'], frames['alpha'])
+    assert 999 not in again['alpha']['건수'].to_numpy()
+    assert restarted.version == version                     # 전체로 받든 구간으로 받든 같은 버전
+    assert restarted._state['alpha']['inner']['url'].endswith(f"?since={cutoff:%Y-%m-%d}")
+
+    # 열린 구간이 바뀌면 버전도 바뀜
+    server.sheets['gold1'] = fake_sheets.make_sheet_csv('gold1', days=60, seed=1)
+    restarted.fetch()
+    assert restarted.version != version
+
+
+def test_month_rollover_freezes_held_month(windowed, tmp_path, monkeypatch):
+    _, manifest = windowed
+    cutoff = window_start()
+    earlier = (cutoff.to_period('M') - 1).to_timestamp()
+    monkeypatch.setattr(history, 'window_start', lambda: earlier)
+    store, fetcher = history_fetcher(manifest, str(tmp_path / 'history'))
+    before = fetcher.fetch()
+    assert store.frozen_until('legend') == earlier
+    assert f"{earlier:%Y-%m}" not in store.months('legend')
+
+    monkeypatch.setattr(history, 'window_start', lambda: cutoff)     # 달이 바뀜
+    after = fetcher.fetch()
+    assert store.frozen_until('legend') == cutoff
+    assert f"{earlier:%Y-%m}" in store.months('legend')
+    pd.testing.assert_frame_equal(after['legend'], before['legend'])
+    for name in SHEET_DEPTS:
+        assert store.load(name, cutoff)['날짜'].max() < cutoff
+
+
+def test_freeze_is_idempotent(frame, tmp_path):
+    store = HistoryStore(str(tmp_path / 'history'))
+    assert store.freeze('s', frame, before=pd.Timestamp('2024-03-01')) == ['2024-01', '2024-02']
+    signature = store.signature('s')
+    assert store.freeze('s', frame, before=pd.Timestamp('2024-02-01')) == []
+    assert store.freeze('s', frame, before=pd.Timestamp('2024-03-01')) == []
+    assert store.signature('s') == signature
+    loaded = store.load('s', pd.Timestamp('2024-03-01'))
+    expected = frame[frame['날짜'] < '2024-03-01'].reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded.astype({'부서': str}), expected.astype({'부서': str}))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset.index import RowIndex
+
+
+def expected(df, start, end, unit):
+    """이전 방식: 전체 행 불리언 마스크"""
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df['날짜'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df['날짜'] <= pd.Timestamp(end)
+    if unit != '전체':
+        mask &= df['부서'].isin([unit] if isinstance(unit, str) else unit)
+    return df[mask]
+
+
+def test_rows_sorted_by_dept_then_date(frame):
+    rows = RowIndex(frame)
+    assert rows.depts == list(pd.unique(frame['부서'].astype(str)))     # 처음 나온 순서
+    codes = pd.Categorical(rows.df['부서'].astype(str), categories=rows.depts).codes
+    order = np.lexsort((rows.df['날짜'].to_numpy(), codes))
+    assert (order == np.arange(len(order))).all()
+
+
+@pytest.mark.parametrize('unit', ['전체', '골드1실', ['다이아2실', '실버3실'], ['골드1실', '없는부서'], []])
+@pytest.mark.parametrize('start, end', [
+    (None, None),
+    ('2024-02-03', '2024-02-17'),           # 주말 경계
+    ('2024-01-01', '2024-01-24'),           # 데이터 첫날까지
+    ('2024-03-12', '2024-04-01'),           # 데이터 마지막 날부터
+    ('2024-02-10', '2024-02-01'),           # 끝이 시작보다 앞
+    ('2023-01-01', '2023-12-31'),           # 데이터 밖
+])
+def test_positions_match_mask(frame, unit, start, end):
+    rows = RowIndex(frame)
+    want = expected(rows.df, start, end, unit)
+    np.testing.assert_array_equal(rows.positions(start, end, unit), want.index.to_numpy())
+
+
+def test_span(frame):
+    rows = RowIndex(frame)
+    lo, hi = rows.span('골드1실', '2024-02-01', '2024-02-29')
+    want = expected(rows.df, '2024-02-01', '2024-02-29', '골드1실')
+    assert (lo, hi) == (want.index[0], want.index[-1] + 1)
+    lo, hi = rows.span('골드1실', '2024-02-10', '2024-02-01')       # 끝이 시작보다 앞 → 빈 구간
+    assert lo == hi
+    assert rows.span('없는부서', '2024-02-01', '2024-02-29') == (0, 0)
+
+
+def test_min_max_date(frame):
+    rows = RowIndex(frame)
+    assert rows.min_date == pd.Timestamp('2024-01-24')
+    assert rows.max_date == frame['날짜'].max()
@@ -0,0 +1,161 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from dataset import ingest
+from dataset.ingest import SourceFetcher
+from dataset.snapshot import SnapshotCache
+from dataset.sources import load_manifest
+from tools import fake_sheets
+from tools.fake_sheets import SHEET_DEPTS
+from tools.snapshot_sources import snapshot_sources
+
+
+def test_fetch_keys_frames_by_source(sheets):
+    server, manifest = sheets
+    server.failing.add('dream1')
+    frames = SourceFetcher(load_manifest(manifest)).fetch()
+    assert list(frames) == [name for name in SHEET_DEPTS if name != 'dream1']
+    for name, df in frames.items():
+        assert set(df['부서'].astype(str)) == {SHEET_DEPTS[name]}
+
+
+def test_snapshot_sources_skips_failed_source(sheets, tmp_path):
+    server, manifest = sheets
+    server.failing.add('dream1')
+    out = tmp_path / 'out'
+    assert snapshot_sources(str(out), manifest=manifest) == ['dream1']
+    assert not (out / 'dream1.csv').exists()
+    for name in SHEET_DEPTS:
+        if name != 'dream1':
+            assert set(pd.read_csv(out / f"{name}.csv")['부서']) == {SHEET_DEPTS[name]}
+
+
+# ---- 백오프·서킷 / 변경 감지 ----
+class Clock:
+    """dataset.ingest의 time 대신 쓰는 손으로 넘기는 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ingest, 'time', clock)
+    return clock
+
+
+def test_breaker_opens_and_serves_last_good_frame(sheets, clock, monkeypatch):
+    monkeypatch.setattr(ingest, 'BREAKER_THRESHOLD', 3)
+    monkeypatch.setattr(ingest, 'RETRY_BASE', 5)
+    monkeypatch.setattr(ingest, 'BREAKER_COOLDOWN', 300)
+    server, manifest = sheets
+    fetcher = SourceFetcher(load_manifest(manifest))
+    good = fetcher.fetch()['dream1']
+    version = fetcher.version
+    assert fetcher.stale == {}
+
+    server.failing.add('dream1')
+    for failures, wait in [(1, 5), (2, 10), (3, 300)]:      # 지수 백오프 → 3번째에 서킷 열림
+        frames = fetcher.fetch()
+        assert frames['dream1'] is good
+        assert fetcher._state['dream1']['failures'] == failures
+        assert fetcher._state['dream1']['retry_at'] == clock.now + wait
+        clock.now += wait
+    assert set(fetcher.stale) == {'드림1실'} and fetcher.stale['드림1실'] is not None
+    assert 'HTTPError' in fetcher.error('dream1')
+    assert fetcher.version == version                       # 실패는 버전을 바꾸지 않음
+
+    # 서킷이 열린 동안에는 요청하지 않음 (시트가 바뀌고 복구돼도 이전 프레임)
+    clock.now -= 1
+    server.failing.clear()
+    server.sheets['dream1'] = fake_sheets.make_sheet_csv('dream1', days=10)
+    assert fetcher.fetch()['dream1'] is good
+
+    clock.now += 1                                          # cooldown 끝 → 다시 받고 stale 해제
+    assert len(fetcher.fetch()['dream1']) == 10
+    assert fetcher.stale == {} and fetcher.error('dream1') is None
+    assert fetcher.version != version
+
+
+def test_source_never_read_is_stale_without_time(sheets, clock):
+    server, manifest = sheets
+    server.failing.add('gold2')
+    fetcher = SourceFetcher(load_manifest(manifest))
+    assert 'gold2' not in fetcher.fetch()
+    assert fetcher.stale == {'골드2실': None}
+
+
+def test_all_sources_failing_raises(sheets, clock):
+    server, manifest = sheets
+    server.failing.update(SHEET_DEPTS)
+    with pytest.raises(RuntimeError):
+        SourceFetcher(load_manifest(manifest)).fetch()
+
+
+def test_not_modified_keeps_version_and_frames(sheets, clock):
+    server, manifest = sheets
+    fetcher = SourceFetcher(load_manifest(manifest))
+    first = fetcher.fetch()
+    version = fetcher.version
+    second = fetcher.fetch()                                # 모든 시트 304
+    assert fetcher.version == version
+    assert all(second[name] is first[name] for name in first)
+
+    server.sheets['gold1'] = fake_sheets.make_sheet_csv('gold1', days=20)
+    third = fetcher.fetch()
+    assert fetcher.version != version
+    assert len(third['gold1']) == 20 and third['alpha'] is first['alpha']
+
+
+def test_unchanged_hash_keeps_version(tmp_path):
+    """ETag가 없는 소스(로컬 파일): mtime이 바뀌어도 내용 해시가 같으면 그대로"""
+    fake_sheets.write_sheets(str(tmp_path / 'sheets'), days=30)
+    manifest = tmp_path / 'local.json'
+    manifest.write_text(json.dumps({'sources': [
+        {'name': name, 'dept': dept, 'type': 'csv-dir', 'path': 'sheets'} for name, dept in SHEET_DEPTS.items()
+    ]}), encoding='utf-8')
+    fetcher = SourceFetcher(load_manifest(str(manifest)))
+    first = fetcher.fetch()
+    version = fetcher.version
+
+    path = tmp_path / 'sheets' / 'alpha.csv'
+    path.write_bytes(path.read_bytes())
+    os.utime(path, ns=(0, 0))
+    assert fetcher.fetch()['alpha'] is first['alpha']
+    assert fetcher.version == version
+
+    path.write_bytes(fake_sheets.make_sheet_csv('alpha', days=5))
+    assert len(fetcher.fetch()['alpha']) == 5
+    assert fetcher.version != version
+
+
+def test_snapshot_cache_keeps_snapshot_when_unchanged(sheets, clock):
+    """app.load_dataset처럼: 버전이 같으면 스냅샷(파생값 캐시)을 그대로, 실패한 부서는 stale"""
+    server, manifest = sheets
+    fetcher = SourceFetcher(load_manifest(manifest))
+
+    def load(current):
+        frames = fetcher.fetch()
+        if current is not None and current.version == fetcher.version:
+            return current.df, current.version, fetcher.stale
+        return pd.concat(list(frames.values()), ignore_index=True), fetcher.version, fetcher.stale
+
+    cache = SnapshotCache(load)
+    snapshot = cache.get()
+    snapshot.derived('rows', len)
+    server.failing.add('legend')
+    assert cache.refresh() is snapshot
+    assert snapshot.has('rows') and set(snapshot.stale) == {'레전드실'}
+
+    server.failing.clear()
+    server.sheets['legend'] = fake_sheets.make_sheet_csv('legend', days=3)
+    clock.now += ingest.BREAKER_COOLDOWN
+    assert cache.refresh() is not snapshot
+    assert cache.current.stale == {} and cache.snapshot_for(snapshot.version) is snapshot
@@ -0,0 +1,129 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from dataset import refresher as refresher_module
+from dataset.refresher import ManualRefreshGate, Refresher, _FileLock, private_dir
+from dataset.snapshot import SnapshotCache
+
+
+class Loader:
+    """원본 대신 쓰는 로더 (호출 횟수 기록, 버전은 해시처럼 16진수)"""
+
+    def __init__(self, version):
+        self.version = version
+        self.calls = 0
+
+    def __call__(self, current):
+        self.calls += 1
+        df = pd.DataFrame({'날짜': pd.to_datetime(['2024-01-02']), '건수': [len(self.version)]})
+        return df, self.version, {'골드1실': '2024-01-02T09:00:00'}
+
+
+def worker(shared_dir, loader):
+    """공유 디렉터리를 쓰는 워커 하나 (스레드는 띄우지 않음)"""
+    refresher = Refresher(SnapshotCache(loader), interval=60, shared_dir=shared_dir)
+    refresher.shared = private_dir(shared_dir)
+    return refresher
+
+
+@pytest.fixture
+def shared_dir(tmp_path):
+    return str(tmp_path / 'shared')
+
+
+@pytest.mark.skipif(refresher_module.fcntl is None, reason='워커 간 공유는 fcntl이 있을 때만')
+def test_second_worker_adopts_owner_snapshot(shared_dir):
+    owner_loader, other_loader = Loader('0a1'), Loader('0c3')
+    owner, other = worker(shared_dir, owner_loader), worker(shared_dir, other_loader)
+
+    snapshot = owner.refresh_once()
+    assert owner_loader.calls == 1
+    files = [f for f in os.listdir(shared_dir) if f.startswith('snapshot-')]
+    assert snapshot.version == '0a1' and files == ['snapshot-0a1.parquet']
+
+    adopted = other.refresh_once()
+    assert other_loader.calls == 0                      # 원본을 다시 읽지 않음
+    assert adopted.version == snapshot.version
+    pd.testing.assert_frame_equal(adopted.df, snapshot.df)
+    assert adopted.stale == snapshot.stale
+
+
+@pytest.mark.skipif(refresher_module.fcntl is None, reason='워커 간 공유는 fcntl이 있을 때만')
+def test_forced_refresh_while_locked_adopts(shared_dir):
+    owner, other = worker(shared_dir, Loader('0a1')), worker(shared_dir, Loader('0c3'))
+    owner.refresh_once()
+    with _FileLock(os.path.join(shared_dir, 'refresh.lock')) as acquired:
+        assert acquired
+        assert other.refresh_once(force=True).version == '0a1'
+    assert other.cache._loader.calls == 0
+
+
+@pytest.mark.skipif(refresher_module.fcntl is None, reason='워커 간 공유는 fcntl이 있을 때만')
+def test_old_shared_snapshot_is_refetched(shared_dir):
+    owner, other = worker(shared_dir, Loader('0a1')), worker(shared_dir, Loader('0b2'))
+    owner.refresh_once()
+    meta_path = os.path.join(shared_dir, 'snapshot.json')
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    meta['checked_at'] = (pd.Timestamp(meta['checked_at']) - pd.Timedelta(seconds=60)).isoformat()
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    assert other.refresh_once().version == '0b2'         # 주기 절반보다 오래됨 → 락을 잡고 직접 읽음
+    assert other.cache._loader.calls == 1
+    assert sorted(f for f in os.listdir(shared_dir) if f.startswith('snapshot-')) == \
+        ['snapshot-0a1.parquet', 'snapshot-0b2.parquet']
+
+
+@pytest.mark.parametrize('file_name', ['../outside.parquet', 'snapshot-v1.pkl', None])
+def test_bad_shared_file_name_is_ignored(shared_dir, file_name):
+    other = worker(shared_dir, Loader('0c3'))
+    with open(os.path.join(shared_dir, 'snapshot.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version': 'x', 'checked_at': pd.Timestamp.now().isoformat(), 'file': file_name,
+                   'format': refresher_module.SNAPSHOT_FORMAT}, f)
+    assert not other._adopt_shared()
+    assert other.cache.current is None
+
+
+def test_private_dir(tmp_path):
+    path = tmp_path / 'shared'
+    path.mkdir(mode=0o777)
+    os.chmod(path, 0o777)
+    assert private_dir(str(path))
+    assert os.stat(path).st_mode & 0o777 == 0o700
+    link = tmp_path / 'link'
+    link.symlink_to(path)
+    assert not private_dir(str(link))
+
+
+def test_unshared_worker_refreshes_itself(tmp_path):
+    loader = Loader('0a1')
+    refresher = Refresher(SnapshotCache(loader), interval=60, shared_dir=str(tmp_path / 'shared'))
+    assert refresher.refresh_once().version == '0a1'
+    assert loader.calls == 1 and not os.path.exists(tmp_path / 'shared')
+
+
+# ---- 수동 갱신 ----
+def test_manual_refresh_gate(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(refresher_module.time, 'monotonic', lambda: now[0])
+    assert ManualRefreshGate(token='').check('anything') == (404, None)
+
+    gate = ManualRefreshGate(token='s3cret', min_interval=60)
+    assert gate.check(None) == (403, None)
+    assert gate.check('wrong') == (403, None)
+    assert gate.check('s3cret', busy=True) == (429, 1)       # 갱신 중
+    assert gate.check('s3cret') == (200, None)
+    now[0] += 20
+    assert gate.check('s3cret') == (429, 40)                 # 최소 간격 안
+    now[0] += 40
+    assert gate.check('s3cret') == (200, None)
+
+
+def test_refresher_busy_while_triggered(tmp_path):
+    refresher = Refresher(SnapshotCache(Loader('0a1')), interval=60, shared_dir=str(tmp_path / 'shared'))
+    assert not refresher.busy
+    refresher.trigger()
+    assert refresher.busy
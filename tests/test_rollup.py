@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset.cube import Cube
+from dataset.rollup import Rollup, interpolate_zeros
+
+
+def grouped(df, measure, start, end, unit, bucket):
+    """이전 방식: 기간·부서로 거른 행을 주(평일만, 월요일)·월(1일)로 groupby → (키, 합계, 행 있음)"""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    rows = df[(df['날짜'] >= start) & (df['날짜'] <= end)]
+    if unit != '전체':
+        rows = rows[rows['부서'] == unit]
+    if bucket == 'W':
+        rows = rows[rows['날짜'].dt.weekday < 5]
+        keys = rows['날짜'] - pd.to_timedelta(rows['날짜'].dt.weekday, unit='D')
+        index = pd.date_range(start - pd.Timedelta(days=start.weekday()), end, freq='W-MON')
+    else:
+        keys = rows['날짜'].dt.to_period('M').dt.to_timestamp()
+        index = pd.date_range(start.replace(day=1), end, freq='MS')
+    group = rows.groupby(keys)[measure]
+    return index, group.sum().reindex(index, fill_value=0).to_numpy(), group.size().reindex(index, fill_value=0) > 0
+
+
+@pytest.mark.parametrize('unit', ['전체', '골드1실', '없는부서'])
+@pytest.mark.parametrize('start, end', [
+    ('2024-01-24', '2024-03-12'),
+    ('2024-01-27', '2024-02-04'),       # 토요일 ~ 일요일 (시작 주는 주말만)
+    ('2024-02-15', '2024-03-31'),
+    ('2023-12-01', '2024-01-31'),
+])
+def test_weekly_monthly_match_groupby(frame, unit, start, end):
+    rollup = Rollup(Cube(frame))
+    for bucket, table in [('W', rollup.weekly), ('M', rollup.monthly)]:
+        keys, sums, present = table('환산', start, end, unit)
+        want_keys, want_sums, want_present = grouped(frame, '환산', start, end, unit, bucket)
+        assert keys.equals(want_keys)
+        np.testing.assert_array_equal(sums, want_sums)
+        np.testing.assert_array_equal(present, want_present.to_numpy())
+
+
+def test_weekly_skips_weekend_rows(frame):
+    weekend = frame[frame['날짜'].dt.weekday >= 5]
+    keys, sums, present = Rollup(Cube(weekend)).weekly('건수', '2024-01-24', '2024-03-12')
+    assert len(keys) == 8 and (sums == 0).all() and not present.any()
+
+
+def test_by_dept_follows_requested_order(frame):
+    rollup = Rollup(Cube(frame))
+    depts = ['다이아2실', '없는부서', '골드1실']
+    keys, table = rollup.monthly_by_dept('건수', '2024-01-24', '2024-03-12', depts)
+    assert table.shape == (3, 3)
+    assert (table[:, 1] == 0).all()
+    for col, dept in [(0, '다이아2실'), (2, '골드1실')]:
+        np.testing.assert_array_equal(table[:, col], grouped(frame, '건수', '2024-01-24', '2024-03-12', dept, 'M')[1])
+
+def test_reversed_range_is_empty(frame):
+    rollup = Rollup(Cube(frame))
+    for table in [rollup.weekly, rollup.monthly]:
+        keys, sums, present = table('건수', '2024-02-10', '2024-02-08')
+        assert len(keys) == len(sums) == len(present) == 0
+
+
+def test_labels(frame):
+    rollup = Rollup(Cube(frame))
+    keys = pd.DatetimeIndex(['2024-01-22', '2024-03-11', '2025-01-06'])     # 마지막 키는 데이터 기간 밖
+    assert list(rollup.week_label(keys)) == ['01-22', '03-11', '01-06']
+    assert list(rollup.month_label(pd.DatetimeIndex(['2024-02-01', '2023-12-01']))) == ['24-02', '23-12']
+
+
+# ---- 0 보간 ----
+def pandas_interpolate(values):
+    """이전 방식: replace(0, nan).interpolate('linear').fillna(0)"""
+    return pd.DataFrame(values).replace(0, np.nan).interpolate(method='linear').fillna(0).to_numpy()
+
+
+@pytest.mark.parametrize('column', [
+    [0, 0, 3, 0, 0, 9, 0],          # 양쪽 끝이 0
+    [4, 0, 0, 1],                   # 가운데만 0
+    [0, 0, 0, 0],                   # 모두 0
+    [0, 0, 5, 0],                   # 값이 하나
+    [2, 3, -1, 0, 6],               # 음수
+    [7],
+])
+def test_interpolate_zeros_matches_pandas(column):
+    values = np.array(column, dtype='float64')[:, None]
+    np.testing.assert_allclose(interpolate_zeros(values), pandas_interpolate(values))
+
+
+def test_interpolate_zeros_columns_independent():
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 4, size=(40, 6)) * (rng.random((40, 6)) < 0.5)
+    values[:, 0] = 0
+    values[[0, -1], 1:] = 0
+    np.testing.assert_allclose(interpolate_zeros(values), pandas_interpolate(values.astype('float64')))
+
+
+def test_interpolate_zeros_empty():
+    assert interpolate_zeros(np.zeros((0, 3))).shape == (0, 3)
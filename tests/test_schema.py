@@ -0,0 +1,26 @@
+import pytest
+
+from dataset import schema
+from dataset.schema import read_csv_typed
+
+RAW = (
+    "날짜,부서,건수,환산,보험료,가동인원,목표환산,비고\n"
+    "2024-01-02,알파실,1,\"10,000\",3,4,5,\n"
+    "2024-01-02,,2,0,0,1,5,부서 빈 칸\n"
+    "2024-01-03, 알파실 ,1,,3,4,5,앞뒤 공백\n"
+    "2024-01-03,  ,1,1,1,1,1,공백만\n"
+    ",알파실,1,1,1,1,1,날짜 없음\n"
+    "2024-01-04,가실,1,2,3,4,5,\n"
+).encode('utf-8')
+
+
+@pytest.mark.parametrize('arrow', [True, False])
+def test_blank_dept_and_date_rows_dropped(arrow, monkeypatch):
+    if not arrow:
+        monkeypatch.setattr(schema, 'pa', None)
+    df = read_csv_typed(RAW)
+    assert list(df.columns) == schema.COLUMNS
+    assert df['부서'].astype(str).tolist() == ['알파실', '알파실', '가실']
+    assert list(df['부서'].cat.categories) == ['가실', '알파실']
+    assert df['환산'].tolist() == [10000, 0, 2]
+    assert df.dtypes.astype(str).to_dict() == schema.SCHEMA
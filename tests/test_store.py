@@ -0,0 +1,104 @@
+import json
+
+import pandas as pd
+import pytest
+
+from dataset import snapshot as snapshot_module
+from dataset.cube import Cube
+from dataset.index import RowIndex
+from dataset.snapshot import SnapshotCache
+from dataset.store import DatasetStore
+
+
+class Versions:
+    """호출할 때마다 다음 버전을 돌려주는 로더 (프레임은 같은 날짜 범위에서 값만 바뀜)"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = 0
+
+    def __call__(self, current):
+        self.calls += 1
+        df = self.frame.assign(건수=self.frame['건수'] + self.calls)
+        return df, f"v{self.calls}", {}
+
+
+@pytest.fixture
+def cache(frame):
+    return SnapshotCache(Versions(frame))
+
+
+def test_server_payload_is_version_key(cache):
+    store = DatasetStore(cache, mode='server')
+    snapshot = cache.get()
+    assert store.payload(snapshot) == {'version': 'v1'}
+    assert store.resolve({'version': 'v1'}) is snapshot
+
+
+def test_old_version_still_resolves_until_evicted(cache, monkeypatch):
+    monkeypatch.setattr(snapshot_module, 'KEEP_VERSIONS', 2)
+    store = DatasetStore(cache, mode='server')
+    first = cache.get()
+    second = cache.refresh()
+    assert store.resolve({'version': 'v1'}) is first             # 갱신 직전에 열린 페이지
+    third = cache.refresh()
+    assert store.resolve({'version': 'v1'}) is third             # 밀려남 → 현재 스냅샷
+    assert store.resolve({'version': 'v2'}) is second
+    assert store.resolve({'version': 'unknown'}) is third
+
+
+def test_derived_once_per_version(cache):
+    store = DatasetStore(cache, mode='server')
+    snapshot = cache.get()
+    payload = store.payload(snapshot)
+    assert isinstance(store.cube(payload), Cube) and store.cube(payload) is store.cube(payload)
+    assert isinstance(store.rows(payload), RowIndex) and store.rows(payload) is store.rows(payload)
+    assert store.rollup(payload).cube is store.cube(payload)
+    cache.refresh()
+    assert store.cube(store.payload(cache.current)) is not store.cube(payload)
+
+
+def test_meta(cache, frame):
+    store = DatasetStore(cache, mode='server')
+    meta = store.meta(cache.get())
+    assert meta == {
+        'version': 'v1',
+        'min_date': '2024-01-24',
+        'max_date': '2024-03-12',
+        'depts': [str(d) for d in frame['부서'].unique()],
+    }
+    json.dumps(meta)
+
+
+def test_unknown_mode(cache):
+    with pytest.raises(ValueError):
+        DatasetStore(cache, mode='browser')
+
+
+# ---- client 모드 (전체 JSON) ----
+def test_client_payload_round_trip(cache, frame):
+    store = DatasetStore(cache, mode='client')
+    snapshot = cache.get()
+    payload = store.payload(snapshot)
+    assert isinstance(payload, str)
+    assert store.resolve(payload) is snapshot                    # 최근 버전 그대로면 복원 없이
+
+    other = DatasetStore(SnapshotCache(Versions(frame)), mode='client')
+    decoded = other.resolve(payload)                            # 다른 워커: 한 번 복원
+    assert decoded is not snapshot and other.resolve(payload) is decoded
+    expected = snapshot.df.assign(부서=snapshot.df['부서'].astype(str))
+    pd.testing.assert_frame_equal(decoded.df, expected, check_dtype=False)
+    assert decoded.df['날짜'].dtype == 'datetime64[ns]'
+    assert other.cube(payload).depts == Cube(snapshot.df).depts
+
+
+def test_client_decode_cache_is_lru(cache, frame, monkeypatch):
+    monkeypatch.setattr('dataset.store.DECODE_CACHE_SIZE', 2)
+    store = DatasetStore(SnapshotCache(Versions(frame)), mode='client')
+    payloads = [cache.refresh().to_json() for _ in range(3)]
+    first = store.resolve(payloads[0])
+    store.resolve(payloads[1])
+    assert store.resolve(payloads[0]) is first                  # 최근에 쓴 것은 남음
+    store.resolve(payloads[2])                                  # payloads[1]이 밀려남
+    assert store.resolve(payloads[0]) is first
+    assert len(store._decoded) == 2
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components._11_table_section import (
+    DEFAULT_SORT, current_page, filter_mask, split_filter_part, table_page,
+)
+from dataset.index import RowIndex
+
+
+# ---- 필터 문법 ----
+@pytest.mark.parametrize('part, expected', [
+    ('{부서} = "골드1실"', ('부서', 'eq', '골드1실')),
+    ("{부서} eq '골드1실'", ('부서', 'eq', '골드1실')),
+    ('{부서} contains 골드', ('부서', 'contains', '골드')),
+    ('{부서} contains "a=b"', ('부서', 'contains', 'a=b')),          # 값 안의 연산자 기호
+    ('{부서} contains "그 \\"실\\""', ('부서', 'contains', '그 "실"')),  # 따옴표 이스케이프
+    ('{건수} >= 3', ('건수', 'ge', '3')),
+    ('{건수} ge 3', ('건수', 'ge', '3')),
+    ('{건수} > 3', ('건수', 'gt', '3')),
+    ('{건수} != 0', ('건수', 'ne', '0')),
+    ('{날짜} datestartswith 2024-02', ('날짜', 'datestartswith', '2024-02')),
+    ('', (None, None, None)),
+    ('건수 >= 3', (None, None, None)),
+])
+def test_split_filter_part(part, expected):
+    assert split_filter_part(part) == expected
+
+
+def test_filter_mask():
+    numbers = np.array([0, 3, 5, 2])
+    np.testing.assert_array_equal(filter_mask(numbers, 'ge', '3'), [False, True, True, False])
+    np.testing.assert_array_equal(filter_mask(numbers, 'ne', '0'), [False, True, True, True])
+    np.testing.assert_array_equal(filter_mask(numbers, 'ge', 'abc'), [False] * 4)      # 해석할 수 없는 값
+
+    dates = pd.to_datetime(['2024-01-31', '2024-02-01', '2024-02-29']).to_numpy()
+    np.testing.assert_array_equal(filter_mask(dates, 'ge', '2024-02-01'), [False, True, True])
+    np.testing.assert_array_equal(filter_mask(dates, 'datestartswith', '2024-02'), [False, True, True])
+    np.testing.assert_array_equal(filter_mask(dates, 'lt', 'not a date'), [False] * 3)
+
+    depts = np.array(['골드1실', '다이아2실', '골드3실'], dtype=object)
+    np.testing.assert_array_equal(filter_mask(depts, 'contains', '골드'), [True, False, True])
+    np.testing.assert_array_equal(filter_mask(depts, 'eq', '다이아2실'), [False, True, False])
+
+
+# ---- 페이지 ----
+def expected_page(df, start, end, depts, page_current, page_size, query):
+    """이전 방식: 프레임을 거르고 pandas로 정렬한 뒤 페이지 슬라이스"""
+    rows = df[(df['날짜'] >= start) & (df['날짜'] <= end) & df['부서'].isin(depts)]
+    rows = query(rows)
+    rows = rows.sort_values(['날짜', '부서'], ascending=[False, True], kind='stable')
+    return rows.iloc[page_current * page_size:(page_current + 1) * page_size].to_dict('records'), len(rows)
+
+
+@pytest.mark.parametrize('filter_query, query', [
+    ('', lambda rows: rows),
+    ('{건수} >= 3', lambda rows: rows[rows['건수'] >= 3]),
+    ('{부서} contains "골드" && {환산} > 0', lambda rows: rows[rows['부서'].astype(str).str.contains('골드')
+                                                            & (rows['환산'] > 0)]),
+    ('{날짜} datestartswith "2024-02"', lambda rows: rows[rows['날짜'].dt.month == 2]),
+])
+@pytest.mark.parametrize('page_current', [0, 2, 50])
+def test_table_page_matches_pandas(frame, filter_query, query, page_current):
+    rows = RowIndex(frame)
+    start, end = pd.Timestamp('2024-01-30'), pd.Timestamp('2024-03-05')
+    depts = ['골드1실', '실버3실']
+    got = table_page(rows, start, end, depts, page_current, 10, DEFAULT_SORT, filter_query)
+    assert got == expected_page(rows.df, start, end, depts, page_current, 10, query)
+
+
+def test_table_page_sort_by(frame):
+    rows = RowIndex(frame)
+    start, end = pd.Timestamp('2024-01-24'), pd.Timestamp('2024-03-12')
+    records, total = table_page(rows, start, end, rows.depts, 0, 1000,
+                                [{'column_id': '환산', 'direction': 'desc'}, {'column_id': '날짜', 'direction': 'asc'}])
+    want = rows.df.sort_values(['환산', '날짜'], ascending=[False, True], kind='stable')
+    assert total == len(frame)
+    assert records == want.to_dict('records')
+
+
+def test_current_page_resets_unless_paging():
+    assert current_page(['table-detail.page_current'], 3) == 3
+    assert current_page(['table-detail.page_current'], None) == 0
+    assert current_page(['table-detail.sort_by'], 3) == 0
+    assert current_page(['table-detail.filter_query'], 3) == 0
+    assert current_page(['table-detail.page_current', 'table-detail.page_size'], 3) == 0
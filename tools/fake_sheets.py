@@ -0,0 +1,175 @@
+"""
+구글 시트 export를 흉내내는 로컬 HTTP 서버 (오프라인 수집 벤치마크용)
+
+    python -m tools.fake_sheets --delay 0.8 --bench    # 순차 vs 동시 수집 시간 비교
+    python -m tools.fake_sheets --port 8765            # 서버만 띄우기 (/alpha.csv, /dream1.csv ...)
+    python -m tools.fake_sheets --write snapshots      # 로컬 CSV 디렉터리로 저장 (sources.local.json 용)
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+
+SHEET_DEPTS = {
+    'alpha': '알파실',
+    'dream1': '드림1실',
+    'dream2': '드림2실',
+    'gold1': '골드1실',
+    'gold2': '골드2실',
+    'legend': '레전드실',
+}
+
+
+def make_sheet_csv(name, days=365, end_date=None, seed=0):
+    """부서 시트 1개 분량의 가짜 실적 CSV(bytes) 생성 (평일 1행/일)"""
+    rng = np.random.RandomState(seed + sorted(SHEET_DEPTS).index(name))
+    end_date = pd.Timestamp(end_date or pd.Timestamp.today().normalize())
+    dates = pd.bdate_range(end=end_date, periods=days)
+    cnt = rng.randint(0, 15, len(dates))
+    amt = cnt * rng.randint(30000, 90000, len(dates))
+    # 드림1실/드림2실은 목표를 공유
+    goal_seed = 'dream' if name.startswith('dream') else name
+    goal = {m: 10000000 + ((m.month * 7 + len(goal_seed)) % 20) * 1000000 for m in dates.to_period('M').unique()}
+    df = pd.DataFrame({
+        '날짜': dates.strftime('%Y-%m-%d'),
+        '부서': SHEET_DEPTS[name],
+        '건수': cnt,
+        '환산': amt,
+        '보험료': (amt * 0.7).astype(int),
+        '가동인원': rng.randint(8, 16, len(dates)),
+        '목표환산': [goal[p] for p in dates.to_period('M')],
+        '비고': '',
+    })
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def write_sheets(out_dir, days=365, fmt='csv'):
+    """가짜 시트를 로컬 디렉터리에 {이름}.csv 또는 {이름}.parquet 로 저장"""
+    os.makedirs(out_dir, exist_ok=True)
+    for name in SHEET_DEPTS:
+        raw = make_sheet_csv(name, days)
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        if fmt == 'parquet':
+            pd.read_csv(io.BytesIO(raw), parse_dates=['날짜']).to_parquet(path, index=False)
+        else:
+            with open(path, 'wb') as f:
+                f.write(raw)
+        print(path)
+
+
+def serve(port=0, delay=0.5, days=365, etag=True):
+    """
+    백그라운드 스레드로 서버 시작 → (server, {시트이름: url}) 반환
+    - etag=True면 ETag를 내려주고 If-None-Match가 같으면 304 응답
+    - server.sheets[이름]을 바꾸면 해당 시트 내용이 바뀐 것처럼 동작
+    - server.failing에 이름을 넣으면 해당 시트는 503 응답 (장애 흉내)
+    - ?since=YYYY-MM-DD를 붙이면 그 날짜 이후 행만 응답 (window_url 흉내)
+    """
+    sheets = {name: make_sheet_csv(name, days) for name in SHEET_DEPTS}
+    failing = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path, _, query = self.path.partition('?')
+            name = path.lstrip('/').split('.')[0]
+            if name not in sheets:
+                self.send_error(404)
+                return
+            time.sleep(delay)  # 구글 시트 응답 지연 흉내
+            if name in failing:
+                self.send_error(503)
+                return
+            body = sheets[name]
+            since = urllib.parse.parse_qs(query).get('since')
+            if since:
+                lines = body.decode('utf-8').splitlines(keepends=True)
+                body = ''.join(lines[:1] + [l for l in lines[1:] if l[:10] >= since[0]]).encode('utf-8')
+            tag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if etag and self.headers.get('If-None-Match') == tag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            if etag:
+                self.send_header('ETag', tag)
+            self.send_header('Content-Type', 'text/csv; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.sheets = sheets
+    server.failing = failing
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, {name: f"{base}/{name}.csv" for name in SHEET_DEPTS}
+
+
+def write_manifest(urls, path):
+    """serve()의 시트 주소로 http-csv 매니페스트 작성"""
+    sources = [{'name': name, 'dept': SHEET_DEPTS[name], 'type': 'http-csv', 'url': url} for name, url in urls.items()]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'sources': sources}, f, ensure_ascii=False)
+    return path
+
+
+def bench(delay, days, repeat=3):
+    """대시보드와 같은 경로(SourceFetcher)로 순차/동시 수집 시간 비교 (매번 새 수집기 → 조건부 요청 없이 전체 다운로드)"""
+    # dataset.sources는 import 시점에 DATASET_MANIFEST를 읽으므로, serve()로 만든 매니페스트를
+    # 환경변수로 넘기는 도구(tools.figure_bytes 등)를 위해 여기서 import
+    from dataset.ingest import SourceFetcher
+    from dataset.sources import load_manifest
+
+    server, urls = serve(delay=delay, days=days)
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = write_manifest(urls, os.path.join(tmp, 'sources.json'))
+        try:
+            for label, workers in [('순차', 1), ('동시', len(urls))]:
+                run = lambda: SourceFetcher(load_manifest(manifest), max_workers=workers).fetch()
+                best = min(_timed(run) for _ in range(repeat))
+                print(f"{label} 수집: {best:.3f}s (시트 {len(urls)}개, 지연 {delay}s, {days}일)")
+        finally:
+            server.shutdown()
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.5, help='시트별 응답 지연(초)')
+    parser.add_argument('--days', type=int, default=365, help='시트별 영업일 수')
+    parser.add_argument('--bench', action='store_true', help='순차/동시 수집 시간 비교 후 종료')
+    parser.add_argument('--write', metavar='DIR', help='서버 대신 DIR에 시트 파일 저장 후 종료')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='--write 파일 형식')
+    args = parser.parse_args()
+
+    if args.write:
+        write_sheets(args.write, args.days, args.format)
+    elif args.bench:
+        bench(args.delay, args.days)
+    else:
+        server, urls = serve(args.port, args.delay, args.days)
+        for name, url in urls.items():
+            print(f"{name}: {url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
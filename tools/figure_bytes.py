@@ -0,0 +1,82 @@
+"""
+그래프 콜백 응답 크기 비교 (가짜 시트 기반, 네트워크 없이)
+- 이전: 모든 점 + JSON 숫자/ISO 날짜 목록 + 모든 점에 마커 / 모든 점: 현재 인코딩, 점 줄이기 없음
+- 이후: 현재 FIGURE_* 설정 (점 수는 기본 그래프 너비 기준)
+
+    python -m tools.figure_bytes                 # 가짜 시트 800영업일, 최근 1개월 / 1년 / 전체 기간
+    python -m tools.figure_bytes --days 2000
+    FIGURE_DEFAULT_WIDTH=400 python -m tools.figure_bytes     # 그래프 너비(점 예산)를 바꿔서
+"""
+import argparse
+import json
+import os
+import sys
+
+from dash._utils import to_json
+
+from tools import fake_sheets
+
+
+def measure(app, store, resolved_dates):
+    """콜백별 (이전 바이트, 점 줄이기 없이 현재 인코딩 바이트, 이후 바이트)"""
+    from components import downsample, figure_encoding as encoding
+
+    callbacks = {
+        'update_dashboard': lambda: app.update_dashboard(resolved_dates, '전체', '환산', store),
+        'update_dept_cnt': lambda: app.update_dept_cnt(resolved_dates, store),
+        'update_dept_amt': lambda: app.update_dept_amt(resolved_dates, '환산', store),
+        'update_cnt_bar': lambda: app.update_cnt_bar(resolved_dates, '전체', store),
+        'update_amt_bar': lambda: app.update_amt_bar(resolved_dates, '전체', '환산', store),
+    }
+    current = (encoding.FIGURE_TYPED_ARRAYS, encoding.FIGURE_MARKER_MAX_POINTS, encoding.FIGURE_WEBGL_MIN_POINTS,
+               downsample.FIGURE_DOWNSAMPLE)
+    settings = [
+        (False, sys.maxsize, sys.maxsize, False),
+        current[:3] + (False,),
+        current,
+    ]
+    result = {}
+    try:
+        for name, run in callbacks.items():
+            sizes = []
+            for setting in settings:
+                (encoding.FIGURE_TYPED_ARRAYS, encoding.FIGURE_MARKER_MAX_POINTS, encoding.FIGURE_WEBGL_MIN_POINTS,
+                 downsample.FIGURE_DOWNSAMPLE) = setting
+                sizes.append(len(to_json(run())))
+            result[name] = tuple(sizes)
+    finally:
+        (encoding.FIGURE_TYPED_ARRAYS, encoding.FIGURE_MARKER_MAX_POINTS, encoding.FIGURE_WEBGL_MIN_POINTS,
+         downsample.FIGURE_DOWNSAMPLE) = current
+    return result
+
+def main(days):
+    server, urls = fake_sheets.serve(delay=0, days=days)
+    manifest = os.path.join(os.environ.get('TMPDIR', '/tmp'), 'figure_bytes_manifest.json')
+    with open(manifest, 'w', encoding='utf-8') as f:
+        json.dump({'sources': [{'name': k, 'type': 'http-csv', 'url': v} for k, v in urls.items()]}, f)
+    os.environ['DATASET_MANIFEST'] = manifest
+    os.environ.setdefault('DATASET_REFRESH_INTERVAL', '0')
+    try:
+        import app
+        snapshot = app.snapshot_cache.get()
+        store = app.dataset_store.payload(snapshot)
+        meta = app.dataset_store.meta(snapshot)
+        end = meta['max_date']
+        ranges = [
+            ('1개월', end[:8] + '01'),
+            ('1년', f"{int(end[:4]) - 1}{end[4:]}"),
+            ('전체', meta['min_date']),
+        ]
+        print(f"{'기간':<6}{'콜백':<20}{'이전':>12}{'모든 점':>12}{'이후':>12}{'감소':>8}")
+        for label, start in ranges:
+            for name, (before, exact, after) in measure(app, store, {'start_date': start, 'end_date': end}).items():
+                print(f"{label:<6}{name:<20}{before:>12,}{exact:>12,}{after:>12,}{1 - after / before:>8.0%}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=800, help='시트별 영업일 수')
+    args = parser.parse_args()
+    main(args.days)
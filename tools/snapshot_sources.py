@@ -0,0 +1,44 @@
+"""
+현재 매니페스트의 소스를 받아 로컬 스냅샷 디렉터리로 저장
+(스테이징/부하 테스트/프로파일링을 네트워크 없이 돌리기 위함)
+
+    python -m tools.snapshot_sources snapshots                  # snapshots/{이름}.csv
+    python -m tools.snapshot_sources snapshots --format parquet  # snapshots/{이름}.parquet
+    DATASET_MANIFEST=sources.local.json python app.py            # 로컬 스냅샷으로 실행
+"""
+import argparse
+import os
+
+from dataset.ingest import SourceFetcher
+from dataset.sources import DATASET_MANIFEST, load_manifest
+
+
+def snapshot_sources(out_dir, fmt='csv', manifest=DATASET_MANIFEST):
+    """소스별 {이름}.{fmt} 저장 → 읽지 못해 건너뛴 소스 이름 목록"""
+    sources = load_manifest(manifest)
+    fetcher = SourceFetcher(sources)
+    frames = fetcher.fetch()
+    os.makedirs(out_dir, exist_ok=True)
+    missing = []
+    for source in sources:
+        df = frames.get(source.name)
+        if df is None:
+            missing.append(source.name)
+            print(f"{source.name}: 수집 실패로 건너뜀 ({fetcher.error(source.name)})")
+            continue
+        path = os.path.join(out_dir, f"{source.name}.{fmt}")
+        if fmt == 'parquet':
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False, encoding='utf-8')
+        print(f"{source.name}: {len(df):,}행 → {path}")
+    return missing
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('out_dir')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--manifest', default=DATASET_MANIFEST)
+    args = parser.parse_args()
+    if snapshot_sources(args.out_dir, args.format, args.manifest):
+        raise SystemExit(1)